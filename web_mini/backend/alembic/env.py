@@ -8,7 +8,11 @@ import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.db.database import Base
-from app.models import Parent, Student, Class, ClassRegistration, Subscription
+from app.models import (
+    Parent, Student, Class, ClassRegistration, Subscription, AttendanceEvent,
+    ClassUtilization, SubscriptionBurndown, AnalyticsRefreshRun, ChangeLogEntry, ChangeLogCompaction,
+    Term, ClassRegistrationArchive, SubscriptionArchive,
+)
 
 config = context.config
 
@@ -0,0 +1,91 @@
+"""initial schema
+
+Revision ID: 0001_initial
+Revises:
+Create Date: 2026-10-19 09:00:00
+
+The five original tables. Databases created by ``create_all`` before
+migrations existed already have them; tables that exist are left alone, so
+``alembic upgrade head`` works on those databases as well as on empty ones.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001_initial'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "parents" not in existing:
+        op.create_table(
+            "parents",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("phone", sa.String(20), nullable=False, unique=True),
+            sa.Column("email", sa.String(255), nullable=True),
+        )
+        op.create_index("ix_parents_id", "parents", ["id"])
+
+    if "students" not in existing:
+        op.create_table(
+            "students",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("dob", sa.Date(), nullable=True),
+            sa.Column("gender", sa.String(10), nullable=True),
+            sa.Column("current_grade", sa.Integer(), nullable=True),
+            sa.Column("parent_id", sa.Integer(), sa.ForeignKey("parents.id", ondelete="CASCADE"), nullable=False),
+        )
+        op.create_index("ix_students_id", "students", ["id"])
+
+    if "classes" not in existing:
+        op.create_table(
+            "classes",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(255), nullable=False),
+            sa.Column("subject", sa.String(255), nullable=False),
+            sa.Column("teacher_name", sa.String(255), nullable=False),
+            sa.Column("day_of_week", sa.Integer(), nullable=False),
+            sa.Column("time_slot_start", sa.Time(), nullable=False),
+            sa.Column("time_slot_end", sa.Time(), nullable=False),
+            sa.Column("max_students", sa.Integer(), nullable=False),
+        )
+        op.create_index("ix_classes_id", "classes", ["id"])
+
+    if "class_registrations" not in existing:
+        op.create_table(
+            "class_registrations",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("class_id", sa.Integer(), sa.ForeignKey("classes.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.UniqueConstraint("class_id", "student_id", name="uq_class_student"),
+        )
+        op.create_index("ix_class_registrations_id", "class_registrations", ["id"])
+
+    if "subscriptions" not in existing:
+        op.create_table(
+            "subscriptions",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+            sa.Column("package_name", sa.String(255), nullable=False),
+            sa.Column("total_sessions", sa.Integer(), nullable=False),
+            sa.Column("used_sessions", sa.Integer(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+        )
+        op.create_index("ix_subscriptions_id", "subscriptions", ["id"])
+
+
+def downgrade() -> None:
+    for table in ("subscriptions", "class_registrations", "classes", "students", "parents"):
+        op.drop_table(table)
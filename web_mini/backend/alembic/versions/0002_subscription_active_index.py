@@ -0,0 +1,33 @@
+"""partial index on active subscriptions
+
+Revision ID: 0002_subscription_active_index
+Revises: 0001_initial
+Create Date: 2026-10-19 09:10:00
+
+``end_date`` of active rows only, for the batched expiry sweep. Skipped when
+the index exists (database created by ``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002_subscription_active_index'
+down_revision: Union[str, None] = '0001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("subscriptions")}
+    if "ix_subscriptions_active_end_date" not in indexes:
+        op.create_index(
+            "ix_subscriptions_active_end_date", "subscriptions", ["end_date"],
+            postgresql_where=sa.text("is_active = true"), sqlite_where=sa.text("is_active = 1"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscriptions_active_end_date", "subscriptions")
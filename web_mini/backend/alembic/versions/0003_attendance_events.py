@@ -0,0 +1,40 @@
+"""attendance_events
+
+Revision ID: 0003_attendance_events
+Revises: 0002_subscription_active_index
+Create Date: 2026-10-19 09:20:00
+
+Check-in log written by the attendance buffer. Skipped when the table exists
+(the app's startup ``create_all`` may have created it).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003_attendance_events'
+down_revision: Union[str, None] = '0002_subscription_active_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if "attendance_events" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "attendance_events",
+        sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column("student_id", sa.Integer(), sa.ForeignKey("students.id", ondelete="CASCADE"), nullable=False),
+        sa.Column(
+            "subscription_id", sa.Integer(), sa.ForeignKey("subscriptions.id", ondelete="SET NULL"), nullable=True,
+        ),
+        sa.Column("class_id", sa.Integer(), sa.ForeignKey("classes.id", ondelete="SET NULL"), nullable=True),
+        sa.Column("checked_in_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_attendance_student_checked_in", "attendance_events", ["student_id", "checked_in_at"])
+
+
+def downgrade() -> None:
+    op.drop_table("attendance_events")
@@ -0,0 +1,31 @@
+"""classes.rush_mode
+
+Revision ID: 0004_class_rush_mode
+Revises: 0003_attendance_events
+Create Date: 2026-10-19 09:30:00
+
+Classes in rush mode queue registrations instead of registering directly.
+Skipped when the column exists (database created by ``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004_class_rush_mode'
+down_revision: Union[str, None] = '0003_attendance_events'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("classes")}
+    if "rush_mode" not in columns:
+        op.add_column("classes", sa.Column("rush_mode", sa.Boolean(), nullable=False, server_default=sa.false()))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("classes") as batch:
+        batch.drop_column("rush_mode")
@@ -0,0 +1,85 @@
+"""search_text on parents, students and classes
+
+Revision ID: 0005_search_text
+Revises: 0004_class_rush_mode
+Create Date: 2026-10-19 09:40:00
+
+Normalized, accent-free text for server-side search, with pg_trgm indexes
+(and a prefix index on parents.phone) on Postgres. Rows written before the
+column existed are backfilled chunk by chunk: the ORM listeners only set it
+on insert / update. Columns that exist are skipped (database created by
+``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.text import normalize_search_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005_search_text'
+down_revision: Union[str, None] = '0004_class_rush_mode'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+# table -> (column length, source columns of search_text; mirrors the model listeners)
+SEARCH_TEXT_SOURCES = {
+    "parents": (600, ("name", "email")),
+    "students": (255, ("name",)),
+    "classes": (800, ("name", "subject", "teacher_name")),
+}
+
+
+def _backfill(name: str, sources: tuple[str, ...]):
+    bind = op.get_bind()
+    table = sa.table(name, *(sa.column(col) for col in ("id", "search_text", *sources)))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(table.c.id, *(table.c[col] for col in sources))
+            .where(table.c.id > last_id, table.c.search_text.is_(None))
+            .order_by(table.c.id).limit(BACKFILL_CHUNK)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            table.update().where(table.c.id == sa.bindparam("row_id")).values(search_text=sa.bindparam("text")),
+            [{"row_id": row.id, "text": normalize_search_text(*row[1:])} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    postgresql = bind.dialect.name == "postgresql"
+    if postgresql:
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    inspector = sa.inspect(bind)
+    for name, (length, sources) in SEARCH_TEXT_SOURCES.items():
+        if "search_text" in {column["name"] for column in inspector.get_columns(name)}:
+            continue
+        op.add_column(name, sa.Column("search_text", sa.String(length), nullable=True))
+        if postgresql:
+            op.create_index(
+                f"ix_{name}_search_text_trgm", name, ["search_text"],
+                postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+            )
+            if name == "parents":
+                op.create_index(
+                    "ix_parents_phone_prefix", "parents", ["phone"], postgresql_ops={"phone": "varchar_pattern_ops"},
+                )
+        _backfill(name, sources)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.drop_index("ix_parents_phone_prefix", "parents")
+        for name in SEARCH_TEXT_SOURCES:
+            op.drop_index(f"ix_{name}_search_text_trgm", name)
+    for name in SEARCH_TEXT_SOURCES:
+        with op.batch_alter_table(name) as batch:
+            batch.drop_column("search_text")
@@ -0,0 +1,71 @@
+"""analytics summary tables
+
+Revision ID: 0006_analytics
+Revises: 0005_search_text
+Create Date: 2026-10-19 09:50:00
+
+Class utilization and subscription burn-down summaries, and the log of their
+refresh runs. Tables that exist are skipped (the app's startup
+``create_all`` may have created them).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006_analytics'
+down_revision: Union[str, None] = '0005_search_text'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "analytics_class_utilization" not in existing:
+        op.create_table(
+            "analytics_class_utilization",
+            sa.Column("class_id", sa.Integer(), primary_key=True),
+            sa.Column("subject", sa.String(255), nullable=False),
+            sa.Column("teacher_name", sa.String(255), nullable=False),
+            sa.Column("day_of_week", sa.Integer(), nullable=False),
+            sa.Column("time_slot_start", sa.Time(), nullable=False),
+            sa.Column("time_slot_end", sa.Time(), nullable=False),
+            sa.Column("max_students", sa.Integer(), nullable=False),
+            sa.Column("registered", sa.Integer(), nullable=False),
+            sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        )
+
+    if "analytics_subscription_burndown" not in existing:
+        op.create_table(
+            "analytics_subscription_burndown",
+            sa.Column("package_name", sa.String(255), primary_key=True),
+            sa.Column("subscriptions", sa.Integer(), nullable=False),
+            sa.Column("active_subscriptions", sa.Integer(), nullable=False),
+            sa.Column("total_sessions", sa.Integer(), nullable=False),
+            sa.Column("used_sessions", sa.Integer(), nullable=False),
+            sa.Column("remaining_sessions", sa.Integer(), nullable=False),
+            sa.Column("sessions_per_week", sa.Float(), nullable=False),
+            sa.Column("weeks_to_exhaust", sa.Float(), nullable=True),
+            sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False),
+        )
+
+    if "analytics_refresh_runs" not in existing:
+        op.create_table(
+            "analytics_refresh_runs",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("duration_ms", sa.Float(), nullable=True),
+            sa.Column("class_rows", sa.Integer(), nullable=True),
+            sa.Column("package_rows", sa.Integer(), nullable=True),
+            sa.Column("status", sa.String(20), nullable=False),
+            sa.Column("error", sa.Text(), nullable=True),
+        )
+
+
+def downgrade() -> None:
+    for table in ("analytics_refresh_runs", "analytics_subscription_burndown", "analytics_class_utilization"):
+        op.drop_table(table)
@@ -0,0 +1,59 @@
+"""classes.teacher_key and the teacher slot index
+
+Revision ID: 0007_teacher_slot
+Revises: 0006_analytics
+Create Date: 2026-10-19 10:00:00
+
+Normalized teacher name, probed with day and start time to detect a teacher
+booked twice. Rows written before the column existed are backfilled chunk
+by chunk: the ORM listener only sets it on insert / update. Skipped when
+the column exists (database created by ``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.core.text import normalize_search_text
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007_teacher_slot'
+down_revision: Union[str, None] = '0006_analytics'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+
+def _backfill():
+    bind = op.get_bind()
+    classes = sa.table("classes", sa.column("id"), sa.column("teacher_name"), sa.column("teacher_key"))
+    last_id = 0
+    while True:
+        rows = bind.execute(
+            sa.select(classes.c.id, classes.c.teacher_name)
+            .where(classes.c.id > last_id, classes.c.teacher_key.is_(None))
+            .order_by(classes.c.id).limit(BACKFILL_CHUNK)
+        ).all()
+        if not rows:
+            break
+        bind.execute(
+            classes.update().where(classes.c.id == sa.bindparam("row_id")).values(teacher_key=sa.bindparam("key")),
+            [{"row_id": row.id, "key": normalize_search_text(row.teacher_name)} for row in rows],
+        )
+        last_id = rows[-1].id
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("classes")}
+    if "teacher_key" not in columns:
+        op.add_column("classes", sa.Column("teacher_key", sa.String(255), nullable=True))
+        op.create_index("ix_classes_teacher_slot", "classes", ["teacher_key", "day_of_week", "time_slot_start"])
+        _backfill()
+
+
+def downgrade() -> None:
+    op.drop_index("ix_classes_teacher_slot", "classes")
+    with op.batch_alter_table("classes") as batch:
+        batch.drop_column("teacher_key")
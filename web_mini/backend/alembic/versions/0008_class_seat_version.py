@@ -0,0 +1,32 @@
+"""classes.seat_version
+
+Revision ID: 0008_class_seat_version
+Revises: 0007_teacher_slot
+Create Date: 2026-10-19 18:00:00
+
+Version of a class's seat count, bumped by every register / unregister and
+sent with live seat updates so clients can drop stale ones. Skipped when
+the column exists (database created by ``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008_class_seat_version'
+down_revision: Union[str, None] = '0007_teacher_slot'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("classes")}
+    if "seat_version" not in columns:
+        op.add_column("classes", sa.Column("seat_version", sa.Integer(), nullable=False, server_default="0"))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("classes") as batch:
+        batch.drop_column("seat_version")
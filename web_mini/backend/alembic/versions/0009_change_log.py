@@ -0,0 +1,54 @@
+"""change_log and change_log_compactions
+
+Revision ID: 0009_change_log
+Revises: 0008_class_seat_version
+Create Date: 2026-10-19 10:10:00
+
+Monotonic log of entity changes behind ``GET /api/changes``, and the record
+of its compactions. Tables that exist are skipped (the app's startup
+``create_all`` may have created them).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009_change_log'
+down_revision: Union[str, None] = '0008_class_seat_version'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if "change_log" not in existing:
+        op.create_table(
+            "change_log",
+            sa.Column(
+                "seq", sa.BigInteger().with_variant(sa.Integer(), "sqlite"), primary_key=True, autoincrement=True,
+            ),
+            sa.Column("entity", sa.String(32), nullable=False),
+            sa.Column("entity_id", sa.Integer(), nullable=False),
+            sa.Column("op", sa.String(8), nullable=False),
+            sa.Column("data", sa.JSON(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_change_log_entity_seq", "change_log", ["entity", "entity_id", "seq"])
+
+    if "change_log_compactions" not in existing:
+        op.create_table(
+            "change_log_compactions",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("ran_at", sa.DateTime(timezone=True), nullable=False),
+            sa.Column("compacted", sa.Integer(), nullable=False),
+            sa.Column("tombstones_removed", sa.Integer(), nullable=False),
+            sa.Column("floor_seq", sa.BigInteger(), nullable=False),
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("change_log_compactions")
+    op.drop_table("change_log")
@@ -0,0 +1,133 @@
+"""terms, term-scoped registrations and subscriptions, archive tables
+
+Revision ID: 0010_terms
+Revises: 0009_change_log
+Create Date: 2026-10-19 10:20:00
+
+- new tables: terms, class_registrations_archive, subscriptions_archive
+- class_registrations: term_id, uq_class_student -> uq_class_student_term
+- subscriptions: term_id
+
+Every step is skipped when its object already exists: the app runs
+``create_all`` at startup, which may have created the new tables (but never
+the new columns) before this migration ran.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010_terms'
+down_revision: Union[str, None] = '0009_change_log'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _foreign_key(inspector, table: str, column: str) -> str:
+    """Name of the FK on ``column``: ours, or the dialect default when ``create_all`` made it."""
+    for key in inspector.get_foreign_keys(table):
+        if key["constrained_columns"] == [column]:
+            return key["name"]
+
+
+def _create_tables(existing: set[str]):
+    if "terms" not in existing:
+        op.create_table(
+            "terms",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column("name", sa.String(100), nullable=False, unique=True),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("is_current", sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.Column("archived_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index(
+            "uq_terms_current", "terms", ["is_current"], unique=True,
+            postgresql_where=sa.text("is_current = true"), sqlite_where=sa.text("is_current = 1"),
+        )
+
+    if "class_registrations_archive" not in existing:
+        op.create_table(
+            "class_registrations_archive",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("class_id", sa.Integer(), nullable=False),
+            sa.Column("student_id", sa.Integer(), nullable=False),
+            sa.Column("term_id", sa.Integer(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index(
+            "ix_class_registrations_archive_term_student", "class_registrations_archive", ["term_id", "student_id"],
+        )
+        op.create_index(
+            "ix_class_registrations_archive_term_class", "class_registrations_archive", ["term_id", "class_id"],
+        )
+
+    if "subscriptions_archive" not in existing:
+        op.create_table(
+            "subscriptions_archive",
+            sa.Column("id", sa.Integer(), primary_key=True, autoincrement=False),
+            sa.Column("student_id", sa.Integer(), nullable=False),
+            sa.Column("package_name", sa.String(255), nullable=False),
+            sa.Column("total_sessions", sa.Integer(), nullable=False),
+            sa.Column("used_sessions", sa.Integer(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("end_date", sa.Date(), nullable=False),
+            sa.Column("is_active", sa.Boolean(), nullable=False),
+            sa.Column("term_id", sa.Integer(), nullable=True),
+            sa.Column("archived_at", sa.DateTime(timezone=True), nullable=False),
+        )
+        op.create_index("ix_subscriptions_archive_term_student", "subscriptions_archive", ["term_id", "student_id"])
+
+
+def upgrade() -> None:
+    _create_tables(set(sa.inspect(op.get_bind()).get_table_names()))
+    inspector = sa.inspect(op.get_bind())
+
+    # Batch mode: plain ALTERs on Postgres, a table copy on SQLite (no ALTER for constraints there)
+    columns = {column["name"] for column in inspector.get_columns("class_registrations")}
+    constraints = {constraint["name"] for constraint in inspector.get_unique_constraints("class_registrations")}
+    with op.batch_alter_table("class_registrations") as batch:
+        if "term_id" not in columns:
+            batch.add_column(sa.Column("term_id", sa.Integer(), nullable=True))
+            batch.create_foreign_key("fk_class_registrations_term_id", "terms", ["term_id"], ["id"])
+        if "uq_class_student" in constraints:
+            batch.drop_constraint("uq_class_student", type_="unique")
+        if "uq_class_student_term" not in constraints:
+            batch.create_unique_constraint(
+                "uq_class_student_term", ["class_id", "student_id", "term_id"], postgresql_nulls_not_distinct=True,
+            )
+    indexes = {index["name"] for index in inspector.get_indexes("class_registrations")}
+    if "ix_class_registrations_term_class" not in indexes:
+        op.create_index("ix_class_registrations_term_class", "class_registrations", ["term_id", "class_id"])
+    if "ix_class_registrations_term_student" not in indexes:
+        op.create_index("ix_class_registrations_term_student", "class_registrations", ["term_id", "student_id"])
+
+    if "term_id" not in {column["name"] for column in inspector.get_columns("subscriptions")}:
+        with op.batch_alter_table("subscriptions") as batch:
+            batch.add_column(sa.Column("term_id", sa.Integer(), nullable=True))
+            batch.create_foreign_key("fk_subscriptions_term_id", "terms", ["term_id"], ["id"])
+    if "ix_subscriptions_term" not in {index["name"] for index in inspector.get_indexes("subscriptions")}:
+        op.create_index("ix_subscriptions_term", "subscriptions", ["term_id"])
+
+
+def downgrade() -> None:
+    # Fails if a student is registered in the same class in two terms: archive or delete those first
+    inspector = sa.inspect(op.get_bind())
+    op.drop_index("ix_subscriptions_term", "subscriptions")
+    with op.batch_alter_table("subscriptions") as batch:
+        batch.drop_constraint(_foreign_key(inspector, "subscriptions", "term_id"), type_="foreignkey")
+        batch.drop_column("term_id")
+
+    op.drop_index("ix_class_registrations_term_student", "class_registrations")
+    op.drop_index("ix_class_registrations_term_class", "class_registrations")
+    with op.batch_alter_table("class_registrations") as batch:
+        batch.drop_constraint("uq_class_student_term", type_="unique")
+        batch.drop_constraint(_foreign_key(inspector, "class_registrations", "term_id"), type_="foreignkey")
+        batch.drop_column("term_id")
+        batch.create_unique_constraint("uq_class_student", ["class_id", "student_id"])
+
+    for table in ("subscriptions_archive", "class_registrations_archive", "terms"):
+        op.drop_table(table)
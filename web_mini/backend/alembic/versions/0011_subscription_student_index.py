@@ -0,0 +1,34 @@
+"""partial index on active subscriptions per student
+
+Revision ID: 0011_subscription_student_index
+Revises: 0010_terms
+Create Date: 2026-10-19 10:30:00
+
+``(student_id, end_date)`` of active rows only, for picking the subscription
+a check-in draws from. Skipped when the index exists (database created by
+``create_all``).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011_subscription_student_index'
+down_revision: Union[str, None] = '0010_terms'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    indexes = {index["name"] for index in sa.inspect(op.get_bind()).get_indexes("subscriptions")}
+    if "ix_subscriptions_active_student_end_date" not in indexes:
+        op.create_index(
+            "ix_subscriptions_active_student_end_date", "subscriptions", ["student_id", "end_date"],
+            postgresql_where=sa.text("is_active = true"), sqlite_where=sa.text("is_active = 1"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_subscriptions_active_student_end_date", "subscriptions")
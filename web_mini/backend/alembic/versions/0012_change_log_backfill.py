@@ -0,0 +1,77 @@
+"""change log backfill
+
+Revision ID: 0012_change_log_backfill
+Revises: 0011_subscription_student_index
+Create Date: 2026-10-19 18:30:00
+
+Rows written before the change log existed were never logged, so a consumer
+syncing from ``since=0`` would not see them. Logs one ``upsert`` per live row
+that has no entry yet, in the snapshot format of ``app.models.change_log``
+(frozen here), chunk by chunk. Downgrade leaves the entries: they are valid
+history.
+"""
+from datetime import date, datetime, time, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012_change_log_backfill'
+down_revision: Union[str, None] = '0011_subscription_student_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_CHUNK = 1000
+
+# table -> entity name in the feed
+ENTITIES = {
+    "parents": "parent",
+    "students": "student",
+    "classes": "class",
+    "class_registrations": "registration",
+    "subscriptions": "subscription",
+}
+UNSYNCED_COLUMNS = {"search_text", "teacher_key", "seat_version"}
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    metadata = sa.MetaData()
+    change_log = sa.Table("change_log", metadata, autoload_with=bind)
+
+    for table_name, entity in ENTITIES.items():
+        table = sa.Table(table_name, metadata, autoload_with=bind)
+        columns = [column for column in table.c if column.name not in UNSYNCED_COLUMNS]
+        unlogged = ~sa.exists().where(change_log.c.entity == entity, change_log.c.entity_id == table.c.id)
+        last_id = 0
+        while True:
+            rows = bind.execute(
+                sa.select(*columns).where(table.c.id > last_id, unlogged)
+                .order_by(table.c.id).limit(BACKFILL_CHUNK)
+            ).mappings().all()
+            if not rows:
+                break
+            now = datetime.now(timezone.utc)
+            bind.execute(change_log.insert(), [
+                {
+                    "entity": entity,
+                    "entity_id": row["id"],
+                    "op": "upsert",
+                    "data": {key: _jsonable(value) for key, value in row.items()},
+                    "created_at": now,
+                }
+                for row in rows
+            ])
+            last_id = rows[-1]["id"]
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,37 @@
+import hmac
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.core import profiling
+from app.core.config import get_settings
+from app.schemas.profile import ProfileResponse
+
+settings = get_settings()
+
+
+async def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoints are disabled unless ADMIN_TOKEN is set, then require it."""
+    if not settings.ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, settings.ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid admin token")
+
+
+router = APIRouter(prefix="/admin", tags=["Admin"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profiles", response_model=List[ProfileResponse])
+async def list_profiles(route: Optional[str] = None, limit: int = 50):
+    """Recent request profiles, newest first; ``route`` filters by path template."""
+    return profiling.list_profiles(route, limit)
+
+
+@router.get("/profiles/{profile_id}")
+async def download_profile(profile_id: str):
+    """Speedscope JSON of one profile (open it at https://www.speedscope.app)."""
+    path = profiling.profile_path(profile_id)
+    if not path:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return FileResponse(path, media_type="application/json", filename=f"{profile_id}.speedscope.json")
@@ -0,0 +1,38 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+
+from app.core.config import get_settings
+from app.db.database import get_db
+from app.schemas.analytics import UtilizationResponse, BurndownResponse, RefreshRunResponse
+from app.schemas.job import JobResponse
+from app.services import analytics_service, job_service
+
+settings = get_settings()
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/utilization", response_model=UtilizationResponse)
+async def get_utilization(by: str = "subject", db: AsyncSession = Depends(get_db)):
+    """Seat utilization by ``subject``, ``teacher``, ``weekday`` or ``time_slot`` (from summary tables)."""
+    return await analytics_service.get_utilization(db, by)
+
+
+@router.get("/burndown", response_model=List[BurndownResponse])
+async def get_burndown(db: AsyncSession = Depends(get_db)):
+    """Session burn-down per subscription package (from summary tables)."""
+    return await analytics_service.get_burndown(db)
+
+
+@router.get("/refresh-runs", response_model=List[RefreshRunResponse])
+async def get_refresh_runs(
+    limit: int = Query(20, ge=1, le=settings.LIST_MAX_LIMIT), db: AsyncSession = Depends(get_db)
+):
+    return await analytics_service.get_refresh_runs(db, limit)
+
+
+@router.post("/refresh", response_model=JobResponse, status_code=202)
+async def refresh_analytics():
+    """Queue a refresh now instead of waiting for the periodic one."""
+    return await job_service.enqueue_job("refresh_analytics")
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
+
+from app.db.database import get_db
+from app.schemas.change import ChangeFeedResponse
+from app.services import change_service
+
+router = APIRouter(prefix="/changes", tags=["Changes"])
+
+
+@router.get("/", response_model=ChangeFeedResponse)
+async def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    entity: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Writes after ``since``, oldest first. Keep calling with ``next_since``
+    while ``has_more``; ``since=0`` replays the full current state. 410 means
+    the consumer fell behind tombstone retention and must restart from 0.
+    """
+    return await change_service.get_changes(db, since, limit, entity)
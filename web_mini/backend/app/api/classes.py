@@ -1,24 +1,77 @@
-from fastapi import APIRouter, Depends
+import logging
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional, Union
 
+from app.core import metrics
+from app.core.config import get_settings
 from app.db.database import get_db
-from app.schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
-from app.schemas.registration import RegistrationCreate, RegistrationResponse
-from app.schemas.student import StudentResponse
-from app.services import class_service, registration_service
+from app.db.redis import REDIS_FAILURES
+from app.schemas.class_schema import (
+    ClassCreate, ClassUpdate, ClassResponse, TeacherConflictResponse, ClassBulkUpdate,
+    SlotSuggestionRequest, SlotSuggestionResponse,
+)
+from app.models.class_model import Class
+from app.schemas.registration import RegistrationCreate, RegistrationResponse, RegistrationTicketResponse
+from app.schemas.student import StudentResponse, StudentSummaryResponse
+from app.schemas.subscription import BulkUpdateResponse
+from app.services import class_service, registration_service, rush_service, seat_service, slot_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/classes", tags=["Classes"])
 
 
 @router.get("/", response_model=List[ClassResponse])
-async def list_classes(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await class_service.get_all_classes(db, skip, limit)
+async def list_classes(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    q: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """``q``: accent-insensitive search, results ranked by relevance."""
+    return await class_service.get_all_classes(db, skip, limit, q=q)
+
+
+@router.get("/teacher-conflicts", response_model=List[TeacherConflictResponse])
+async def get_teacher_conflicts(db: AsyncSession = Depends(get_db)):
+    """Validate the whole timetable: every pair of overlapping classes with the same teacher."""
+    return await class_service.get_teacher_conflicts(db)
+
+
+@router.post("/suggest-slots", response_model=SlotSuggestionResponse)
+async def suggest_slots(data: SlotSuggestionRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Best weekly slots for a new class: the ones where most candidate students
+    have no class yet (and the teacher, if given, is free).
+    """
+    return await slot_service.suggest_slots(db, data)
+
+
+@router.get("/seats/stream")
+async def stream_seats(class_ids: Optional[List[int]] = Query(None)):
+    """
+    Server-Sent Events with live seat changes, instead of polling the catalog.
+
+    ``event: seats`` carries ``{class_id: {"registered": n, "version": v}}``, the
+    newest state per class since the last event: apply it only if ``v`` is
+    greater than the ``seat_version`` already held. ``event: resync`` means
+    updates were lost and the catalog should be refetched.
+    """
+    subscriber = seat_service.seat_hub.connect(set(class_ids) if class_ids else None)
+    return StreamingResponse(
+        seat_service.stream_seats(subscriber),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.get("/{class_id}", response_model=ClassResponse)
 async def get_class(class_id: int, db: AsyncSession = Depends(get_db)):
-    return await class_service.get_class_by_id(db, class_id)
+    return await class_service.class_cache.get(db, class_id)
 
 
 @router.post("/", response_model=ClassResponse, status_code=201)
@@ -26,6 +79,12 @@ async def create_class(data: ClassCreate, db: AsyncSession = Depends(get_db)):
     return await class_service.create_class(db, data)
 
 
+@router.patch("/bulk", response_model=BulkUpdateResponse)
+async def bulk_update_classes(data: ClassBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """Patch every class matching ``filter`` in one statement (e.g. shift a teacher's classes)."""
+    return await class_service.bulk_update_classes(db, data)
+
+
 @router.put("/{class_id}", response_model=ClassResponse)
 async def update_class(class_id: int, data: ClassUpdate, db: AsyncSession = Depends(get_db)):
     return await class_service.update_class(db, class_id, data)
@@ -38,16 +97,39 @@ async def delete_class(class_id: int, db: AsyncSession = Depends(get_db)):
 
 # --- Registration endpoints ---
 
-@router.post("/{class_id}/register", response_model=RegistrationResponse, status_code=201)
+@router.post(
+    "/{class_id}/register",
+    response_model=RegistrationResponse,
+    status_code=201,
+    responses={202: {"model": RegistrationTicketResponse, "description": "Queued (class in rush mode)"}},
+)
 async def register_student(
     class_id: int,
     data: RegistrationCreate,
     db: AsyncSession = Depends(get_db)
 ):
-    """Register a student to a class. Checks for schedule conflicts."""
+    """
+    Register a student to a class. Checks for schedule conflicts.
+    Classes in rush mode queue the request instead and answer 202 with a ticket.
+    """
+    target_class = await db.get(Class, class_id)
+    if target_class and target_class.rush_mode:
+        try:
+            ticket = await rush_service.enqueue_registration(class_id, data.student_id)
+            return JSONResponse(status_code=202, content=ticket)
+        except REDIS_FAILURES as exc:
+            # Redis down -> register directly
+            logger.warning("Rush queue unavailable for class %d, registering directly: %r", class_id, exc)
+            metrics.incr("rush_enqueue_fallback")
     return await registration_service.register_student_to_class(db, class_id, data.student_id)
 
 
+@router.get("/{class_id}/tickets/{ticket_id}", response_model=RegistrationTicketResponse)
+async def get_registration_ticket(class_id: int, ticket_id: str):
+    """Status of a queued (rush mode) registration."""
+    return await rush_service.get_ticket(class_id, ticket_id)
+
+
 @router.delete("/{class_id}/unregister/{student_id}")
 async def unregister_student(
     class_id: int,
@@ -57,6 +139,19 @@ async def unregister_student(
     return await registration_service.unregister_student_from_class(db, class_id, student_id)
 
 
-@router.get("/{class_id}/students", response_model=List[StudentResponse])
-async def get_class_students(class_id: int, db: AsyncSession = Depends(get_db)):
-    return await registration_service.get_class_students(db, class_id)
+@router.get(
+    "/{class_id}/students",
+    response_model=Union[List[StudentResponse], List[StudentSummaryResponse]],
+)
+async def get_class_students(
+    class_id: int,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    slim: bool = False,
+    db: AsyncSession = Depends(get_db),
+):
+    """Class roster ordered by name; ``slim=true`` returns id + name only. Total in ``X-Total-Count``."""
+    total, students = await registration_service.get_class_students(db, class_id, skip, limit, slim)
+    response.headers["X-Total-Count"] = str(total)
+    return students
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from datetime import datetime
+from datetime import datetime, date
 
 from app.db.database import get_db
 from app.models.student import Student
@@ -9,6 +9,7 @@ from app.models.parent import Parent
 from app.models.class_model import Class
 from app.models.registration import ClassRegistration
 from app.models.subscription import Subscription
+from app.services.term_scope import get_current_term_id, in_term
 
 router = APIRouter(prefix="/dashboard", tags=["Dashboard"])
 
@@ -29,13 +30,19 @@ async def get_dashboard_stats(db: AsyncSession = Depends(get_db)):
     classes_count = await db.execute(select(func.count(Class.id)))
     total_classes = classes_count.scalar()
 
-    # Total registrations
-    regs_count = await db.execute(select(func.count(ClassRegistration.id)))
+    # Total registrations (current term)
+    term_id = await get_current_term_id(db)
+    regs_count = await db.execute(
+        select(func.count(ClassRegistration.id)).where(in_term(ClassRegistration.term_id, term_id))
+    )
     total_registrations = regs_count.scalar()
 
-    # Active subscriptions
+    # Active subscriptions (end_date guard covers rows the expiry sweeper hasn't reached yet)
     active_subs = await db.execute(
-        select(func.count(Subscription.id)).where(Subscription.is_active == True)
+        select(func.count(Subscription.id)).where(
+            Subscription.is_active == True,
+            Subscription.end_date >= date.today(),
+        )
     )
     total_active_subs = active_subs.scalar()
 
@@ -0,0 +1,22 @@
+from fastapi import APIRouter
+
+from app.schemas.job import JobCreate, JobResponse, JobProgressResponse
+from app.services import job_service
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+
+@router.post("/", response_model=JobResponse, status_code=202)
+async def create_job(data: JobCreate):
+    """Queue a heavy operation; poll the returned job id for status."""
+    return await job_service.enqueue_job(data.name, data.params)
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    return await job_service.get_job(job_id)
+
+
+@router.get("/{job_id}/progress", response_model=JobProgressResponse)
+async def get_job_progress(job_id: str):
+    return await job_service.get_job(job_id)
@@ -1,22 +1,37 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
+from app.core.config import get_settings
 from app.db.database import get_db
-from app.schemas.parent import ParentCreate, ParentUpdate, ParentResponse
+from app.schemas.parent import ParentCreate, ParentUpdate, ParentResponse, ParentOverviewResponse
 from app.services import parent_service
 
+settings = get_settings()
+
 router = APIRouter(prefix="/parents", tags=["Parents"])
 
 
 @router.get("/", response_model=List[ParentResponse])
-async def list_parents(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await parent_service.get_all_parents(db, skip, limit)
+async def list_parents(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    q: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """``q``: accent-insensitive search, results ranked by relevance."""
+    return await parent_service.get_all_parents(db, skip, limit, q=q)
 
 
 @router.get("/{parent_id}", response_model=ParentResponse)
 async def get_parent(parent_id: int, db: AsyncSession = Depends(get_db)):
-    return await parent_service.get_parent_by_id(db, parent_id)
+    return await parent_service.parent_cache.get(db, parent_id)
+
+
+@router.get("/{parent_id}/overview", response_model=ParentOverviewResponse)
+async def get_parent_overview(parent_id: int, db: AsyncSession = Depends(get_db)):
+    """Parent with their students, each student's classes and subscriptions (cached)."""
+    return await parent_service.get_parent_overview(db, parent_id)
 
 
 @router.post("/", response_model=ParentResponse, status_code=201)
@@ -0,0 +1,30 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.db.database import get_db
+from app.schemas.search import SearchResponse
+from app.services import student_service, parent_service, class_service
+
+settings = get_settings()
+
+router = APIRouter(prefix="/search", tags=["Search"])
+
+
+@router.get("/", response_model=SearchResponse)
+async def search(
+    q: str = Query(..., min_length=1),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=settings.LIST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Accent-insensitive search over student names, parent names / emails /
+    phone prefixes and class name / subject / teacher. Each list is ranked
+    and paginated independently with ``skip`` / ``limit``.
+    """
+    return {
+        "students": await student_service.get_all_students(db, skip, limit, q=q),
+        "parents": await parent_service.get_all_parents(db, skip, limit, q=q),
+        "classes": await class_service.get_all_classes(db, skip, limit, q=q),
+    }
@@ -1,22 +1,45 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
+from datetime import date
 
+from app.core.config import get_settings
 from app.db.database import get_db
 from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
-from app.services import student_service
+from app.schemas.attendance import AttendanceResponse
+from app.schemas.subscription import SubscriptionResponse, CheckInBatch, CheckInBatchResponse
+from app.services import student_service, attendance_service, subscription_service
+
+settings = get_settings()
 
 router = APIRouter(prefix="/students", tags=["Students"])
 
 
 @router.get("/", response_model=List[StudentResponse])
-async def list_students(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
-    return await student_service.get_all_students(db, skip, limit)
+async def list_students(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    q: Optional[str] = None,
+    db: AsyncSession = Depends(get_db),
+):
+    """``q``: accent-insensitive search, results ranked by relevance."""
+    return await student_service.get_all_students(db, skip, limit, q=q)
+
+
+@router.post("/check-in", response_model=CheckInBatchResponse)
+async def check_in_students(data: CheckInBatch, db: AsyncSession = Depends(get_db)):
+    """Check in a list of students (e.g. a whole class) in one statement."""
+    subs = await subscription_service.check_in_students(db, data.student_ids, data.class_id)
+    checked_in = {sub.student_id for sub in subs}
+    return {
+        "checked_in": subs,
+        "not_checked_in": sorted(set(data.student_ids) - checked_in),
+    }
 
 
 @router.get("/{student_id}", response_model=StudentResponse)
 async def get_student(student_id: int, db: AsyncSession = Depends(get_db)):
-    return await student_service.get_student_by_id(db, student_id)
+    return await student_service.student_cache.get(db, student_id)
 
 
 @router.post("/", response_model=StudentResponse, status_code=201)
@@ -32,3 +55,26 @@ async def update_student(student_id: int, data: StudentUpdate, db: AsyncSession
 @router.delete("/{student_id}")
 async def delete_student(student_id: int, db: AsyncSession = Depends(get_db)):
     return await student_service.delete_student(db, student_id)
+
+
+@router.get("/{student_id}/attendance", response_model=List[AttendanceResponse])
+async def get_student_attendance(
+    student_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    """Check-in history of a student, newest first."""
+    await student_service.student_cache.get(db, student_id)
+    return await attendance_service.get_student_attendance(db, student_id, date_from, date_to, skip, limit)
+
+
+@router.post("/{student_id}/check-in", response_model=SubscriptionResponse)
+async def check_in_student(student_id: int, class_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    """
+    Deduct one session from the student's active subscription that ends
+    first (optionally for a given class). 409: a concurrent check-in holds it.
+    """
+    return await subscription_service.check_in_student(db, student_id, class_id)
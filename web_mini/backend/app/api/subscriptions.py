@@ -1,22 +1,31 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List
+from typing import List, Optional
 
+from app.core.config import get_settings
 from app.db.database import get_db
-from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate, SubscriptionResponse
+from app.schemas.subscription import (
+    SubscriptionCreate, SubscriptionUpdate, SubscriptionResponse, SubscriptionBulkUpdate, BulkUpdateResponse,
+)
 from app.services import subscription_service
 
+settings = get_settings()
+
 router = APIRouter(prefix="/subscriptions", tags=["Subscriptions"])
 
 
 @router.get("/", response_model=List[SubscriptionResponse])
-async def list_subscriptions(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+async def list_subscriptions(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
     return await subscription_service.get_all_subscriptions(db, skip, limit)
 
 
 @router.get("/{sub_id}", response_model=SubscriptionResponse)
 async def get_subscription(sub_id: int, db: AsyncSession = Depends(get_db)):
-    return await subscription_service.get_subscription_by_id(db, sub_id)
+    return await subscription_service.subscription_cache.get(db, sub_id)
 
 
 @router.get("/student/{student_id}", response_model=List[SubscriptionResponse])
@@ -29,15 +38,21 @@ async def create_subscription(data: SubscriptionCreate, db: AsyncSession = Depen
     return await subscription_service.create_subscription(db, data)
 
 
+@router.patch("/bulk", response_model=BulkUpdateResponse)
+async def bulk_update_subscriptions(data: SubscriptionBulkUpdate, db: AsyncSession = Depends(get_db)):
+    """Patch every subscription matching ``filter`` in one statement (e.g. term renewal)."""
+    return await subscription_service.bulk_update_subscriptions(db, data)
+
+
 @router.put("/{sub_id}", response_model=SubscriptionResponse)
 async def update_subscription(sub_id: int, data: SubscriptionUpdate, db: AsyncSession = Depends(get_db)):
     return await subscription_service.update_subscription(db, sub_id, data)
 
 
 @router.patch("/{sub_id}/use-session", response_model=SubscriptionResponse)
-async def use_session(sub_id: int, db: AsyncSession = Depends(get_db)):
-    """Deduct one session from the subscription."""
-    return await subscription_service.use_session(db, sub_id)
+async def use_session(sub_id: int, class_id: Optional[int] = None, db: AsyncSession = Depends(get_db)):
+    """Deduct one session from the subscription (optionally for a given class)."""
+    return await subscription_service.use_session(db, sub_id, class_id)
 
 
 @router.delete("/{sub_id}")
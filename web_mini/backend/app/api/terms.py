@@ -0,0 +1,61 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+
+from app.core.config import get_settings
+from app.db.database import get_db
+from app.schemas.term import (
+    TermCreate, TermResponse, ArchivedRegistrationResponse, ArchivedSubscriptionResponse,
+)
+from app.schemas.job import JobResponse
+from app.services import term_service, job_service
+
+settings = get_settings()
+
+router = APIRouter(prefix="/terms", tags=["Terms"])
+
+
+@router.get("/", response_model=List[TermResponse])
+async def list_terms(db: AsyncSession = Depends(get_db)):
+    return await term_service.get_terms(db)
+
+
+@router.post("/", response_model=TermResponse, status_code=201)
+async def create_term(data: TermCreate, db: AsyncSession = Depends(get_db)):
+    return await term_service.create_term(db, data)
+
+
+@router.post("/{term_id}/activate", response_model=TermResponse)
+async def activate_term(term_id: int, db: AsyncSession = Depends(get_db)):
+    """New registrations go into this term; seat counts and rosters only read it."""
+    return await term_service.activate_term(db, term_id)
+
+
+@router.post("/{term_id}/archive", response_model=JobResponse, status_code=202)
+async def archive_term(term_id: int, db: AsyncSession = Depends(get_db)):
+    """Move a closed term's registrations and finished subscriptions to the archive tables (job)."""
+    await term_service.check_archivable(db, term_id)
+    return await job_service.enqueue_job("archive_term", {"term_id": term_id})
+
+
+@router.get("/{term_id}/archive/registrations", response_model=List[ArchivedRegistrationResponse])
+async def get_archived_registrations(
+    term_id: int,
+    student_id: Optional[int] = None,
+    class_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    return await term_service.get_archived_registrations(db, term_id, student_id, class_id, skip, limit)
+
+
+@router.get("/{term_id}/archive/subscriptions", response_model=List[ArchivedSubscriptionResponse])
+async def get_archived_subscriptions(
+    term_id: int,
+    student_id: Optional[int] = None,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=settings.LIST_MAX_LIMIT),
+    db: AsyncSession = Depends(get_db),
+):
+    return await term_service.get_archived_subscriptions(db, term_id, student_id, skip, limit)
@@ -0,0 +1,182 @@
+"""
+Per-route request deadlines.
+
+Each request gets a time budget from the first matching ``DEADLINE_RULES``
+entry (``DEADLINE_DEFAULT`` otherwise). The deadline is visible to the DB
+layer through ``remaining()``: every transaction opened during the request
+starts with ``SET LOCAL statement_timeout`` set to the time left, so Postgres
+stops a slow query even if nobody is waiting for it any more.
+
+- budget spent         -> handler cancelled, 504
+- DB statement timeout -> 504
+- DB pool exhausted    -> 503
+- client disconnected  -> handler cancelled (its in-flight query with it), no response
+
+Once the request starts committing (``mark_committing``, called by the DB
+session) the handler is never cancelled: its write is, or is about to be,
+durable, so it runs to the end (after-commit hooks included) and the real
+response is returned, late. A 504 there would report a failed write that
+happened and release its Idempotency-Key, letting a retry run it twice.
+
+Breaches are counted per route template in ``/metrics``.
+"""
+import asyncio
+import json
+import re
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+
+from app.core import metrics
+from app.core.config import get_settings, DeadlineRule
+from app.core.profiling import route_template
+
+settings = get_settings()
+
+# Postgres "query_canceled": statement_timeout or a cancel request
+QUERY_CANCELED = "57014"
+
+_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_committing: ContextVar[Optional[asyncio.Event]] = ContextVar("request_committing", default=None)
+
+
+def remaining() -> Optional[float]:
+    """Seconds left for the current request, ``None`` outside a request with a deadline."""
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - time.monotonic()
+
+
+def mark_committing():
+    """The current request is committing a transaction: do not cancel it any more."""
+    committing = _committing.get()
+    if committing is not None:
+        committing.set()
+
+
+def _is_statement_timeout(exc: BaseException) -> bool:
+    if not isinstance(exc, DBAPIError):
+        return False
+    orig = exc.orig
+    return QUERY_CANCELED in (getattr(orig, "sqlstate", None), getattr(orig, "pgcode", None))
+
+
+async def _respond(send, status: int, detail: str):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _read_body(receive) -> Optional[bytes]:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            return b"".join(chunks)
+
+
+class DeadlineMiddleware:
+    def __init__(self, app, rules: list[DeadlineRule] = None):
+        self.app = app
+        self.rules = [(rule, re.compile(rule.path)) for rule in (rules or settings.DEADLINE_RULES)]
+
+    def _budget(self, scope) -> Optional[float]:
+        method, path = scope["method"], scope["path"]
+        for rule, pattern in self.rules:
+            if rule.method in ("*", method) and pattern.match(path):
+                return rule.budget
+        return settings.DEADLINE_DEFAULT
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        budget = self._budget(scope)
+        if budget is None:  # long-lived routes (SSE)
+            return await self.app(scope, receive, send)
+
+        # Body read up front: from then on this middleware owns ``receive``
+        # and watches it for the client going away while the handler runs
+        body = await _read_body(receive)
+        if body is None:
+            return
+        body_sent = False
+        disconnected = asyncio.Event()
+
+        async def receive_again():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def watch_disconnect():
+            while (await receive())["type"] != "http.disconnect":
+                pass
+            disconnected.set()
+
+        started = False
+
+        async def send_wrapper(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        committing = asyncio.Event()
+        token = _deadline.set(time.monotonic() + budget)
+        committing_token = _committing.set(committing)
+        handler = asyncio.ensure_future(self.app(scope, receive_again, send_wrapper))
+        watcher = asyncio.ensure_future(watch_disconnect())
+        try:
+            await asyncio.wait({handler, watcher}, timeout=budget, return_when=asyncio.FIRST_COMPLETED)
+        except asyncio.CancelledError:
+            handler.cancel()
+            raise
+        finally:
+            _committing.reset(committing_token)
+            _deadline.reset(token)
+            watcher.cancel()
+
+        if not handler.done() and committing.is_set():
+            # Committed (or committing): let the handler finish and answer for real
+            metrics.incr("deadline_overrun_after_commit", route=route_template(scope))
+            await asyncio.wait({handler})
+
+        if not handler.done():
+            handler.cancel()
+            try:
+                await handler
+            except BaseException:
+                pass
+            if disconnected.is_set():
+                metrics.incr("client_disconnected", route=route_template(scope))
+                return
+            metrics.incr("deadline_exceeded", route=route_template(scope))
+            if not started:
+                await _respond(send, 504, "Request took too long, please retry")
+            return
+
+        exc = handler.exception()
+        if exc is None:
+            return
+        if started:
+            raise exc
+        if _is_statement_timeout(exc):
+            metrics.incr("deadline_exceeded", route=route_template(scope))
+            return await _respond(send, 504, "Request took too long, please retry")
+        if isinstance(exc, PoolTimeoutError):
+            metrics.incr("db_pool_timeouts", route=route_template(scope))
+            return await _respond(send, 503, "Server busy, please retry shortly")
+        raise exc
@@ -0,0 +1,163 @@
+"""
+``Idempotency-Key`` support for mutating routes.
+
+The first request with a given key (per method + path) claims it in Redis
+with an in-flight marker, runs normally, and its response is stored for
+``IDEMPOTENCY_TTL`` seconds. Retries are answered from Redis with a single
+GET and never reach the handler:
+
+- same key, response stored   -> the stored response, ``Idempotent-Replayed: true``
+- same key, still in flight   -> 409 with ``Retry-After``
+- same key, different body    -> 422
+
+Only final outcomes are stored. 5xx responses, exceptions and the "try
+again" statuses (409 conflict, 429 throttled, ...) release the key, so the
+client's retry with the same key actually runs again.
+Redis errors fail open (the request runs unprotected).
+"""
+import hashlib
+import json
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.cache import cache_get, cache_set, encode
+from app.db.redis import cache_client
+
+settings = get_settings()
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+IDEMPOTENCY_KEY_PREFIX = "idempotency:"
+IDEMPOTENCY_SCHEMA = 1
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+MUTATING_METHODS = ("POST", "PUT", "PATCH", "DELETE")
+
+IN_FLIGHT = "in_flight"
+DONE = "done"
+
+# Answers that tell the client to retry; storing them would replay the refusal forever
+RETRY_STATUSES = frozenset({408, 409, 425, 429})
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+async def _read_body(receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    return b"".join(chunks)
+
+
+async def _respond(send, status: int, detail: str, headers: list = ()):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _replay(send, stored: dict):
+    headers = [(bytes(name), bytes(value)) for name, value in stored["headers"]]
+    await send({
+        "type": "http.response.start",
+        "status": stored["status"],
+        "headers": headers + [(b"idempotent-replayed", b"true")],
+    })
+    await send({"type": "http.response.body", "body": stored["body"]})
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in MUTATING_METHODS:
+            return await self.app(scope, receive, send)
+        key = _header(scope, IDEMPOTENCY_HEADER)
+        if not key:
+            return await self.app(scope, receive, send)
+        if len(key) > IDEMPOTENCY_MAX_KEY_LENGTH:
+            return await _respond(send, 400, "Idempotency-Key is too long")
+
+        # The body is read up front (fingerprint), then handed to the app again
+        body = await _read_body(receive)
+        body_sent = False
+
+        async def receive_again():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        fingerprint = hashlib.sha256(body).hexdigest()
+        redis_key = f"{IDEMPOTENCY_KEY_PREFIX}{scope['method']}:{scope['path']}:{key}"
+
+        try:
+            stored = await cache_get(redis_key, IDEMPOTENCY_SCHEMA)
+            if stored is None:
+                marker = encode({"state": IN_FLIGHT, "fingerprint": fingerprint}, IDEMPOTENCY_SCHEMA)
+                claimed = await cache_client.set(redis_key, marker, nx=True, ex=settings.IDEMPOTENCY_LOCK_TTL)
+                if not claimed:
+                    # Lost the race to a concurrent duplicate
+                    stored = await cache_get(redis_key, IDEMPOTENCY_SCHEMA) or {
+                        "state": IN_FLIGHT, "fingerprint": fingerprint,
+                    }
+        except Exception:
+            metrics.incr("idempotency_errors")
+            return await self.app(scope, receive_again, send)
+
+        if stored is not None:
+            if stored["fingerprint"] != fingerprint:
+                return await _respond(send, 422, "Idempotency-Key was already used with a different request")
+            if stored["state"] == IN_FLIGHT:
+                metrics.incr("idempotency_conflicts")
+                return await _respond(
+                    send, 409, "A request with this Idempotency-Key is still in progress",
+                    [(b"retry-after", b"1")],
+                )
+            metrics.incr("idempotency_replayed")
+            return await _replay(send, stored)
+
+        response = {"status": 500, "headers": [], "body": []}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+                response["headers"] = message.get("headers", [])
+            elif message["type"] == "http.response.body":
+                response["body"].append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_again, send_wrapper)
+        finally:
+            try:
+                if response["status"] < 500 and response["status"] not in RETRY_STATUSES:
+                    await cache_set(redis_key, {
+                        "state": DONE,
+                        "fingerprint": fingerprint,
+                        "status": response["status"],
+                        "headers": [list(header) for header in response["headers"]],
+                        "body": b"".join(response["body"]),
+                    }, ttl=settings.IDEMPOTENCY_TTL, schema=IDEMPOTENCY_SCHEMA)
+                else:
+                    await cache_client.delete(redis_key)
+            except Exception:
+                metrics.incr("idempotency_errors")
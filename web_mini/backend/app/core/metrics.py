@@ -0,0 +1,31 @@
+"""
+In-process counters and gauges, exposed at ``GET /metrics``.
+Values are per worker process.
+"""
+from collections import defaultdict
+from typing import Callable
+
+_counters: dict[str, float] = defaultdict(float)
+_gauges: dict[str, Callable[[], object]] = {}
+
+
+def _key(name: str, labels: dict) -> str:
+    if not labels:
+        return name
+    return name + "{" + ",".join(f'{k}="{v}"' for k, v in sorted(labels.items())) + "}"
+
+
+def incr(name: str, amount: float = 1, **labels):
+    _counters[_key(name, labels)] += amount
+
+
+def register_gauge(name: str, fn: Callable[[], object]):
+    """Register a callable evaluated on every snapshot (live state)."""
+    _gauges[name] = fn
+
+
+def snapshot() -> dict:
+    data = dict(sorted(_counters.items()))
+    for name, fn in _gauges.items():
+        data[name] = fn()
+    return data
@@ -0,0 +1,150 @@
+"""
+Opt-in request profiler.
+
+``ProfilingMiddleware`` profiles a random ``PROFILING_SAMPLE_RATE`` fraction
+of requests, plus any request sent with ``X-Profile: <PROFILING_TOKEN>``,
+using pyinstrument's sampling profiler. Each profile is written to
+``PROFILING_DIR`` as a speedscope file (open it at https://www.speedscope.app)
+next to a small metadata file; ``/api/admin/profiles`` lists and serves them.
+
+The middleware is only installed when ``PROFILING_ENABLED`` is set, so a
+disabled profiler costs nothing per request.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core import metrics
+from app.core.config import get_settings
+
+settings = get_settings()
+
+PROFILE_HEADER = b"x-profile"
+PROFILE_SUFFIX = ".speedscope.json"
+META_SUFFIX = ".meta.json"
+
+
+def route_template(scope) -> str:
+    """Route path template (``/api/classes/{class_id}``) once the router has run."""
+    endpoint = scope.get("endpoint")
+    for route in getattr(scope.get("app"), "routes", []):
+        if getattr(route, "endpoint", None) is endpoint:
+            return route.path
+    return scope["path"]
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _write_profile(directory: str, meta: dict, speedscope: str):
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, meta["id"] + PROFILE_SUFFIX), "w") as f:
+        f.write(speedscope)
+    with open(os.path.join(directory, meta["id"] + META_SUFFIX), "w") as f:
+        json.dump(meta, f)
+
+    # Keep only the most recent profiles
+    metas = sorted(name for name in os.listdir(directory) if name.endswith(META_SUFFIX))
+    for name in metas[:max(len(metas) - settings.PROFILING_MAX_PROFILES, 0)]:
+        profile_id = name[:-len(META_SUFFIX)]
+        for suffix in (META_SUFFIX, PROFILE_SUFFIX):
+            try:
+                os.remove(os.path.join(directory, profile_id + suffix))
+            except FileNotFoundError:
+                pass
+
+
+def list_profiles(route: str = None, limit: int = 50) -> list[dict]:
+    """Newest first, optionally only one route template."""
+    directory = settings.PROFILING_DIR
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in sorted(os.listdir(directory), reverse=True):
+        if not name.endswith(META_SUFFIX):
+            continue
+        try:
+            with open(os.path.join(directory, name)) as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            continue  # being written or pruned
+        if route is None or meta["route"] == route:
+            profiles.append(meta)
+            if len(profiles) >= limit:
+                break
+    return profiles
+
+
+def profile_path(profile_id: str) -> Optional[str]:
+    # Ids are generated below: "<timestamp>-<hex>"; reject anything else (path traversal)
+    if not all(ch.isalnum() or ch == "-" for ch in profile_id):
+        return None
+    path = os.path.join(settings.PROFILING_DIR, profile_id + PROFILE_SUFFIX)
+    return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, sample_rate: float = None, token: str = None):
+        self.app = app
+        self.sample_rate = settings.PROFILING_SAMPLE_RATE if sample_rate is None else sample_rate
+        self.token = settings.PROFILING_TOKEN if token is None else token
+
+    def _trigger(self, scope) -> Optional[str]:
+        if self.token and _header(scope, PROFILE_HEADER) == self.token:
+            return "header"
+        if self.sample_rate and random.random() < self.sample_rate:
+            return "sample"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        trigger = self._trigger(scope)
+        if trigger is None:
+            return await self.app(scope, receive, send)
+
+        from pyinstrument import Profiler
+        from pyinstrument.renderers import SpeedscopeRenderer
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        profiler = Profiler(interval=settings.PROFILING_INTERVAL, async_mode="enabled")
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            duration_ms = (time.perf_counter() - started) * 1000
+            now = datetime.now(timezone.utc)
+            meta = {
+                "id": f"{now.strftime('%Y%m%d%H%M%S%f')}-{uuid.uuid4().hex[:8]}",
+                "method": scope["method"],
+                "route": route_template(scope),
+                "path": scope["path"],
+                "status": status,
+                "duration_ms": round(duration_ms, 1),
+                "trigger": trigger,
+                "created_at": now.isoformat(),
+            }
+            try:
+                speedscope = profiler.output(renderer=SpeedscopeRenderer())
+                await asyncio.to_thread(_write_profile, settings.PROFILING_DIR, meta, speedscope)
+                metrics.incr("profiles_recorded", trigger=trigger)
+            except Exception:
+                metrics.incr("profiles_failed")
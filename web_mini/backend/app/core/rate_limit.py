@@ -0,0 +1,135 @@
+"""
+Admission control for write-heavy routes.
+
+- Token buckets per route / per client, evaluated atomically in Redis (Lua).
+- Pool-aware load shedding: routes marked ``shed`` are rejected with 503 while
+  DB pool checkouts are queueing, so cheap reads keep their connections.
+
+Rejections are cheap (no DB access) and carry a ``Retry-After`` header.
+"""
+import ipaddress
+import json
+import math
+import re
+
+from app.core import metrics
+from app.core.config import get_settings, RateLimitRule
+from app.db.database import pool_stats
+from app.db.redis import cache_client
+
+settings = get_settings()
+
+RATE_LIMIT_KEY_PREFIX = "ratelimit:"
+
+_TRUSTED_PROXIES = [ipaddress.ip_network(network, strict=False) for network in settings.TRUSTED_PROXIES]
+
+# KEYS[1] = bucket key, ARGV = rate (tokens/s), burst
+# Returns {allowed (0/1), retry_after_ms}
+TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+local allowed = 0
+local retry_after = 0
+if tokens >= 1 then
+  tokens = tokens - 1
+  allowed = 1
+else
+  retry_after = math.ceil((1 - tokens) * 1000 / rate)
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+return {allowed, retry_after}
+"""
+
+
+def _trusted_proxy(ip: str) -> bool:
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return False
+    return any(address in network for network in _TRUSTED_PROXIES)
+
+
+def _client_id(scope) -> str:
+    """
+    The client's IP: the peer, or behind ``TRUSTED_PROXIES`` the right-most
+    ``X-Forwarded-For`` hop that is not one of them. Hops further left were
+    sent by the client and are ignored, as are client-chosen ids.
+    """
+    client = scope.get("client")
+    ip = client[0] if client else "unknown"
+    if not _trusted_proxy(ip):
+        return ip
+    forwarded = b",".join(value for name, value in scope["headers"] if name == b"x-forwarded-for")
+    for hop in reversed(forwarded.decode("latin-1").split(",")):
+        hop = hop.strip()
+        if hop:
+            ip = hop
+            if not _trusted_proxy(hop):
+                break
+    return ip
+
+
+async def _reject(send, status: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(1, math.ceil(retry_after))).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+class AdmissionControlMiddleware:
+    def __init__(self, app, rules: list[RateLimitRule] = None):
+        self.app = app
+        self.rules = [(rule, re.compile(rule.path)) for rule in (rules or settings.RATE_LIMIT_RULES)]
+        # Short timeouts and the cache circuit breaker: a hung Redis fails open at once
+        self._script = cache_client.register_script(TOKEN_BUCKET_LUA)
+
+    def _matching(self, scope) -> list[RateLimitRule]:
+        method, path = scope["method"], scope["path"]
+        return [rule for rule, pattern in self.rules if rule.method == method and pattern.match(path)]
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        rules = self._matching(scope)
+        if not rules:
+            return await self.app(scope, receive, send)
+
+        # 1. Load shedding: the pool is already queueing, don't add to it
+        if any(rule.shed for rule in rules) and pool_stats.wait_ms > settings.LOAD_SHED_WAIT_MS:
+            metrics.incr("load_shed_rejected", rule=rules[0].name)
+            return await _reject(send, 503, "Server busy, please retry shortly", 1)
+
+        # 2. Token buckets (fail open when Redis is unavailable)
+        client = _client_id(scope)
+        for rule in rules:
+            key = RATE_LIMIT_KEY_PREFIX + rule.name
+            if rule.scope == "client":
+                key += ":" + client
+            try:
+                allowed, retry_after_ms = await self._script(keys=[key], args=[rule.rate, rule.burst])
+            except Exception:
+                metrics.incr("rate_limit_errors")
+                continue
+            if not allowed:
+                metrics.incr("rate_limit_rejected", rule=rule.name)
+                return await _reject(send, 429, "Too many requests", retry_after_ms / 1000)
+
+        return await self.app(scope, receive, send)
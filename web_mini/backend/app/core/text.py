@@ -0,0 +1,19 @@
+import re
+import unicodedata
+
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_search_text(*parts) -> str:
+    """
+    Lowercase, accent-free form of the given strings, used for search.
+
+    "Nguyễn Văn Đức" -> "nguyen van duc". Done in Python (not Postgres
+    ``unaccent``) so the stored column can be indexed and behaves the same on
+    every database.
+    """
+    text = " ".join(p for p in parts if p)
+    text = text.replace("đ", "d").replace("Đ", "D")
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    return _SPACES.sub(" ", text).strip().lower()
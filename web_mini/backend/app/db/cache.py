@@ -0,0 +1,218 @@
+"""
+Compact cache payloads for Redis.
+
+Values are msgpack-encoded, compressed when larger than
+``CACHE_COMPRESS_MIN_BYTES`` and prefixed with a 4-byte header::
+
+    magic | codec version | compression | schema version
+
+Each key family passes its own ``schema`` version; bump it when the cached
+shape changes and entries written under the old shape (or by the old JSON
+cache) read as misses instead of breaking the caller.
+
+Read-through caches guard against stale writes with a version counter per
+key (``<key>:version``). A reader notes the version along with its cache
+miss and only writes its result back if the version is unchanged
+(``*_if_version``, checked and written in one Lua call); invalidation bumps
+the version as it deletes (``cache_invalidate``). A reader that loaded its
+rows before a concurrent commit therefore cannot cache them after that
+commit's invalidation.
+
+Helpers raise on Redis errors; callers keep their ``try/except`` fallback.
+"""
+import struct
+from typing import Any, Optional
+
+import msgpack
+import zstandard
+
+from app.core.config import get_settings
+from app.db.redis import cache_client, CACHE_TTL
+
+try:
+    import lz4.frame
+except ImportError:  # optional, only needed with CACHE_COMPRESSION=lz4
+    lz4 = None
+
+settings = get_settings()
+
+MAGIC = 0xCA
+CODEC_VERSION = 1
+HEADER = struct.Struct(">BBBB")
+
+VERSION_SUFFIX = ":version"
+VERSION_TTL = 86400  # seconds; only has to outlive the reads racing an invalidation
+
+# KEYS = key1, version1, key2, version2, ...; ARGV = ttl, then expected version and payload per key
+SET_IF_VERSION_LUA = """
+local written = 0
+for i = 1, #KEYS, 2 do
+  if (redis.call('GET', KEYS[i + 1]) or '') == ARGV[i + 1] then
+    redis.call('SET', KEYS[i], ARGV[i + 2], 'EX', ARGV[1])
+    written = written + 1
+  end
+end
+return written
+"""
+
+# KEYS = hash, version; ARGV = ttl, expected version, field, payload
+HSET_IF_VERSION_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[2] then
+  return 0
+end
+redis.call('HSET', KEYS[1], ARGV[3], ARGV[4])
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZSTD = 1
+COMPRESSION_LZ4 = 2
+COMPRESSION_IDS = {"none": COMPRESSION_NONE, "zstd": COMPRESSION_ZSTD, "lz4": COMPRESSION_LZ4}
+
+_zstd_compressor = zstandard.ZstdCompressor(level=3)
+_zstd_decompressor = zstandard.ZstdDecompressor()
+
+
+def _compress(method: int, body: bytes) -> bytes:
+    if method == COMPRESSION_ZSTD:
+        return _zstd_compressor.compress(body)
+    if method == COMPRESSION_LZ4:
+        return lz4.frame.compress(body)
+    return body
+
+
+def _decompress(method: int, body: bytes) -> bytes:
+    if method == COMPRESSION_ZSTD:
+        return _zstd_decompressor.decompress(body)
+    if method == COMPRESSION_LZ4:
+        return lz4.frame.decompress(body)
+    return body
+
+
+def encode(value: Any, schema: int = 0, compression: str = None, min_bytes: int = None) -> bytes:
+    """Serialize ``value`` (msgpack-compatible: dicts, lists, str, numbers, None)."""
+    body = msgpack.packb(value, use_bin_type=True)
+    method = COMPRESSION_IDS[compression or settings.CACHE_COMPRESSION]
+    if method == COMPRESSION_LZ4 and lz4 is None:
+        method = COMPRESSION_NONE
+    threshold = settings.CACHE_COMPRESS_MIN_BYTES if min_bytes is None else min_bytes
+    if method != COMPRESSION_NONE and len(body) >= threshold:
+        body = _compress(method, body)
+    else:
+        method = COMPRESSION_NONE
+    return HEADER.pack(MAGIC, CODEC_VERSION, method, schema) + body
+
+
+def decode(payload: Optional[bytes], schema: int = 0) -> Optional[Any]:
+    """Inverse of ``encode``; ``None`` for a miss, a foreign payload or another schema."""
+    if not payload or len(payload) < HEADER.size:
+        return None
+    magic, version, method, payload_schema = HEADER.unpack_from(payload)
+    if magic != MAGIC or version != CODEC_VERSION or payload_schema != schema:
+        return None
+    if method == COMPRESSION_LZ4 and lz4 is None:
+        return None
+    body = _decompress(method, payload[HEADER.size:])
+    return msgpack.unpackb(body, raw=False)
+
+
+async def cache_get(key: str, schema: int = 0) -> Optional[Any]:
+    return decode(await cache_client.get(key), schema)
+
+
+async def cache_set(key: str, value: Any, ttl: int = CACHE_TTL, schema: int = 0):
+    await cache_client.set(key, encode(value, schema), ex=ttl)
+
+
+async def cache_get_many(keys: list[str], schema: int = 0) -> list[Optional[Any]]:
+    """One MGET round trip; misses are ``None``."""
+    if not keys:
+        return []
+    return [decode(payload, schema) for payload in await cache_client.mget(keys)]
+
+
+async def cache_set_many(values: dict[str, Any], ttl: int = CACHE_TTL, schema: int = 0):
+    """Write several keys in one pipelined round trip."""
+    if not values:
+        return
+    async with cache_client.pipeline(transaction=False) as pipe:
+        for key, value in values.items():
+            pipe.set(key, encode(value, schema), ex=ttl)
+        await pipe.execute()
+
+
+async def cache_hget(key: str, field: str, schema: int = 0) -> Optional[Any]:
+    return decode(await cache_client.hget(key, field), schema)
+
+
+async def cache_hset(key: str, field: str, value: Any, ttl: int = CACHE_TTL, schema: int = 0):
+    """Set one field of a cached hash and (re)arm the TTL of the whole hash."""
+    async with cache_client.pipeline(transaction=True) as pipe:
+        pipe.hset(key, field, encode(value, schema))
+        pipe.expire(key, ttl)
+        await pipe.execute()
+
+
+def version_key(key: str) -> str:
+    return key + VERSION_SUFFIX
+
+
+async def cache_get_many_versioned(keys: list[str], schema: int = 0) -> list[tuple[Optional[Any], bytes]]:
+    """``(value, version)`` per key, values and versions in one MGET; pass the version to ``*_if_version``."""
+    if not keys:
+        return []
+    payloads = await cache_client.mget([*keys, *map(version_key, keys)])
+    return [
+        (decode(payload, schema), version or b"")
+        for payload, version in zip(payloads[:len(keys)], payloads[len(keys):])
+    ]
+
+
+async def cache_get_versioned(key: str, schema: int = 0) -> tuple[Optional[Any], bytes]:
+    return (await cache_get_many_versioned([key], schema))[0]
+
+
+async def cache_set_many_if_version(values: dict[str, tuple[Any, bytes]], ttl: int = CACHE_TTL, schema: int = 0):
+    """Write each ``key: (value, version)`` whose version was not bumped since it was read; one round trip."""
+    if not values:
+        return
+    keys, args = [], [ttl]
+    for key, (value, version) in values.items():
+        keys += [key, version_key(key)]
+        args += [version, encode(value, schema)]
+    await cache_client.register_script(SET_IF_VERSION_LUA)(keys=keys, args=args)
+
+
+async def cache_set_if_version(key: str, value: Any, version: bytes, ttl: int = CACHE_TTL, schema: int = 0):
+    await cache_set_many_if_version({key: (value, version)}, ttl=ttl, schema=schema)
+
+
+async def cache_hget_versioned(key: str, field: str, schema: int = 0) -> tuple[Optional[Any], bytes]:
+    """One field of a cached hash, and the hash's version."""
+    async with cache_client.pipeline(transaction=False) as pipe:
+        pipe.hget(key, field)
+        pipe.get(version_key(key))
+        payload, version = await pipe.execute()
+    return decode(payload, schema), version or b""
+
+
+async def cache_hset_if_version(
+    key: str, field: str, value: Any, version: bytes, ttl: int = CACHE_TTL, schema: int = 0
+):
+    """``cache_hset`` unless the hash was invalidated since ``version`` was read."""
+    await cache_client.register_script(HSET_IF_VERSION_LUA)(
+        keys=[key, version_key(key)], args=[ttl, version, field, encode(value, schema)],
+    )
+
+
+async def cache_invalidate(*keys: str):
+    """Delete the keys and bump their versions, so in-flight reads cannot write them back."""
+    if not keys:
+        return
+    async with cache_client.pipeline(transaction=True) as pipe:
+        for key in keys:
+            pipe.incr(version_key(key))
+            pipe.expire(version_key(key), VERSION_TTL)
+        pipe.delete(*keys)
+        await pipe.execute()
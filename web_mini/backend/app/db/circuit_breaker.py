@@ -0,0 +1,72 @@
+"""
+Circuit breaker for best-effort dependencies (the Redis cache).
+
+closed     calls go through; ``failure_threshold`` consecutive failures trip it
+open       calls fail immediately with ``CircuitOpenError`` for ``cooldown`` seconds
+half_open  one probe call goes through: success closes the circuit, failure
+           re-opens it for another cooldown; concurrent calls keep failing fast
+"""
+import time
+
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.core import metrics
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RedisConnectionError):
+    """Raised instead of calling a dependency whose circuit is open."""
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int, cooldown: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = 0.0
+        self._state = CLOSED
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            return HALF_OPEN
+        return self._state
+
+    def before_call(self):
+        """Raise ``CircuitOpenError`` unless the call may go through."""
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return
+        metrics.incr("circuit_rejected", breaker=self.name)
+        raise CircuitOpenError(f"{self.name} circuit is {state}")
+
+    def record_success(self):
+        self._probing = False
+        if self._state != CLOSED:
+            metrics.incr("circuit_closed", breaker=self.name)
+        self._state = CLOSED
+        self.failures = 0
+
+    def release(self):
+        """The call ended without telling whether the dependency is healthy (cancelled, bad command)."""
+        self._probing = False
+
+    def record_failure(self):
+        self._probing = False
+        self.failures += 1
+        if self._state == OPEN or self.failures >= self.failure_threshold:
+            if self._state != OPEN:
+                metrics.incr("circuit_opened", breaker=self.name)
+            self._state = OPEN
+            self.opened_at = time.monotonic()
+
+    def snapshot(self) -> dict:
+        return {"state": self.state, "consecutive_failures": self.failures}
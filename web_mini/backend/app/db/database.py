@@ -1,21 +1,170 @@
+import inspect
+import logging
+import time
+from sqlalchemy import DDL, event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, Session
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from app.core.config import get_settings
+from app.core import metrics
+from app.core.deadline import remaining, mark_committing
 
 settings = get_settings()
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = 10
+POOL_MAX_OVERFLOW = 20
+
+
+class PoolStats:
+    """
+    Connection checkout wait, read by the load shedder: an exponentially
+    weighted average of completed checkouts, or the age of the oldest checkout
+    still queueing if that is longer. When the pool is saturated no checkout
+    completes, so the average alone would go stale exactly then.
+    """
+
+    ALPHA = 0.2
+    STALE_AFTER = 1.0  # seconds without a completed checkout -> the average no longer counts
+
+    def __init__(self):
+        self._wait_ms = 0.0
+        self._last_sample = 0.0
+        self._waiting: dict[object, float] = {}  # pending checkout -> start, oldest first
+
+    def observe(self, seconds: float):
+        self._wait_ms += self.ALPHA * (seconds * 1000 - self._wait_ms)
+        self._last_sample = time.monotonic()
+
+    def begin_wait(self) -> object:
+        token = object()
+        self._waiting[token] = time.monotonic()
+        return token
+
+    def end_wait(self, token: object):
+        self.observe(time.monotonic() - self._waiting.pop(token))
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiting)
+
+    @property
+    def wait_ms(self) -> float:
+        now = time.monotonic()
+        recent = self._wait_ms if now - self._last_sample <= self.STALE_AFTER else 0.0
+        if not self._waiting:
+            return recent
+        oldest = next(iter(self._waiting.values()))
+        return max(recent, (now - oldest) * 1000)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waits for a connection."""
+
+    def _do_get(self):
+        token = pool_stats.begin_wait()
+        try:
+            return super()._do_get()
+        finally:
+            pool_stats.end_wait(token)
+
 
 # Async engine for FastAPI
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=TimedQueuePool,
+    pool_size=POOL_SIZE,
+    max_overflow=POOL_MAX_OVERFLOW,
 )
 
+metrics.register_gauge("db_pool_checkout_wait_ms", lambda: round(pool_stats.wait_ms, 2))
+metrics.register_gauge("db_pool_checked_out", lambda: engine.pool.checkedout())
+metrics.register_gauge("db_pool_waiting", lambda: pool_stats.waiting)
+
+# --- After-commit hooks ---
+# Cache invalidations (and other side effects that must only follow durable
+# writes) are queued on the session during the request and run once the
+# transaction commits. A rollback, including a savepoint rollback, drops the
+# hooks queued inside it.
+
+AFTER_COMMIT_HOOKS = "after_commit_hooks"
+
+
+def on_commit(session, fn, *args, unique: bool = True):
+    """
+    Run ``fn(*args)`` (sync or async) after ``session`` commits successfully.
+
+    With ``unique`` the same call is queued once per transaction, so e.g. a
+    batch of registrations invalidates the class catalog a single time.
+    """
+    sync_session = getattr(session, "sync_session", session)
+    hooks = sync_session.info.setdefault(AFTER_COMMIT_HOOKS, {})
+    key = (fn, args) if unique else object()
+    if key not in hooks:
+        transaction = sync_session.get_nested_transaction() or sync_session.get_transaction()
+        hooks[key] = (transaction, fn, args)
+
+
+class HookSyncSession(Session):
+    pass
+
+
+@event.listens_for(HookSyncSession, "after_soft_rollback")
+def _drop_rolled_back_hooks(session, previous_transaction):
+    hooks = session.info.get(AFTER_COMMIT_HOOKS)
+    if not hooks:
+        return
+    if previous_transaction.parent is None:
+        hooks.clear()
+        return
+    for key, (transaction, _, _) in list(hooks.items()):
+        # Drop hooks queued inside the rolled back savepoint (or below it)
+        while transaction is not None:
+            if transaction is previous_transaction:
+                del hooks[key]
+                break
+            transaction = transaction.parent
+
+
+@event.listens_for(HookSyncSession, "after_begin")
+def _apply_request_deadline(session, transaction, connection):
+    # Postgres cancels any statement that would outlive the request's deadline
+    left = remaining()
+    if left is not None and connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
+
+
+class HookSession(AsyncSession):
+    """``AsyncSession`` that runs ``on_commit`` hooks after a successful commit."""
+
+    sync_session_class = HookSyncSession
+
+    async def commit(self):
+        mark_committing()  # the request deadline no longer cancels this request
+        await super().commit()
+        hooks = self.sync_session.info.pop(AFTER_COMMIT_HOOKS, None)
+        for _, fn, args in (hooks or {}).values():
+            try:
+                result = fn(*args)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:
+                # The data is committed; a failed side effect must not fail the request
+                logger.exception("After-commit hook %s failed", getattr(fn, "__qualname__", fn))
+
+    async def close(self):
+        self.sync_session.info.pop(AFTER_COMMIT_HOOKS, None)
+        await super().close()
+
+
 # Async session factory
 async_session = async_sessionmaker(
     engine,
-    class_=AsyncSession,
+    class_=HookSession,
     expire_on_commit=False,
 )
 
@@ -25,6 +174,14 @@ class Base(DeclarativeBase):
     pass
 
 
+# Trigram indexes back the accent-insensitive search (see app/core/text.py)
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 # Dependency injection for FastAPI
 async def get_db() -> AsyncSession:
     async with async_session() as session:
@@ -0,0 +1,150 @@
+"""
+Read-through cache for single-entity detail reads (``GET /students/{id}`` ...).
+
+Each ``EntityCache`` stores one response-shaped dict per id under
+``entity:<name>:<id>`` with its own TTL. Ids that do not exist are cached
+too (negative entry, ``ENTITY_CACHE_NEGATIVE_TTL``), so probing missing ids
+does not reach Postgres either. ``get_many`` reads any number of ids with one
+MGET, loads the misses with one ``IN`` query and writes them back in one
+pipeline.
+
+Writes:
+
+- creates write the new entity through (``on_commit(db, cache.put, ...)``)
+- every flushed update or delete of a cached model, including ORM cascades,
+  drops its entry once the transaction commits (listener below); dropping
+  rather than rewriting means two commits finishing out of order cannot
+  leave the older state cached
+- set-based UPDATE / DELETE paths call ``invalidate_on_commit`` with the ids
+
+Both bump the entry's version (``app/db/cache.py``), and a miss is written
+back only under the version read with it, so a read that loaded a row
+before a commit cannot cache it after that commit's invalidation.
+
+Redis errors fall back to Postgres, like every other cache.
+"""
+from typing import Optional
+
+from fastapi import HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy import select, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.cache import cache_get_many_versioned, cache_set_many, cache_set_many_if_version, cache_invalidate
+from app.db.database import HookSyncSession, on_commit
+from app.db.rows import response_columns
+
+settings = get_settings()
+
+ENTITY_CACHE_KEY = "entity:{name}:{id}"
+ENTITY_CACHE_SCHEMA = 1  # bump with the response schemas
+NOT_FOUND = "not_found"  # negative entry
+
+# Model -> its cache, for the flush listener
+_caches: dict[type, "EntityCache"] = {}
+
+
+class EntityCache:
+    def __init__(self, name: str, model, schema: type[BaseModel], not_found: str, exclude: tuple[str, ...] = ()):
+        self.name = name
+        self.model = model
+        self.schema = schema
+        self.not_found = not_found
+        self.columns = response_columns(model, schema, exclude=exclude)
+        _caches[model] = self
+
+    @property
+    def ttl(self) -> int:
+        return settings.ENTITY_CACHE_TTLS.get(self.name, settings.CACHE_TTL)
+
+    def key(self, entity_id: int) -> str:
+        return ENTITY_CACHE_KEY.format(name=self.name, id=entity_id)
+
+    def dump(self, obj) -> dict:
+        """Response-shaped, msgpack-safe dict of an ORM object or row."""
+        return self.schema.model_validate(obj).model_dump(mode="json")
+
+    async def get(self, db: AsyncSession, entity_id: int) -> dict:
+        """The entity as a response dict; 404 if it does not exist."""
+        entity = (await self.get_many(db, [entity_id]))[entity_id]
+        if entity is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=self.not_found)
+        return entity
+
+    async def get_many(self, db: AsyncSession, ids: list[int]) -> dict[int, Optional[dict]]:
+        """``{id: entity or None}`` for every requested id: one MGET, at most one query."""
+        ids = list(dict.fromkeys(ids))
+        found: dict[int, Optional[dict]] = {}
+        versions: dict[int, bytes] = {}
+        try:
+            cached = await cache_get_many_versioned([self.key(entity_id) for entity_id in ids], ENTITY_CACHE_SCHEMA)
+        except Exception:
+            cached = [(None, None)] * len(ids)  # Redis down -> read everything from the DB
+        for entity_id, (value, version) in zip(ids, cached):
+            if value is not None:
+                found[entity_id] = None if value == NOT_FOUND else value
+            elif version is not None:
+                versions[entity_id] = version
+
+        missing = [entity_id for entity_id in ids if entity_id not in found]
+        metrics.incr("entity_cache_hits", len(ids) - len(missing), entity=self.name)
+        if not missing:
+            return found
+        metrics.incr("entity_cache_misses", len(missing), entity=self.name)
+
+        result = await db.execute(select(*self.columns).where(self.model.id.in_(missing)))
+        loaded = {row.id: self.dump(row) for row in result}
+        for entity_id in missing:
+            found[entity_id] = loaded.get(entity_id)
+        try:
+            await cache_set_many_if_version(
+                {self.key(entity_id): (loaded[entity_id], versions[entity_id])
+                 for entity_id in loaded if entity_id in versions},
+                ttl=self.ttl, schema=ENTITY_CACHE_SCHEMA,
+            )
+            await cache_set_many_if_version(
+                {self.key(entity_id): (NOT_FOUND, versions[entity_id])
+                 for entity_id in missing if entity_id not in loaded and entity_id in versions},
+                ttl=settings.ENTITY_CACHE_NEGATIVE_TTL, schema=ENTITY_CACHE_SCHEMA,
+            )
+        except Exception:
+            pass
+        return found
+
+    async def put(self, entity_id: int, entity: dict):
+        try:
+            # Bumping the version first refuses a negative entry read before the create
+            await cache_invalidate(self.key(entity_id))
+            await cache_set_many({self.key(entity_id): entity}, ttl=self.ttl, schema=ENTITY_CACHE_SCHEMA)
+        except Exception:
+            pass  # Redis down -> skip cache
+
+    async def invalidate(self, *ids: int):
+        if not ids:
+            return
+        try:
+            await cache_invalidate(*(self.key(entity_id) for entity_id in ids))
+        except Exception:
+            pass  # Redis down -> skip cache
+
+    def write_through(self, db: AsyncSession, obj):
+        """Cache a freshly created entity once ``db`` commits."""
+        on_commit(db, self.put, obj.id, self.dump(obj), unique=False)
+
+    def invalidate_on_commit(self, db: AsyncSession, ids):
+        """Drop entries written by a set-based UPDATE / DELETE once ``db`` commits."""
+        if ids:
+            on_commit(db, self.invalidate, *sorted(set(ids)))
+
+
+@event.listens_for(HookSyncSession, "after_flush")
+def _invalidate_flushed_entities(session, flush_context):
+    changed: dict[EntityCache, set[int]] = {}
+    for obj in (*session.dirty, *session.deleted):
+        cache = _caches.get(type(obj))
+        if cache is not None and obj.id is not None:
+            changed.setdefault(cache, set()).add(obj.id)
+    for cache, ids in changed.items():
+        on_commit(session, cache.invalidate, *sorted(ids))
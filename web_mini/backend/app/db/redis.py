@@ -1,15 +1,104 @@
+import asyncio
+
 import redis.asyncio as aioredis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+
+from app.core import metrics
 from app.core.config import get_settings
+from app.db.circuit_breaker import CircuitBreaker, CircuitOpenError
 
 settings = get_settings()
 
-redis_client = aioredis.from_url(
-    settings.REDIS_URL,
-    encoding="utf-8",
-    decode_responses=True,
+# Errors that mean "Redis is unreachable or hanging" (not a bad command)
+REDIS_FAILURES = (RedisConnectionError, RedisTimeoutError, asyncio.TimeoutError, OSError)
+
+
+def _pool(
+    decode_responses: bool,
+    timeout: float = settings.REDIS_POOL_TIMEOUT,
+    socket_timeout: float = settings.REDIS_SOCKET_TIMEOUT,
+    socket_connect_timeout: float = settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+) -> aioredis.BlockingConnectionPool:
+    # Blocking pool: callers wait up to ``timeout`` for a connection
+    # instead of failing as soon as REDIS_MAX_CONNECTIONS are in use
+    return aioredis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=timeout,
+        socket_timeout=socket_timeout,
+        socket_connect_timeout=socket_connect_timeout,
+        health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,
+        encoding="utf-8",
+        decode_responses=decode_responses,
+    )
+
+
+async def _guarded(breaker: CircuitBreaker, call):
+    try:
+        breaker.before_call()
+    except CircuitOpenError:
+        call.close()  # never awaited
+        raise
+    try:
+        result = await call
+    except REDIS_FAILURES:
+        breaker.record_failure()
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    breaker.record_success()
+    return result
+
+
+class BreakerPipeline(Pipeline):
+    def __init__(self, breaker: CircuitBreaker, *args):
+        super().__init__(*args)
+        self.breaker = breaker
+
+    async def execute(self, raise_on_error: bool = True):
+        return await _guarded(self.breaker, super().execute(raise_on_error))
+
+
+class BreakerRedis(aioredis.Redis):
+    """Client whose commands and pipelines go through a circuit breaker."""
+
+    def __init__(self, breaker: CircuitBreaker, **kwargs):
+        super().__init__(**kwargs)
+        self.breaker = breaker
+
+    async def execute_command(self, *args, **options):
+        return await _guarded(self.breaker, super().execute_command(*args, **options))
+
+    def pipeline(self, transaction: bool = True, shard_hint: str = None) -> BreakerPipeline:
+        return BreakerPipeline(self.breaker, self.connection_pool, self.response_callbacks, transaction, shard_hint)
+
+
+# Text client: queues, locks, counters
+redis_pool = _pool(decode_responses=True)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+# Binary client: codec-encoded cache payloads (app/db/cache.py), their
+# invalidation and the rate limiter's token buckets. Every caller falls back
+# (to Postgres, or lets the request through), so it uses short timeouts
+# and a circuit breaker: a hung or dead Redis costs a few failed calls, then
+# fails fast until a probe succeeds
+cache_breaker = CircuitBreaker(
+    "redis_cache",
+    failure_threshold=settings.CACHE_BREAKER_FAILURE_THRESHOLD,
+    cooldown=settings.CACHE_BREAKER_COOLDOWN,
+)
+cache_pool = _pool(
+    decode_responses=False,
+    timeout=settings.CACHE_POOL_TIMEOUT,
+    socket_timeout=settings.CACHE_SOCKET_TIMEOUT,
+    socket_connect_timeout=settings.CACHE_SOCKET_CONNECT_TIMEOUT,
 )
+cache_client = BreakerRedis(cache_breaker, connection_pool=cache_pool)
+metrics.register_gauge("redis_cache_circuit", lambda: cache_breaker.state)
 
-CACHE_TTL = 60  # seconds
+CACHE_TTL = settings.CACHE_TTL
 
 
 async def get_redis():
@@ -0,0 +1,18 @@
+"""
+Column-only read path for list endpoints.
+
+``select(*response_columns(Model, Schema))`` loads just the columns the
+response schema serializes. Rows come back as SQLAlchemy ``Row`` objects
+(tuple-backed, attribute access), which ``from_attributes`` schemas accept
+as they are: no ORM instances, identity map entries or relationship loads.
+"""
+from pydantic import BaseModel
+
+
+def response_columns(model, schema: type[BaseModel], exclude: tuple[str, ...] = ()) -> list:
+    """
+    Mapped attributes of ``model`` named like the fields of ``schema``
+    (KeyError if one is missing). ``exclude`` skips computed fields.
+    """
+    attributes = model.__mapper__.column_attrs
+    return [attributes[name].class_attribute for name in schema.model_fields if name not in exclude]
@@ -0,0 +1,203 @@
+import asyncio
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import get_settings
+from app.db.redis import redis_client
+
+settings = get_settings()
+
+JOB_STREAM_KEY = "jobs:stream"
+JOB_GROUP = "jobs:workers"
+JOB_KEY_PREFIX = "job:"
+PERIODIC_KEY_PREFIX = "jobs:periodic:"
+
+# Job lifecycle: queued -> running -> (retrying -> running)* -> succeeded | failed
+JOB_STATUSES = ("queued", "running", "retrying", "succeeded", "failed")
+
+# KEYS[1] = stream; ARGV = group, consumer, delivery id
+# Resets the delivery's idle time only while ``consumer`` still holds it; 0 if it was reclaimed
+EXTEND_LUA = """
+if #redis.call('XPENDING', KEYS[1], ARGV[1], ARGV[3], ARGV[3], 1, ARGV[2]) == 0 then
+  return 0
+end
+redis.call('XCLAIM', KEYS[1], ARGV[1], ARGV[2], 0, ARGV[3], 'JUSTID')
+return 1
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _new_record(name: str, params: dict, max_attempts: int) -> dict:
+    now = _now()
+    return {
+        "id": uuid.uuid4().hex,
+        "name": name,
+        "status": "queued",
+        "progress": 0.0,
+        "message": None,
+        "attempts": 0,
+        "max_attempts": max_attempts,
+        "params": params,
+        "result": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+    }
+
+
+# Fields stored as JSON in the Redis hash (everything else is a plain string)
+_JSON_FIELDS = ("params", "result", "message", "error", "progress", "attempts", "max_attempts")
+
+
+def _encode(fields: dict) -> dict:
+    return {k: json.dumps(v) if k in _JSON_FIELDS else v for k, v in fields.items()}
+
+
+def _decode(raw: dict) -> dict:
+    return {k: json.loads(v) if k in _JSON_FIELDS else v for k, v in raw.items()}
+
+
+class RedisStreamQueue:
+    """Job queue backed by a Redis stream + consumer group.
+
+    Job state lives in a hash per job (``job:<id>``); the stream only carries
+    job ids. Deliveries that are never acked (worker crashed) are reclaimed
+    after ``JOB_VISIBILITY_TIMEOUT``; a worker running a longer job keeps its
+    delivery with ``extend``.
+    """
+
+    def __init__(self, client=redis_client):
+        self.client = client
+        self._group_ready = False
+        self._extend = client.register_script(EXTEND_LUA)
+
+    async def _ensure_group(self):
+        if self._group_ready:
+            return
+        try:
+            await self.client.xgroup_create(JOB_STREAM_KEY, JOB_GROUP, id="0", mkstream=True)
+        except Exception as exc:
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    async def enqueue(self, name: str, params: dict, max_attempts: int) -> dict:
+        record = _new_record(name, params, max_attempts)
+        await self.client.hset(JOB_KEY_PREFIX + record["id"], mapping=_encode(record))
+        await self.requeue(record["id"])
+        return record
+
+    async def requeue(self, job_id: str):
+        await self._ensure_group()
+        await self.client.xadd(JOB_STREAM_KEY, {"job_id": job_id})
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        raw = await self.client.hgetall(JOB_KEY_PREFIX + job_id)
+        return _decode(raw) if raw else None
+
+    async def update(self, job_id: str, **fields):
+        fields["updated_at"] = _now()
+        key = JOB_KEY_PREFIX + job_id
+        await self.client.hset(key, mapping=_encode(fields))
+        if fields.get("status") in ("succeeded", "failed"):
+            await self.client.expire(key, settings.JOB_RECORD_TTL)
+
+    async def reserve(self, consumer: str, count: int, block_ms: int = 1000) -> list[tuple[str, str]]:
+        """Return up to ``count`` (delivery_id, job_id) pairs for this consumer."""
+        await self._ensure_group()
+
+        # Reclaim deliveries abandoned by a dead worker first
+        _, claimed, *_ = await self.client.xautoclaim(
+            JOB_STREAM_KEY, JOB_GROUP, consumer,
+            min_idle_time=settings.JOB_VISIBILITY_TIMEOUT * 1000,
+            count=count,
+        )
+        if claimed:
+            return [(entry_id, fields["job_id"]) for entry_id, fields in claimed if fields]
+
+        response = await self.client.xreadgroup(
+            JOB_GROUP, consumer, {JOB_STREAM_KEY: ">"}, count=count, block=block_ms,
+        )
+        return [
+            (entry_id, fields["job_id"])
+            for _, entries in response or []
+            for entry_id, fields in entries
+        ]
+
+    async def extend(self, delivery_id: str, consumer: str) -> bool:
+        """
+        Reset the delivery's idle time so ``reserve`` does not reclaim it.
+        False if another worker already reclaimed it: the caller must stop the job.
+        """
+        return bool(await self._extend(keys=[JOB_STREAM_KEY], args=[JOB_GROUP, consumer, delivery_id]))
+
+    async def ack(self, delivery_id: str):
+        await self.client.xack(JOB_STREAM_KEY, JOB_GROUP, delivery_id)
+        await self.client.xdel(JOB_STREAM_KEY, delivery_id)
+
+    async def claim_periodic(self, name: str, interval: int) -> bool:
+        """True for exactly one worker per ``interval`` seconds."""
+        return bool(await self.client.set(PERIODIC_KEY_PREFIX + name, _now(), nx=True, ex=interval))
+
+
+class InMemoryQueue:
+    """Process-local stand-in for ``RedisStreamQueue`` (tests, local dev)."""
+
+    def __init__(self):
+        self._records: dict[str, dict] = {}
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._periodic_due: dict[str, float] = {}
+
+    async def enqueue(self, name: str, params: dict, max_attempts: int) -> dict:
+        record = _new_record(name, params, max_attempts)
+        self._records[record["id"]] = record
+        await self.requeue(record["id"])
+        return dict(record)
+
+    async def requeue(self, job_id: str):
+        self._pending.put_nowait(job_id)
+
+    async def get(self, job_id: str) -> Optional[dict]:
+        record = self._records.get(job_id)
+        return dict(record) if record else None
+
+    async def update(self, job_id: str, **fields):
+        fields["updated_at"] = _now()
+        self._records[job_id].update(fields)
+
+    async def reserve(self, consumer: str, count: int, block_ms: int = 1000) -> list[tuple[str, str]]:
+        try:
+            job_id = await asyncio.wait_for(self._pending.get(), timeout=block_ms / 1000)
+        except asyncio.TimeoutError:
+            return []
+        reserved = [job_id]
+        while len(reserved) < count and not self._pending.empty():
+            reserved.append(self._pending.get_nowait())
+        return [(job_id, job_id) for job_id in reserved]
+
+    async def extend(self, delivery_id: str, consumer: str) -> bool:
+        return True
+
+    async def ack(self, delivery_id: str):
+        pass
+
+    async def claim_periodic(self, name: str, interval: int) -> bool:
+        now = time.monotonic()
+        if now < self._periodic_due.get(name, 0.0):
+            return False
+        self._periodic_due[name] = now + interval
+        return True
+
+
+@lru_cache()
+def get_job_queue():
+    if settings.JOB_QUEUE_BACKEND == "memory":
+        return InMemoryQueue()
+    return RedisStreamQueue()
@@ -0,0 +1,192 @@
+"""
+Background job handlers.
+
+Every handler is ``async def handler(ctx: JobContext, **params)`` and returns a
+JSON-serializable result. Register new handlers in ``JOB_HANDLERS``.
+"""
+from datetime import date
+
+from pydantic import ValidationError
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.text import normalize_search_text
+from app.db.database import async_session
+from app.models.parent import Parent
+from app.models.student import Student
+from app.models.class_model import Class
+from app.schemas.student import StudentCreate
+from app.services import analytics_service, change_service, class_service, subscription_service, term_service
+
+settings = get_settings()
+
+IMPORT_CHUNK_SIZE = 500
+
+
+class JobContext:
+    """Handed to every job handler: progress reporting + DB sessions."""
+
+    def __init__(self, queue, job_id: str, attempt: int):
+        self.queue = queue
+        self.job_id = job_id
+        self.attempt = attempt
+
+    async def progress(self, percent: float, message: str = None):
+        await self.queue.update(self.job_id, progress=round(min(max(percent, 0.0), 100.0), 1), message=message)
+
+    async def message(self, message: str):
+        await self.queue.update(self.job_id, message=message)
+
+    def session(self):
+        """New session on the shared app engine (caller commits)."""
+        return async_session()
+
+
+async def rebuild_class_cache(ctx: JobContext):
+    """Drop and re-populate the cached class catalog."""
+    await class_service.invalidate_class_cache()
+    async with ctx.session() as session:
+        classes = await class_service.get_all_classes(session)
+    return {"classes": len(classes)}
+
+
+async def import_students(ctx: JobContext, rows: list[dict]):
+    """Bulk-create students in chunks, skipping invalid rows and unknown parents."""
+    created, errors = 0, []
+    total = len(rows)
+
+    for offset in range(0, total, IMPORT_CHUNK_SIZE):
+        chunk = rows[offset:offset + IMPORT_CHUNK_SIZE]
+        async with ctx.session() as session:
+            parent_ids = {row.get("parent_id") for row in chunk}
+            result = await session.execute(select(Parent.id).where(Parent.id.in_(parent_ids)))
+            known_parents = set(result.scalars().all())
+
+            for index, row in enumerate(chunk, start=offset):
+                try:
+                    data = StudentCreate(**row)
+                except ValidationError as exc:
+                    errors.append({"row": index, "error": str(exc)})
+                    continue
+                if data.parent_id not in known_parents:
+                    errors.append({"row": index, "error": f"Parent with id {data.parent_id} not found"})
+                    continue
+                session.add(Student(**data.model_dump()))
+                created += 1
+            await session.commit()
+
+        await ctx.progress(100.0 * min(offset + IMPORT_CHUNK_SIZE, total) / total,
+                           f"{min(offset + IMPORT_CHUNK_SIZE, total)}/{total} rows")
+
+    return {"created": created, "errors": errors}
+
+
+async def expire_subscriptions(ctx: JobContext, batch_size: int = None):
+    """Deactivate subscriptions past their end_date, one short transaction per batch."""
+    batch_size = batch_size or settings.SUBSCRIPTION_SWEEP_BATCH_SIZE
+    today = date.today()
+    deactivated = 0
+
+    while True:
+        async with ctx.session() as session:
+            count = await subscription_service.deactivate_expired_batch(session, today, batch_size)
+            await session.commit()
+        deactivated += count
+        await ctx.message(f"{deactivated} subscriptions deactivated")
+        if count < batch_size:
+            break
+
+    return {"deactivated": deactivated}
+
+
+# Model -> source columns of its search_text (mirrors the before_insert/update listeners)
+SEARCH_TEXT_SOURCES = {
+    Parent: ("name", "email"),
+    Student: ("name",),
+    Class: ("name", "subject", "teacher_name"),
+}
+
+
+async def rebuild_search_index(ctx: JobContext, chunk_size: int = 1000):
+    """Recompute search_text (and classes.teacher_key) for rows loaded outside the ORM, e.g. raw SQL imports."""
+    updated = 0
+    for step, (model, sources) in enumerate(SEARCH_TEXT_SOURCES.items()):
+        last_id = 0
+        while True:
+            async with ctx.session() as session:
+                result = await session.execute(
+                    select(model).where(model.id > last_id).order_by(model.id).limit(chunk_size)
+                )
+                rows = result.scalars().all()
+                for row in rows:
+                    row.search_text = normalize_search_text(*(getattr(row, col) for col in sources))
+                    if model is Class:
+                        row.teacher_key = normalize_search_text(row.teacher_name)
+                await session.commit()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            updated += len(rows)
+        await ctx.progress(100.0 * (step + 1) / len(SEARCH_TEXT_SOURCES), f"{model.__tablename__} done")
+    return {"updated": updated}
+
+
+async def refresh_analytics(ctx: JobContext):
+    """Rebuild the reporting summary tables (one transaction, readers keep the old snapshot)."""
+    async with ctx.session() as session:
+        run = await analytics_service.refresh_summaries(session)
+        await session.commit()
+    if run.status == "failed":
+        raise RuntimeError(f"Analytics refresh failed: {run.error}")
+    return {"class_rows": run.class_rows, "package_rows": run.package_rows, "duration_ms": run.duration_ms}
+
+
+async def compact_change_log(ctx: JobContext):
+    """Compact superseded change-log entries and expire old tombstones."""
+    async with ctx.session() as session:
+        run = await change_service.compact_change_log(session)
+        await session.commit()
+    return {"compacted": run.compacted, "tombstones_removed": run.tombstones_removed, "floor_seq": run.floor_seq}
+
+
+async def archive_term(ctx: JobContext, term_id: int, batch_size: int = None):
+    """Move a closed term's rows to the archive tables, one short transaction per batch."""
+    batch_size = batch_size or settings.TERM_ARCHIVE_BATCH_SIZE
+    async with ctx.session() as session:
+        await term_service.check_archivable(session, term_id)
+
+    moved = 0
+    while True:
+        async with ctx.session() as session:
+            count = await term_service.archive_batch(session, term_id, batch_size)
+            if not count:
+                await term_service.mark_archived(session, term_id)
+            await session.commit()
+        if not count:
+            break
+        moved += count
+        await ctx.message(f"{moved} rows archived")
+    return {"archived": moved}
+
+
+JOB_HANDLERS = {
+    "rebuild_class_cache": rebuild_class_cache,
+    "import_students": import_students,
+    "expire_subscriptions": expire_subscriptions,
+    "rebuild_search_index": rebuild_search_index,
+    "refresh_analytics": refresh_analytics,
+    "compact_change_log": compact_change_log,
+    "archive_term": archive_term,
+}
+
+# Enqueued automatically by the worker every N seconds
+PERIODIC_JOBS = {
+    "expire_subscriptions": settings.SUBSCRIPTION_SWEEP_INTERVAL,
+    "refresh_analytics": settings.ANALYTICS_REFRESH_INTERVAL,
+    "compact_change_log": settings.CHANGE_LOG_COMPACT_INTERVAL,
+}
+
+# Jobs whose partial work is committed chunk by chunk must not be retried
+JOB_MAX_ATTEMPTS = {
+    "import_students": 1,
+}
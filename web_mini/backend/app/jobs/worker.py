@@ -0,0 +1,158 @@
+"""
+Background job worker.
+Chạy: python -m app.jobs.worker
+"""
+import asyncio
+import logging
+import os
+import socket
+import traceback
+
+from app.core.config import get_settings
+from app.db.database import engine
+from app.jobs.queue import get_job_queue
+from app.jobs.tasks import JOB_HANDLERS, JOB_MAX_ATTEMPTS, PERIODIC_JOBS, JobContext
+from app.services import rush_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+PERIODIC_CHECK_INTERVAL = 30  # seconds
+
+
+class Worker:
+    """Pulls jobs from the queue and runs at most ``concurrency`` at a time."""
+
+    def __init__(self, queue=None, concurrency: int = None, name: str = None):
+        self.queue = queue or get_job_queue()
+        self.concurrency = concurrency or settings.JOB_WORKER_CONCURRENCY
+        self.name = name or f"{socket.gethostname()}-{os.getpid()}"
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._tasks: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+
+    async def run(self):
+        logger.info("Job worker %s started (concurrency=%d)", self.name, self.concurrency)
+        scheduler = asyncio.create_task(self._schedule_periodic())
+        rush = asyncio.create_task(rush_service.run_consumers(self.name, self._stopping))
+        try:
+            await self._consume()
+        finally:
+            scheduler.cancel()
+            rush.cancel()
+
+    async def _consume(self):
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            try:
+                deliveries = await self.queue.reserve(self.name, count=1)
+            except Exception:
+                self._slots.release()
+                logger.exception("Job queue unavailable, retrying")
+                await asyncio.sleep(1)
+                continue
+
+            if not deliveries:
+                self._slots.release()
+                continue
+
+            delivery_id, job_id = deliveries[0]
+            task = asyncio.create_task(self._execute(delivery_id, job_id))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _schedule_periodic(self):
+        """Enqueue each periodic job once per interval across all workers."""
+        while not self._stopping.is_set():
+            for name, interval in PERIODIC_JOBS.items():
+                try:
+                    if await self.queue.claim_periodic(name, interval):
+                        await self.queue.enqueue(name, {}, JOB_MAX_ATTEMPTS.get(name, settings.JOB_MAX_ATTEMPTS))
+                except Exception:
+                    logger.exception("Could not schedule periodic job %s", name)
+            await asyncio.sleep(PERIODIC_CHECK_INTERVAL)
+
+    async def stop(self):
+        self._stopping.set()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _execute(self, delivery_id: str, job_id: str):
+        try:
+            record = await self.queue.get(job_id)
+            if record is None or record["status"] in ("succeeded", "failed"):
+                await self.queue.ack(delivery_id)
+                return
+            if record["status"] == "running" and record["attempts"] >= record["max_attempts"]:
+                # Reclaimed from a worker that died mid-run, and that was the last attempt
+                await self.queue.update(job_id, status="failed", error="Worker stopped during the last attempt")
+                await self.queue.ack(delivery_id)
+                return
+
+            attempt = record["attempts"] + 1
+            await self.queue.update(job_id, status="running", attempts=attempt, error=None)
+
+            handler = JOB_HANDLERS.get(record["name"])
+            heartbeat = asyncio.create_task(self._heartbeat(delivery_id, job_id, asyncio.current_task()))
+            try:
+                if handler is None:
+                    raise LookupError(f"Unknown job '{record['name']}'")
+                result = await handler(JobContext(self.queue, job_id, attempt), **record["params"])
+            except Exception as exc:
+                logger.warning("Job %s (%s) failed on attempt %d: %s", job_id, record["name"], attempt, exc)
+                if handler is not None and attempt < record["max_attempts"]:
+                    await self.queue.update(job_id, status="retrying", error=str(exc))
+                    delay = settings.JOB_RETRY_BACKOFF * 2 ** (attempt - 1)
+                    retry = asyncio.create_task(self._retry_later(delivery_id, job_id, delay))
+                    self._tasks.add(retry)
+                    retry.add_done_callback(self._tasks.discard)
+                    return
+                await self.queue.update(
+                    job_id, status="failed", error="".join(traceback.format_exception_only(exc)).strip(),
+                )
+            else:
+                await self.queue.update(job_id, status="succeeded", progress=100.0, result=result)
+            finally:
+                heartbeat.cancel()
+            await self.queue.ack(delivery_id)
+        finally:
+            self._slots.release()
+
+    async def _heartbeat(self, delivery_id: str, job_id: str, run: asyncio.Task):
+        """
+        Keep a running job's delivery from being reclaimed by another worker.
+        If it was reclaimed anyway (heartbeats stalled), cancel ``run``: the job
+        now runs elsewhere.
+        """
+        while True:
+            await asyncio.sleep(settings.JOB_VISIBILITY_TIMEOUT / 3)
+            try:
+                owned = await self.queue.extend(delivery_id, self.name)
+            except Exception:
+                logger.exception("Could not extend job delivery %s", delivery_id)
+                continue
+            if not owned:
+                logger.warning("Job %s was reclaimed by another worker, stopping this run", job_id)
+                run.cancel()
+                return
+
+    async def _retry_later(self, delivery_id: str, job_id: str, delay: float):
+        # The original delivery stays unacked until the retry is queued, so a
+        # crash while waiting is recovered by the visibility timeout.
+        await asyncio.sleep(delay)
+        await self.queue.requeue(job_id)
+        await self.queue.ack(delivery_id)
+
+
+async def main():
+    logging.basicConfig(level=logging.INFO)
+    worker = Worker()
+    try:
+        await worker.run()
+    finally:
+        await worker.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
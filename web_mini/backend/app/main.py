@@ -1,10 +1,20 @@
+import asyncio
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.core.config import get_settings
+from app.core import metrics
+from app.core.rate_limit import AdmissionControlMiddleware
+from app.core.idempotency import IdempotencyMiddleware
+from app.core.deadline import DeadlineMiddleware
+from app.core.profiling import ProfilingMiddleware
 from app.db.database import engine, Base
-from app.api import parents, students, classes, subscriptions, dashboard
+from app.db.redis import cache_breaker
+from app.api import parents, students, classes, subscriptions, dashboard, jobs, search, analytics, admin, changes, terms
+from app.jobs.worker import Worker
+from app.services.attendance_service import attendance_buffer
+from app.services.seat_service import seat_hub
 
 settings = get_settings()
 
@@ -14,8 +24,20 @@ async def lifespan(app: FastAPI):
     # Startup: Create tables if they don't exist
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+    # The in-memory job queue only exists in this process, so run its worker here
+    worker = worker_task = None
+    if settings.JOB_QUEUE_BACKEND == "memory":
+        worker = Worker()
+        worker_task = asyncio.create_task(worker.run())
+    attendance_buffer.start()
     yield
-    # Shutdown: Dispose engine
+    # Shutdown: Finish running jobs, flush buffered check-ins, then dispose engine
+    if worker:
+        worker_task.cancel()
+        await worker.stop()
+    await attendance_buffer.stop()
+    await seat_hub.stop()
     await engine.dispose()
 
 
@@ -26,6 +48,22 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Opt-in profiler (innermost: measures routing + handler, not rate limiting)
+if settings.PROFILING_ENABLED:
+    app.add_middleware(ProfilingMiddleware)
+
+# Per-route deadlines (inside idempotency: a 504, only ever sent before a commit, releases the key for a retry)
+if settings.DEADLINE_ENABLED:
+    app.add_middleware(DeadlineMiddleware)
+
+# Idempotency keys (inside admission control: rejected requests don't claim a key)
+if settings.IDEMPOTENCY_ENABLED:
+    app.add_middleware(IdempotencyMiddleware)
+
+# Admission control for write-heavy routes (added before CORS so CORS wraps its 429/503s)
+if settings.RATE_LIMIT_ENABLED:
+    app.add_middleware(AdmissionControlMiddleware)
+
 # CORS Middleware
 app.add_middleware(
     CORSMiddleware,
@@ -33,6 +71,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Total-Count", "Idempotent-Replayed"],
 )
 
 # Include routers
@@ -41,6 +80,12 @@ app.include_router(parents.router, prefix="/api")
 app.include_router(students.router, prefix="/api")
 app.include_router(classes.router, prefix="/api")
 app.include_router(subscriptions.router, prefix="/api")
+app.include_router(jobs.router, prefix="/api")
+app.include_router(search.router, prefix="/api")
+app.include_router(analytics.router, prefix="/api")
+app.include_router(admin.router, prefix="/api")
+app.include_router(changes.router, prefix="/api")
+app.include_router(terms.router, prefix="/api")
 
 
 @app.get("/")
@@ -50,4 +95,10 @@ async def root():
 
 @app.get("/health")
 async def health_check():
-    return {"status": "healthy"}
+    # An open cache circuit is not fatal: reads fall back to Postgres
+    return {"status": "healthy", "redis_cache": cache_breaker.snapshot()}
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return metrics.snapshot()
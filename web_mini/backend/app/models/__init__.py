@@ -3,5 +3,12 @@ from app.models.student import Student
 from app.models.class_model import Class
 from app.models.registration import ClassRegistration
 from app.models.subscription import Subscription
+from app.models.attendance import AttendanceEvent
+from app.models.analytics import ClassUtilization, SubscriptionBurndown, AnalyticsRefreshRun
+from app.models.term import Term, ClassRegistrationArchive, SubscriptionArchive
+from app.models.change_log import ChangeLogEntry, ChangeLogCompaction
 
-__all__ = ["Parent", "Student", "Class", "ClassRegistration", "Subscription"]
+__all__ = ["Parent", "Student", "Class", "ClassRegistration", "Subscription", "AttendanceEvent",
+           "ClassUtilization", "SubscriptionBurndown", "AnalyticsRefreshRun",
+           "Term", "ClassRegistrationArchive", "SubscriptionArchive",
+           "ChangeLogEntry", "ChangeLogCompaction"]
@@ -0,0 +1,65 @@
+"""
+Reporting summary tables (materialized by ``analytics_service.refresh_summaries``).
+
+They are rebuilt from the OLTP tables by a periodic job; ``/api/analytics/*``
+reads only these tables, never ``classes`` / ``class_registrations`` /
+``subscriptions`` directly.
+"""
+from sqlalchemy import Column, Integer, String, Time, Float, DateTime, Text
+from app.db.database import Base
+
+
+class ClassUtilization(Base):
+    """Seat usage per class, snapshot of the last refresh."""
+
+    __tablename__ = "analytics_class_utilization"
+
+    class_id = Column(Integer, primary_key=True)
+    subject = Column(String(255), nullable=False)
+    teacher_name = Column(String(255), nullable=False)
+    day_of_week = Column(Integer, nullable=False)
+    time_slot_start = Column(Time, nullable=False)
+    time_slot_end = Column(Time, nullable=False)
+    max_students = Column(Integer, nullable=False)
+    registered = Column(Integer, nullable=False)
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<ClassUtilization(class_id={self.class_id}, {self.registered}/{self.max_students})>"
+
+
+class SubscriptionBurndown(Base):
+    """Session consumption per package, snapshot of the last refresh."""
+
+    __tablename__ = "analytics_subscription_burndown"
+
+    package_name = Column(String(255), primary_key=True)
+    subscriptions = Column(Integer, nullable=False)
+    active_subscriptions = Column(Integer, nullable=False)
+    total_sessions = Column(Integer, nullable=False)  # sold, all subscriptions
+    used_sessions = Column(Integer, nullable=False)
+    remaining_sessions = Column(Integer, nullable=False)  # left on active subscriptions
+    sessions_per_week = Column(Float, nullable=False)  # average burn rate of one active subscription
+    weeks_to_exhaust = Column(Float, nullable=True)  # remaining / package-wide weekly burn
+    refreshed_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<SubscriptionBurndown(package={self.package_name}, remaining={self.remaining_sessions})>"
+
+
+class AnalyticsRefreshRun(Base):
+    """One refresh of the summary tables (duration is also exported as a metric)."""
+
+    __tablename__ = "analytics_refresh_runs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    duration_ms = Column(Float, nullable=True)
+    class_rows = Column(Integer, nullable=True)
+    package_rows = Column(Integer, nullable=True)
+    status = Column(String(20), nullable=False)  # "running", "succeeded", "failed"
+    error = Column(Text, nullable=True)
+
+    def __repr__(self):
+        return f"<AnalyticsRefreshRun(id={self.id}, status={self.status})>"
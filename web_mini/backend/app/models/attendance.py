@@ -0,0 +1,26 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from app.db.database import Base
+
+
+class AttendanceEvent(Base):
+    """One consumed session (check-in). Written in batches by ``AttendanceBuffer``."""
+
+    __tablename__ = "attendance_events"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id", ondelete="SET NULL"), nullable=True)
+    class_id = Column(Integer, ForeignKey("classes.id", ondelete="SET NULL"), nullable=True)
+    checked_in_at = Column(DateTime(timezone=True), nullable=False)
+
+    # Attendance history is always read per student, newest first, by date range
+    __table_args__ = (
+        Index("ix_attendance_student_checked_in", "student_id", "checked_in_at"),
+    )
+
+    # Relationships
+    student = relationship("Student")
+
+    def __repr__(self):
+        return f"<AttendanceEvent(student_id={self.student_id}, checked_in_at={self.checked_in_at})>"
@@ -0,0 +1,115 @@
+"""
+Change log for delta sync (``GET /api/changes?since=<seq>``).
+
+Every flush that inserts, updates or deletes a tracked model appends one row
+per object (``seq`` is monotonic) with a snapshot of its columns, in the same
+transaction. Set-based UPDATEs bypass the flush and log their rows with
+``change_service.log_changes``.
+
+Old entries are compacted (only the latest entry per object is kept) and
+delete tombstones expire; see ``change_service.compact_change_log``.
+"""
+from datetime import date, datetime, time, timezone
+
+from sqlalchemy import (
+    Column, Integer, BigInteger, String, DateTime, JSON, Index, event, insert, inspect,
+)
+from app.db.database import Base, HookSyncSession
+from app.models.parent import Parent
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.registration import ClassRegistration
+from app.models.subscription import Subscription
+
+# Model -> entity name in the feed
+TRACKED_ENTITIES = {
+    Parent: "parent",
+    Student: "student",
+    Class: "class",
+    ClassRegistration: "registration",
+    Subscription: "subscription",
+}
+
+# Internal columns that are not part of the synced state (seat_version is bumped by a
+# set-based UPDATE on every registration, which is logged as a registration instead)
+UNSYNCED_COLUMNS = {"search_text", "teacher_key", "seat_version"}
+
+
+class ChangeLogEntry(Base):
+    __tablename__ = "change_log"
+
+    seq = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(8), nullable=False)  # "upsert" | "delete" | "archive" (moved to an archive table)
+    data = Column(JSON, nullable=True)  # column snapshot after the write; NULL for deletes
+    created_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # Compaction: "is there a newer entry for this object?"
+        Index("ix_change_log_entity_seq", "entity", "entity_id", "seq"),
+    )
+
+    def __repr__(self):
+        return f"<ChangeLogEntry(seq={self.seq}, {self.op} {self.entity}#{self.entity_id})>"
+
+
+class ChangeLogCompaction(Base):
+    """One compaction run; ``floor_seq`` is the newest tombstone it removed."""
+
+    __tablename__ = "change_log_compactions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    ran_at = Column(DateTime(timezone=True), nullable=False)
+    compacted = Column(Integer, nullable=False)  # superseded entries removed
+    tombstones_removed = Column(Integer, nullable=False)
+    floor_seq = Column(BigInteger, nullable=False)  # consumers behind this must resync
+
+
+def _jsonable(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    return value
+
+
+def snapshot(obj) -> dict:
+    state = inspect(obj)
+    return {
+        attr.key: _jsonable(state.dict[attr.key])
+        for attr in state.mapper.column_attrs
+        if attr.key in state.dict and attr.key not in UNSYNCED_COLUMNS
+    }
+
+
+def change_rows(objects, op: str) -> list[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            "entity": TRACKED_ENTITIES[type(obj)],
+            "entity_id": obj.id,
+            "op": op,
+            "data": snapshot(obj) if op == "upsert" else None,
+            "created_at": now,
+        }
+        for obj in objects
+        if type(obj) in TRACKED_ENTITIES
+    ]
+
+
+def _synced_columns_changed(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        state.attrs[attr.key].history.has_changes()
+        for attr in state.mapper.column_attrs
+        if attr.key not in UNSYNCED_COLUMNS
+    )
+
+
+@event.listens_for(HookSyncSession, "after_flush")
+def _log_flushed_changes(session, flush_context):
+    # Still the pre-flush state here: new/dirty/deleted and attribute history
+    rows = change_rows(session.new, "upsert")
+    rows += change_rows((obj for obj in session.dirty if _synced_columns_changed(obj)), "upsert")
+    rows += change_rows(session.deleted, "delete")
+    if rows:
+        session.connection().execute(insert(ChangeLogEntry), rows)
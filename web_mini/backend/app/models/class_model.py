@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Time
+from sqlalchemy import Column, Integer, String, Time, Boolean, Index, false, event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.core.text import normalize_search_text
 
 
 class Class(Base):
@@ -14,9 +15,30 @@ class Class(Base):
     time_slot_start = Column(Time, nullable=False)
     time_slot_end = Column(Time, nullable=False)
     max_students = Column(Integer, nullable=False, default=30)
+    rush_mode = Column(Boolean, nullable=False, default=False, server_default=false())  # queued registration
+    search_text = Column(String(800), nullable=True)  # normalized name + subject + teacher
+    teacher_key = Column(String(255), nullable=True)  # normalized teacher_name, for conflict checks
+    # Bumped by every register / unregister; orders live seat updates (seat_service)
+    seat_version = Column(Integer, nullable=False, default=0, server_default="0")
+
+    __table_args__ = (
+        # Teacher double-booking probe: equality on teacher + day, range on start
+        Index("ix_classes_teacher_slot", "teacher_key", "day_of_week", "time_slot_start"),
+        Index(
+            "ix_classes_search_text_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
     registrations = relationship("ClassRegistration", back_populates="class_", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Class(id={self.id}, name={self.name}, subject={self.subject})>"
+
+
+@event.listens_for(Class, "before_insert")
+@event.listens_for(Class, "before_update")
+def _set_class_search_text(mapper, connection, target):
+    target.search_text = normalize_search_text(target.name, target.subject, target.teacher_name)
+    target.teacher_key = normalize_search_text(target.teacher_name)
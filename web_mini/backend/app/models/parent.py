@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Index, event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.core.text import normalize_search_text
 
 
 class Parent(Base):
@@ -10,9 +11,28 @@ class Parent(Base):
     name = Column(String(255), nullable=False)
     phone = Column(String(20), unique=True, nullable=False)
     email = Column(String(255), nullable=True)
+    search_text = Column(String(600), nullable=True)  # normalized name + email, see normalize_search_text
+
+    __table_args__ = (
+        # Postgres: trigram index for substring search, pattern index for phone prefixes
+        Index(
+            "ix_parents_search_text_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_parents_phone_prefix", "phone",
+            postgresql_ops={"phone": "varchar_pattern_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
     students = relationship("Student", back_populates="parent", cascade="all, delete-orphan")
 
     def __repr__(self):
         return f"<Parent(id={self.id}, name={self.name})>"
+
+
+@event.listens_for(Parent, "before_insert")
+@event.listens_for(Parent, "before_update")
+def _set_parent_search_text(mapper, connection, target):
+    target.search_text = normalize_search_text(target.name, target.email)
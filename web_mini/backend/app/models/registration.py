@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.database import Base
@@ -10,11 +10,17 @@ class ClassRegistration(Base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     class_id = Column(Integer, ForeignKey("classes.id", ondelete="CASCADE"), nullable=False)
     student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    term_id = Column(Integer, ForeignKey("terms.id"), nullable=True)  # NULL until the first term is activated
     created_at = Column(DateTime(timezone=True), server_default=func.now())
 
-    # Unique constraint to prevent duplicate registrations
     __table_args__ = (
-        UniqueConstraint("class_id", "student_id", name="uq_class_student"),
+        # One registration per class and student per term
+        UniqueConstraint(
+            "class_id", "student_id", "term_id", name="uq_class_student_term", postgresql_nulls_not_distinct=True,
+        ),
+        # Hot queries are scoped to the current term: seat counts per class, schedules per student
+        Index("ix_class_registrations_term_class", "term_id", "class_id"),
+        Index("ix_class_registrations_term_student", "term_id", "student_id"),
     )
 
     # Relationships
@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, Date, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Index, event
 from sqlalchemy.orm import relationship
 from app.db.database import Base
+from app.core.text import normalize_search_text
 
 
 class Student(Base):
@@ -12,6 +13,14 @@ class Student(Base):
     gender = Column(String(10), nullable=True)  # Male, Female, Other
     current_grade = Column(Integer, nullable=True)
     parent_id = Column(Integer, ForeignKey("parents.id", ondelete="CASCADE"), nullable=False)
+    search_text = Column(String(255), nullable=True)  # normalized name, see normalize_search_text
+
+    __table_args__ = (
+        Index(
+            "ix_students_search_text_trgm", "search_text",
+            postgresql_using="gin", postgresql_ops={"search_text": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
 
     # Relationships
     parent = relationship("Parent", back_populates="students")
@@ -20,3 +29,9 @@ class Student(Base):
 
     def __repr__(self):
         return f"<Student(id={self.id}, name={self.name})>"
+
+
+@event.listens_for(Student, "before_insert")
+@event.listens_for(Student, "before_update")
+def _set_student_search_text(mapper, connection, target):
+    target.search_text = normalize_search_text(target.name)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -14,6 +14,22 @@ class Subscription(Base):
     start_date = Column(Date, nullable=False)
     end_date = Column(Date, nullable=False)
     is_active = Column(Boolean, nullable=False, default=True)
+    term_id = Column(Integer, ForeignKey("terms.id"), nullable=True)  # term it was sold in
+
+    # Partial indexes: only live subscriptions are indexed, so active lookups,
+    # counts and the expiry sweep stay proportional to active rows, not history
+    __table_args__ = (
+        Index(
+            "ix_subscriptions_active_end_date", "end_date",
+            postgresql_where=is_active == True, sqlite_where=is_active == True,
+        ),
+        # Check-in pick: a student's live subscriptions, earliest end_date first
+        Index(
+            "ix_subscriptions_active_student_end_date", "student_id", "end_date",
+            postgresql_where=is_active == True, sqlite_where=is_active == True,
+        ),
+        Index("ix_subscriptions_term", "term_id"),
+    )
 
     # Relationships
     student = relationship("Student", back_populates="subscriptions")
@@ -0,0 +1,68 @@
+"""
+Terms (academic periods) and the cold archive of closed terms.
+
+Registrations and subscriptions carry the ``term_id`` they were created in.
+Hot queries only read the current term's registrations, and the
+``archive_term`` job moves a closed term's rows into the ``*_archive``
+tables, so the hot tables hold open terms only. Archive tables have no
+foreign keys: deleting a class or student never cascades over history.
+"""
+from sqlalchemy import Column, Integer, String, Date, Boolean, DateTime, Index, false
+from app.db.database import Base
+
+
+class Term(Base):
+    __tablename__ = "terms"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(100), nullable=False, unique=True)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    is_current = Column(Boolean, nullable=False, default=False, server_default=false())
+    archived_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # At most one current term
+        Index(
+            "uq_terms_current", "is_current", unique=True,
+            postgresql_where=is_current == True, sqlite_where=is_current == True,
+        ),
+    )
+
+    def __repr__(self):
+        return f"<Term(id={self.id}, name={self.name})>"
+
+
+class ClassRegistrationArchive(Base):
+    __tablename__ = "class_registrations_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # id from class_registrations
+    class_id = Column(Integer, nullable=False)
+    student_id = Column(Integer, nullable=False)
+    term_id = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_class_registrations_archive_term_student", "term_id", "student_id"),
+        Index("ix_class_registrations_archive_term_class", "term_id", "class_id"),
+    )
+
+
+class SubscriptionArchive(Base):
+    __tablename__ = "subscriptions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # id from subscriptions
+    student_id = Column(Integer, nullable=False)
+    package_name = Column(String(255), nullable=False)
+    total_sessions = Column(Integer, nullable=False)
+    used_sessions = Column(Integer, nullable=False)
+    start_date = Column(Date, nullable=False)
+    end_date = Column(Date, nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    term_id = Column(Integer, nullable=True)
+    archived_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_subscriptions_archive_term_student", "term_id", "student_id"),
+    )
@@ -1,13 +1,37 @@
-from app.schemas.parent import ParentCreate, ParentUpdate, ParentResponse
-from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
-from app.schemas.class_schema import ClassCreate, ClassUpdate, ClassResponse
-from app.schemas.registration import RegistrationCreate, RegistrationResponse
-from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate, SubscriptionResponse
+from app.schemas.parent import ParentCreate, ParentUpdate, ParentResponse, ParentOverviewResponse
+from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse, StudentSummaryResponse
+from app.schemas.class_schema import (
+    ClassCreate, ClassUpdate, ClassResponse, TeacherConflictResponse, ClassBulkUpdate,
+    SlotSuggestionRequest, SlotSuggestionResponse,
+)
+from app.schemas.registration import RegistrationCreate, RegistrationResponse, RegistrationTicketResponse
+from app.schemas.subscription import (
+    SubscriptionCreate, SubscriptionUpdate, SubscriptionResponse, SubscriptionBulkUpdate, BulkUpdateResponse,
+    CheckInBatch, CheckInBatchResponse,
+)
+from app.schemas.job import JobCreate, JobResponse, JobProgressResponse
+from app.schemas.attendance import AttendanceResponse
+from app.schemas.search import SearchResponse
+from app.schemas.analytics import UtilizationResponse, BurndownResponse, RefreshRunResponse
+from app.schemas.profile import ProfileResponse
+from app.schemas.change import ChangeEntry, ChangeFeedResponse
+from app.schemas.term import (
+    TermCreate, TermResponse, ArchivedRegistrationResponse, ArchivedSubscriptionResponse,
+)
 
 __all__ = [
-    "ParentCreate", "ParentUpdate", "ParentResponse",
-    "StudentCreate", "StudentUpdate", "StudentResponse",
-    "ClassCreate", "ClassUpdate", "ClassResponse",
-    "RegistrationCreate", "RegistrationResponse",
-    "SubscriptionCreate", "SubscriptionUpdate", "SubscriptionResponse",
+    "ParentCreate", "ParentUpdate", "ParentResponse", "ParentOverviewResponse",
+    "StudentCreate", "StudentUpdate", "StudentResponse", "StudentSummaryResponse",
+    "ClassCreate", "ClassUpdate", "ClassResponse", "TeacherConflictResponse", "ClassBulkUpdate",
+    "SlotSuggestionRequest", "SlotSuggestionResponse",
+    "RegistrationCreate", "RegistrationResponse", "RegistrationTicketResponse",
+    "SubscriptionCreate", "SubscriptionUpdate", "SubscriptionResponse", "SubscriptionBulkUpdate", "BulkUpdateResponse",
+    "CheckInBatch", "CheckInBatchResponse",
+    "JobCreate", "JobResponse", "JobProgressResponse",
+    "AttendanceResponse",
+    "SearchResponse",
+    "UtilizationResponse", "BurndownResponse", "RefreshRunResponse",
+    "ProfileResponse",
+    "ChangeEntry", "ChangeFeedResponse",
+    "TermCreate", "TermResponse", "ArchivedRegistrationResponse", "ArchivedSubscriptionResponse",
 ]
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+
+
+class UtilizationRow(BaseModel):
+    key: str  # subject, teacher name, weekday (0=Sunday) or "HH:MM-HH:MM"
+    classes: int
+    seats: int
+    registered: int
+    utilization: float  # registered / seats
+
+
+class UtilizationResponse(BaseModel):
+    by: str
+    refreshed_at: Optional[datetime] = None
+    rows: List[UtilizationRow]
+
+
+class BurndownResponse(BaseModel):
+    package_name: str
+    subscriptions: int
+    active_subscriptions: int
+    total_sessions: int
+    used_sessions: int
+    remaining_sessions: int
+    sessions_per_week: float
+    weeks_to_exhaust: Optional[float] = None
+    refreshed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class RefreshRunResponse(BaseModel):
+    id: int
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    duration_ms: Optional[float] = None
+    class_rows: Optional[int] = None
+    package_rows: Optional[int] = None
+    status: str
+    error: Optional[str] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import datetime
+
+
+class AttendanceResponse(BaseModel):
+    id: int
+    student_id: int
+    subscription_id: Optional[int] = None
+    class_id: Optional[int] = None
+    checked_in_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,20 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional, List
+from datetime import datetime
+
+
+class ChangeEntry(BaseModel):
+    seq: int
+    entity: str  # parent, student, class, registration, subscription
+    entity_id: int
+    op: str  # upsert | delete | archive (moved out of the current data, see /api/terms)
+    data: Optional[dict] = None  # row after the write; null for deletes
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ChangeFeedResponse(BaseModel):
+    changes: List[ChangeEntry]
+    next_since: int  # pass as ?since= on the next call
+    has_more: bool
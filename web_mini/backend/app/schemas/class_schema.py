@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
 from datetime import time
 
 
@@ -11,6 +11,7 @@ class ClassBase(BaseModel):
     time_slot_start: time
     time_slot_end: time
     max_students: int = 30
+    rush_mode: bool = False
 
 
 class ClassCreate(ClassBase):
@@ -25,10 +26,75 @@ class ClassUpdate(BaseModel):
     time_slot_start: Optional[time] = None
     time_slot_end: Optional[time] = None
     max_students: Optional[int] = None
+    rush_mode: Optional[bool] = None
+
+
+class ClassFilter(BaseModel):
+    """Rows a bulk update applies to (all given conditions must hold)."""
+    ids: Optional[List[int]] = None
+    teacher_name: Optional[str] = None  # matched accent/case-insensitively
+    subject: Optional[str] = None
+    day_of_week: Optional[int] = None
+
+
+class ClassPatch(BaseModel):
+    teacher_name: Optional[str] = None  # reassign
+    day_of_week: Optional[int] = None  # move to another day
+    shift_minutes: Optional[int] = None  # move the time slot, must stay within the day
+    max_students: Optional[int] = None
+    rush_mode: Optional[bool] = None
+
+
+class ClassBulkUpdate(BaseModel):
+    filter: ClassFilter
+    patch: ClassPatch
+
+
+class ConflictClass(BaseModel):
+    id: int
+    name: str
+    time_slot_start: time
+    time_slot_end: time
+
+
+class TeacherConflictResponse(BaseModel):
+    teacher_name: str
+    day_of_week: int
+    first: ConflictClass
+    second: ConflictClass
 
 
 class ClassResponse(ClassBase):
     id: int
     current_students: int = 0
+    seat_version: int = 0  # version of current_students, compared with live seat updates
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SlotSuggestionRequest(BaseModel):
+    """
+    Candidate students: ``student_ids`` and / or every student of ``grade``. With
+    ``subject``, students already taking a class of that subject are left out.
+    """
+    student_ids: Optional[List[int]] = Field(None, max_length=10000)
+    grade: Optional[int] = None
+    subject: Optional[str] = None
+    teacher_name: Optional[str] = None  # slots overlapping the teacher's classes are skipped
+    duration_minutes: int = Field(60, ge=15, le=600)
+    days: List[int] = [0, 1, 2, 3, 4, 5, 6]
+    earliest: time = time(7, 0)
+    latest: time = time(21, 0)  # latest end time
+    top_k: int = Field(5, ge=1, le=50)
+
+
+class SlotSuggestion(BaseModel):
+    day_of_week: int
+    time_slot_start: time
+    time_slot_end: time
+    free_students: int
+
+
+class SlotSuggestionResponse(BaseModel):
+    candidates: int
+    suggestions: List[SlotSuggestion]
@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Any, Optional
+from datetime import datetime
+
+
+class JobCreate(BaseModel):
+    name: str
+    params: dict[str, Any] = {}
+
+
+class JobProgressResponse(BaseModel):
+    id: str
+    status: str
+    progress: float = 0.0
+    message: Optional[str] = None
+
+
+class JobResponse(JobProgressResponse):
+    name: str
+    attempts: int = 0
+    max_attempts: int
+    params: dict[str, Any] = {}
+    result: Optional[Any] = None
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
@@ -1,5 +1,9 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
+
+from app.schemas.student import StudentResponse
+from app.schemas.class_schema import ClassBase
+from app.schemas.subscription import SubscriptionResponse
 
 
 class ParentBase(BaseModel):
@@ -22,3 +26,20 @@ class ParentResponse(ParentBase):
     id: int
 
     model_config = ConfigDict(from_attributes=True)
+
+
+# --- Family overview (GET /parents/{id}/overview) ---
+
+class OverviewClassResponse(ClassBase):
+    id: int
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class OverviewStudentResponse(StudentResponse):
+    classes: List[OverviewClassResponse] = []
+    subscriptions: List[SubscriptionResponse] = []
+
+
+class ParentOverviewResponse(ParentResponse):
+    students: List[OverviewStudentResponse] = []
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from datetime import datetime
+
+
+class ProfileResponse(BaseModel):
+    id: str
+    method: str
+    route: str
+    path: str
+    status: int
+    duration_ms: float
+    trigger: str  # "sample" or "header"
+    created_at: datetime
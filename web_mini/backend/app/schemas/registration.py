@@ -14,3 +14,15 @@ class RegistrationResponse(BaseModel):
     created_at: Optional[datetime] = None
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class RegistrationTicketResponse(BaseModel):
+    """Queued registration for a class in rush mode (see rush_service)."""
+    ticket_id: str
+    class_id: int
+    student_id: int
+    status: str  # queued | registered | rejected | failed
+    detail: Optional[str] = None
+    registration_id: Optional[int] = None
+    created_at: datetime
+    updated_at: datetime
@@ -0,0 +1,12 @@
+from pydantic import BaseModel
+from typing import List
+
+from app.schemas.parent import ParentResponse
+from app.schemas.student import StudentResponse
+from app.schemas.class_schema import ClassResponse
+
+
+class SearchResponse(BaseModel):
+    students: List[StudentResponse] = []
+    parents: List[ParentResponse] = []
+    classes: List[ClassResponse] = []
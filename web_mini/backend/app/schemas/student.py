@@ -29,5 +29,13 @@ class StudentResponse(StudentBase):
     model_config = ConfigDict(from_attributes=True)
 
 
+class StudentSummaryResponse(BaseModel):
+    """Slim projection used by class rosters (``?slim=true``)."""
+    id: int
+    name: str
+
+    model_config = ConfigDict(from_attributes=True)
+
+
 class StudentWithParentResponse(StudentResponse):
     parent_name: Optional[str] = None
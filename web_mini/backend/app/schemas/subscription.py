@@ -1,5 +1,5 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional, List
 from datetime import date
 
 
@@ -24,9 +24,47 @@ class SubscriptionUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
+class SubscriptionFilter(BaseModel):
+    """Rows a bulk update applies to (all given conditions must hold)."""
+    ids: Optional[List[int]] = None
+    student_id: Optional[int] = None
+    package_name: Optional[str] = None
+    is_active: Optional[bool] = None
+    end_date_from: Optional[date] = None
+    end_date_to: Optional[date] = None
+
+
+class SubscriptionPatch(BaseModel):
+    package_name: Optional[str] = None
+    end_date: Optional[date] = None
+    total_sessions: Optional[int] = None
+    add_sessions: Optional[int] = None  # total_sessions += add_sessions
+    is_active: Optional[bool] = None
+
+
+class SubscriptionBulkUpdate(BaseModel):
+    filter: SubscriptionFilter
+    patch: SubscriptionPatch
+
+
+class BulkUpdateResponse(BaseModel):
+    updated: int
+    ids: List[int]
+
+
 class SubscriptionResponse(SubscriptionBase):
     id: int
     used_sessions: int = 0
     is_active: bool = True
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class CheckInBatch(BaseModel):
+    student_ids: List[int] = Field(max_length=500)
+    class_id: Optional[int] = None
+
+
+class CheckInBatchResponse(BaseModel):
+    checked_in: List[SubscriptionResponse]
+    not_checked_in: List[int]  # student ids with no usable subscription (or one being checked in elsewhere)
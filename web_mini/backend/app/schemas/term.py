@@ -0,0 +1,43 @@
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+from datetime import date, datetime
+
+
+class TermCreate(BaseModel):
+    name: str
+    start_date: date
+    end_date: date
+
+
+class TermResponse(TermCreate):
+    id: int
+    is_current: bool
+    archived_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedRegistrationResponse(BaseModel):
+    id: int
+    class_id: int
+    student_id: int
+    term_id: Optional[int] = None
+    created_at: Optional[datetime] = None
+    archived_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class ArchivedSubscriptionResponse(BaseModel):
+    id: int
+    student_id: int
+    package_name: str
+    total_sessions: int
+    used_sessions: int
+    start_date: date
+    end_date: date
+    is_active: bool
+    term_id: Optional[int] = None
+    archived_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,176 @@
+"""
+Utilization and burn-down reporting.
+
+``refresh_summaries`` rebuilds the summary tables from the OLTP tables in one
+transaction (set-based INSERT ... SELECT for classes, one aggregate query for
+subscriptions). Readers keep seeing the previous snapshot until it commits.
+The report queries below only touch the summary tables.
+"""
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, delete, insert, literal, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.models.class_model import Class
+from app.models.registration import ClassRegistration
+from app.models.subscription import Subscription
+from app.models.analytics import ClassUtilization, SubscriptionBurndown, AnalyticsRefreshRun
+from app.services.term_scope import get_current_term_id, in_term
+
+# ?by= dimension -> grouping columns of ClassUtilization
+UTILIZATION_DIMENSIONS = {
+    "subject": (ClassUtilization.subject,),
+    "teacher": (ClassUtilization.teacher_name,),
+    "weekday": (ClassUtilization.day_of_week,),
+    "time_slot": (ClassUtilization.time_slot_start, ClassUtilization.time_slot_end),
+}
+
+_last_refresh = {"duration_ms": None}
+metrics.register_gauge("analytics_last_refresh_ms", lambda: _last_refresh["duration_ms"])
+
+
+async def _refresh_class_utilization(db: AsyncSession, now: datetime) -> int:
+    term_id = await get_current_term_id(db)
+    await db.execute(delete(ClassUtilization))
+    source = (
+        select(
+            Class.id, Class.subject, Class.teacher_name, Class.day_of_week,
+            Class.time_slot_start, Class.time_slot_end, Class.max_students,
+            func.count(ClassRegistration.id), literal(now, ClassUtilization.refreshed_at.type),
+        )
+        .outerjoin(ClassRegistration, and_(
+            Class.id == ClassRegistration.class_id, in_term(ClassRegistration.term_id, term_id),
+        ))
+        .group_by(Class.id)
+    )
+    await db.execute(
+        insert(ClassUtilization).from_select(
+            ["class_id", "subject", "teacher_name", "day_of_week", "time_slot_start",
+             "time_slot_end", "max_students", "registered", "refreshed_at"],
+            source,
+        )
+    )
+    result = await db.execute(select(func.count()).select_from(ClassUtilization))
+    return result.scalar()
+
+
+async def _refresh_subscription_burndown(db: AsyncSession, now: datetime) -> int:
+    # Grouped by start date so elapsed time is computed per group, not per row
+    result = await db.execute(
+        select(
+            Subscription.package_name, Subscription.start_date, Subscription.is_active,
+            func.count(Subscription.id),
+            func.sum(Subscription.total_sessions),
+            func.sum(Subscription.used_sessions),
+        ).group_by(Subscription.package_name, Subscription.start_date, Subscription.is_active)
+    )
+
+    today = date.today()
+    packages = defaultdict(lambda: defaultdict(int))
+    for package_name, start_date, is_active, count, total, used in result.all():
+        pkg = packages[package_name]
+        pkg["subscriptions"] += count
+        pkg["total_sessions"] += total
+        pkg["used_sessions"] += used
+        if is_active:
+            pkg["active_subscriptions"] += count
+            pkg["remaining_sessions"] += total - used
+            pkg["active_used"] += used
+            pkg["active_days"] += max((today - start_date).days, 1) * count
+
+    rows = []
+    for package_name, pkg in packages.items():
+        per_week = 7 * pkg["active_used"] / pkg["active_days"] if pkg["active_days"] else 0.0
+        weekly_burn = per_week * pkg["active_subscriptions"]
+        rows.append({
+            "package_name": package_name,
+            "subscriptions": pkg["subscriptions"],
+            "active_subscriptions": pkg["active_subscriptions"],
+            "total_sessions": pkg["total_sessions"],
+            "used_sessions": pkg["used_sessions"],
+            "remaining_sessions": pkg["remaining_sessions"],
+            "sessions_per_week": round(per_week, 3),
+            "weeks_to_exhaust": round(pkg["remaining_sessions"] / weekly_burn, 1) if weekly_burn else None,
+            "refreshed_at": now,
+        })
+
+    await db.execute(delete(SubscriptionBurndown))
+    if rows:
+        await db.execute(insert(SubscriptionBurndown), rows)
+    return len(rows)
+
+
+async def refresh_summaries(db: AsyncSession) -> AnalyticsRefreshRun:
+    """Rebuild every summary table in the current transaction and record the run (caller commits)."""
+    now = datetime.now(timezone.utc)
+    started = time.perf_counter()
+    run = AnalyticsRefreshRun(started_at=now, status="running")
+
+    try:
+        async with db.begin_nested():
+            run.class_rows = await _refresh_class_utilization(db, now)
+            run.package_rows = await _refresh_subscription_burndown(db, now)
+        run.status = "succeeded"
+    except Exception as exc:
+        run.status = "failed"
+        run.error = repr(exc)
+
+    run.finished_at = datetime.now(timezone.utc)
+    run.duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    db.add(run)
+    await db.flush()
+
+    _last_refresh["duration_ms"] = run.duration_ms
+    metrics.incr("analytics_refresh_runs", status=run.status)
+    metrics.incr("analytics_refresh_ms_total", run.duration_ms)
+    return run
+
+
+async def get_utilization(db: AsyncSession, by: str):
+    """Seats vs registrations grouped by subject, teacher, weekday or time slot."""
+    if by not in UTILIZATION_DIMENSIONS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown dimension '{by}'. Available: {', '.join(UTILIZATION_DIMENSIONS)}"
+        )
+    columns = UTILIZATION_DIMENSIONS[by]
+    result = await db.execute(
+        select(
+            *columns,
+            func.count(ClassUtilization.class_id).label("classes"),
+            func.sum(ClassUtilization.max_students).label("seats"),
+            func.sum(ClassUtilization.registered).label("registered"),
+            func.max(ClassUtilization.refreshed_at).label("refreshed_at"),
+        )
+        .group_by(*columns)
+        .order_by(*columns)
+    )
+
+    rows, refreshed_at = [], None
+    for row in result.all():
+        key = "-".join(value.strftime("%H:%M") for value in row[:2]) if by == "time_slot" else str(row[0])
+        rows.append({
+            "key": key,
+            "classes": row.classes,
+            "seats": row.seats,
+            "registered": row.registered,
+            "utilization": round(row.registered / row.seats, 4) if row.seats else 0.0,
+        })
+        refreshed_at = max(refreshed_at or row.refreshed_at, row.refreshed_at)
+    return {"by": by, "refreshed_at": refreshed_at, "rows": rows}
+
+
+async def get_burndown(db: AsyncSession):
+    result = await db.execute(select(SubscriptionBurndown).order_by(SubscriptionBurndown.package_name))
+    return result.scalars().all()
+
+
+async def get_refresh_runs(db: AsyncSession, limit: int = 20):
+    result = await db.execute(
+        select(AnalyticsRefreshRun).order_by(AnalyticsRefreshRun.id.desc()).limit(limit)
+    )
+    return result.scalars().all()
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import select, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.database import async_session
+from app.models.attendance import AttendanceEvent
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+
+class AttendanceBuffer:
+    """
+    Write-behind buffer for check-in events.
+
+    ``record`` only appends to an in-process list; a background task writes the
+    list with one multi-row INSERT every ``flush_interval_ms`` or as soon as
+    ``max_events`` are pending. ``stop`` flushes whatever is left, so events
+    survive a graceful shutdown.
+
+    A batch the database rejects (a student, subscription or class deleted
+    since the check-in) is retried row by row, so one bad event cannot hold
+    back the others; see ``_insert_one``. While the database is unreachable
+    events are kept, up to ``max_buffered``; past that the oldest are dropped
+    (``attendance_dropped``) rather than growing without bound.
+    """
+
+    def __init__(self, flush_interval_ms: int, max_events: int, max_buffered: int):
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_events = max_events
+        self.max_buffered = max_buffered
+        self._events: list[dict] = []
+        self._full = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, student_id: int, subscription_id: int = None, class_id: int = None):
+        self._events.append({
+            "student_id": student_id,
+            "subscription_id": subscription_id,
+            "class_id": class_id,
+            "checked_in_at": datetime.now(timezone.utc),
+        })
+        if len(self._events) >= self.max_events:
+            self._full.set()
+        self._trim()
+
+    def _trim(self):
+        overflow = len(self._events) - self.max_buffered
+        if overflow > 0:
+            del self._events[:overflow]
+            metrics.incr("attendance_dropped", overflow)
+            logger.error("Attendance buffer full, %d oldest events dropped", overflow)
+
+    async def _insert_one(self, session: AsyncSession, event: dict) -> bool:
+        """
+        Insert one event in its own savepoint. If a referenced subscription or
+        class is gone, keep the event without it (what ``SET NULL`` would have
+        done had it been written earlier); if the student is gone, drop it.
+        """
+        for row in (event, {**event, "subscription_id": None, "class_id": None}):
+            try:
+                async with session.begin_nested():
+                    await session.execute(insert(AttendanceEvent), [row])
+                return True
+            except IntegrityError:
+                continue
+        metrics.incr("attendance_dropped")
+        logger.error("Attendance event dropped, student no longer exists: %r", event)
+        return False
+
+    async def flush(self) -> int:
+        events, self._events = self._events, []
+        self._full.clear()
+        if not events:
+            return 0
+        try:
+            async with async_session() as session:
+                try:
+                    await session.execute(insert(AttendanceEvent), events)
+                except IntegrityError:
+                    await session.rollback()
+                    written = [await self._insert_one(session, event) for event in events]
+                    events = [event for event, ok in zip(events, written) if ok]
+                await session.commit()
+        except Exception:
+            # Keep the events for the next attempt (DB briefly unavailable)
+            self._events[:0] = events
+            self._trim()
+            logger.exception("Attendance flush failed, %d events kept in buffer", len(events))
+            return 0
+        return len(events)
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+
+attendance_buffer = AttendanceBuffer(
+    settings.ATTENDANCE_FLUSH_INTERVAL_MS,
+    settings.ATTENDANCE_FLUSH_MAX_EVENTS,
+    settings.ATTENDANCE_BUFFER_MAX_EVENTS,
+)
+
+
+async def get_student_attendance(
+    db: AsyncSession,
+    student_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    skip: int = 0,
+    limit: int = 100,
+):
+    """Attendance history for one student, newest first (served by the student/date index)."""
+    query = select(AttendanceEvent).where(AttendanceEvent.student_id == student_id)
+    if date_from:
+        query = query.where(
+            AttendanceEvent.checked_in_at >= datetime.combine(date_from, time.min, tzinfo=timezone.utc)
+        )
+    if date_to:
+        query = query.where(
+            AttendanceEvent.checked_in_at < datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=timezone.utc)
+        )
+
+    result = await db.execute(
+        query.order_by(AttendanceEvent.checked_in_at.desc()).offset(skip).limit(limit)
+    )
+    return result.scalars().all()
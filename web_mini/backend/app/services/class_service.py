@@ -1,45 +1,90 @@
-import json
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, and_, or_, not_, update, Time
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql.functions import FunctionElement
 from fastapi import HTTPException, status
 
 from app.models.class_model import Class
 from app.models.registration import ClassRegistration
-from app.schemas.class_schema import ClassCreate, ClassUpdate
-from app.db.redis import redis_client, CACHE_TTL
+from app.core.text import normalize_search_text
+from app.schemas.class_schema import ClassCreate, ClassUpdate, ClassBulkUpdate, ClassResponse
+from app.db.database import on_commit
+from app.db.redis import cache_client
+from app.db.cache import cache_get_versioned, cache_set_if_version, cache_invalidate
+from app.db.entity_cache import EntityCache
+from app.services.search_service import apply_search
+from app.services.change_service import log_changes
+from app.services.term_scope import get_current_term_id, in_term
 
 CLASSES_CACHE_KEY = "classes:all"
+CLASSES_CACHE_SCHEMA = 2  # bump when the cached catalog entry changes shape
+# Bumped when class rows change; caches embedding class data compare against it
+CLASSES_GENERATION_KEY = "classes:generation"
+# One hash per class; fields are "<view>:<skip>:<limit>" pages of the roster
+CLASS_ROSTER_CACHE_KEY = "classes:{class_id}:roster"
+CLASS_ROSTER_CACHE_SCHEMA = 1
+
+# GET /classes/{id}; the detail view does not count students
+class_cache = EntityCache(
+    "class", Class, ClassResponse, not_found="Class not found", exclude=("current_students", "seat_version"),
+)
 
 
 async def invalidate_class_cache():
     """Invalidate the cached classes list."""
     try:
-        await redis_client.delete(CLASSES_CACHE_KEY)
+        await cache_invalidate(CLASSES_CACHE_KEY)
     except Exception:
         pass  # Redis down -> skip cache
 
 
-async def get_all_classes(db: AsyncSession, skip: int = 0, limit: int = 100):
-    # Try cache first
+async def invalidate_class_roster(*class_ids: int):
+    """Invalidate every cached roster page of the given classes."""
+    if not class_ids:
+        return
     try:
-        cached = await redis_client.get(CLASSES_CACHE_KEY)
-        if cached and skip == 0 and limit == 100:
-            return json.loads(cached)
+        await cache_invalidate(*(CLASS_ROSTER_CACHE_KEY.format(class_id=cid) for cid in class_ids))
     except Exception:
-        pass  # Redis down -> fallback to DB
+        pass  # Redis down -> skip cache
 
-    # Query from DB with student count
-    result = await db.execute(
+
+async def bump_class_generation():
+    """Invalidate every cache that embeds class details (e.g. parent overviews)."""
+    try:
+        await cache_client.incr(CLASSES_GENERATION_KEY)
+    except Exception:
+        pass  # Redis down -> skip cache
+
+
+async def get_all_classes(db: AsyncSession, skip: int = 0, limit: int = 100, q: str = None):
+    # Only the default, unfiltered page is cached
+    cacheable = skip == 0 and limit == 100 and not q
+
+    # Try cache first
+    version = None
+    if cacheable:
+        try:
+            cached, version = await cache_get_versioned(CLASSES_CACHE_KEY, schema=CLASSES_CACHE_SCHEMA)
+            if cached is not None:
+                return cached
+        except Exception:
+            pass  # Redis down -> fallback to DB
+
+    # Query from DB with student count (current term only)
+    term_id = await get_current_term_id(db)
+    query = (
         select(
             Class,
             func.count(ClassRegistration.id).label("current_students")
         )
-        .outerjoin(ClassRegistration, Class.id == ClassRegistration.class_id)
+        .outerjoin(ClassRegistration, and_(
+            Class.id == ClassRegistration.class_id, in_term(ClassRegistration.term_id, term_id),
+        ))
         .group_by(Class.id)
-        .offset(skip)
-        .limit(limit)
-        .order_by(Class.id)
     )
+    query = apply_search(query, Class, q) if q else query.order_by(Class.id)
+    result = await db.execute(query.offset(skip).limit(limit))
     rows = result.all()
 
     classes_data = []
@@ -53,14 +98,16 @@ async def get_all_classes(db: AsyncSession, skip: int = 0, limit: int = 100):
             "time_slot_start": class_obj.time_slot_start.isoformat(),
             "time_slot_end": class_obj.time_slot_end.isoformat(),
             "max_students": class_obj.max_students,
+            "rush_mode": class_obj.rush_mode,
             "current_students": count,
+            "seat_version": class_obj.seat_version,
         }
         classes_data.append(data)
 
-    # Cache the result
+    # Cache the result, unless a write invalidated the catalog meanwhile
     try:
-        if skip == 0 and limit == 100:
-            await redis_client.setex(CLASSES_CACHE_KEY, CACHE_TTL, json.dumps(classes_data))
+        if version is not None:
+            await cache_set_if_version(CLASSES_CACHE_KEY, classes_data, version, schema=CLASSES_CACHE_SCHEMA)
     except Exception:
         pass
 
@@ -75,18 +122,190 @@ async def get_class_by_id(db: AsyncSession, class_id: int):
     return class_obj
 
 
+async def check_teacher_conflict(
+    db: AsyncSession, teacher_name: str, day_of_week: int, start, end, exclude_id: int = None
+):
+    """
+    Reject a slot that overlaps another class of the same teacher.
+
+    One probe on ``ix_classes_teacher_slot``: teacher + day equality, then the
+    overlap condition (start < other.end AND end > other.start).
+    """
+    query = select(Class).where(
+        Class.teacher_key == normalize_search_text(teacher_name),
+        Class.day_of_week == day_of_week,
+        Class.time_slot_start < end,
+        Class.time_slot_end > start,
+    )
+    if exclude_id is not None:
+        query = query.where(Class.id != exclude_id)
+    result = await db.execute(query.limit(1))
+    existing = result.scalar_one_or_none()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Teacher conflict! {teacher_name} already teaches '{existing.name}' "
+                f"({existing.time_slot_start.strftime('%H:%M')}-{existing.time_slot_end.strftime('%H:%M')}) "
+                f"on the same day."
+            )
+        )
+
+
+async def get_teacher_conflicts(db: AsyncSession, class_ids: list[int] = None):
+    """
+    Every pair of overlapping classes taught by the same teacher, in one self-join.
+
+    ``class_ids`` limits the report to pairs involving at least one of them.
+    """
+    other = aliased(Class)
+    query = (
+        select(Class, other)
+        .join(other, and_(
+            other.teacher_key == Class.teacher_key,
+            other.day_of_week == Class.day_of_week,
+            other.id > Class.id,
+            other.time_slot_start < Class.time_slot_end,
+            other.time_slot_end > Class.time_slot_start,
+        ))
+        .order_by(Class.teacher_key, Class.day_of_week, Class.time_slot_start, other.time_slot_start)
+    )
+    if class_ids is not None:
+        query = query.where(or_(Class.id.in_(class_ids), other.id.in_(class_ids)))
+    result = await db.execute(query)
+    return [
+        {
+            "teacher_name": first.teacher_name,
+            "day_of_week": first.day_of_week,
+            "first": first,
+            "second": second,
+        }
+        for first, second in result.all()
+    ]
+
+
+class shift_time(FunctionElement):
+    """``time column + N minutes`` (wraps at midnight on every backend)."""
+    type = Time()
+    inherit_cache = True
+
+
+@compiles(shift_time, "postgresql")
+def _shift_time_postgresql(element, compiler, **kw):
+    column, minutes = element.clauses.clauses
+    return f"({compiler.process(column, **kw)} + make_interval(mins => {compiler.process(minutes, **kw)}))"
+
+
+@compiles(shift_time)
+def _shift_time_default(element, compiler, **kw):
+    # SQLite: times are stored as 'HH:MM:SS.ffffff' strings
+    column, minutes = element.clauses.clauses
+    return f"(time({compiler.process(column, **kw)}, {compiler.process(minutes, **kw)} || ' minutes') || '.000000')"
+
+
+def _class_filters(data) -> list:
+    filters = []
+    if data.ids is not None:
+        filters.append(Class.id.in_(data.ids))
+    if data.teacher_name is not None:
+        filters.append(Class.teacher_key == normalize_search_text(data.teacher_name))
+    if data.subject is not None:
+        filters.append(Class.subject == data.subject)
+    if data.day_of_week is not None:
+        filters.append(Class.day_of_week == data.day_of_week)
+    return filters
+
+
+async def bulk_update_classes(db: AsyncSession, data: ClassBulkUpdate):
+    """
+    Apply one patch to every matching class with a single UPDATE ... RETURNING.
+
+    ``start < end`` (and, for shifts, staying within the day) is checked in
+    SQL before and during the UPDATE; teacher conflicts introduced by the
+    patch are then detected with one self-join and roll the whole batch back.
+    """
+    filters = _class_filters(data.filter)
+    patch = data.patch.model_dump(exclude_unset=True)
+    if not filters:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bulk update needs at least one filter")
+    if not patch:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to update")
+
+    values = {key: patch[key] for key in ("teacher_name", "day_of_week", "max_students", "rush_mode") if key in patch}
+    if "teacher_name" in patch:
+        values["teacher_key"] = normalize_search_text(patch["teacher_name"])
+
+    guard = Class.time_slot_start < Class.time_slot_end
+    shift = patch.get("shift_minutes")
+    if shift:
+        new_start = shift_time(Class.time_slot_start, shift)
+        new_end = shift_time(Class.time_slot_end, shift)
+        values["time_slot_start"], values["time_slot_end"] = new_start, new_end
+        # Shifted slots must not wrap past midnight
+        moved = and_(new_start > Class.time_slot_start, new_end > Class.time_slot_end) if shift > 0 \
+            else and_(new_start < Class.time_slot_start, new_end < Class.time_slot_end)
+        guard = and_(new_start < new_end, moved)
+
+    invalid = await db.execute(select(Class.id).where(*filters, not_(guard)).order_by(Class.id).limit(20))
+    invalid_ids = invalid.scalars().all()
+    if invalid_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Start time must be before end time, within the same day (classes {invalid_ids})"
+        )
+
+    result = await db.execute(
+        update(Class)
+        .where(*filters, guard)
+        .values(**values)
+        .returning(Class)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    rows = result.scalars().all()
+    ids = [row.id for row in rows]
+    await log_changes(db, rows)
+
+    if rows and "teacher_name" in patch:
+        # Bulk UPDATE bypasses the ORM listener that maintains search_text
+        await db.execute(update(Class), [
+            {"id": row.id, "search_text": normalize_search_text(row.name, row.subject, row.teacher_name)}
+            for row in rows
+        ])
+
+    if rows and patch.keys() & {"teacher_name", "day_of_week", "shift_minutes"}:
+        conflicts = await get_teacher_conflicts(db, class_ids=ids)
+        if conflicts:
+            first, second = conflicts[0]["first"], conflicts[0]["second"]
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=(
+                    f"Teacher conflict! {first.teacher_name}: '{first.name}' overlaps '{second.name}' "
+                    f"({len(conflicts)} conflict(s), nothing was updated)"
+                )
+            )
+
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, bump_class_generation)
+    class_cache.invalidate_on_commit(db, ids)
+    return {"updated": len(ids), "ids": ids}
+
+
 async def create_class(db: AsyncSession, data: ClassCreate):
     if data.time_slot_start >= data.time_slot_end:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start time must be before end time"
         )
+    await check_teacher_conflict(
+        db, data.teacher_name, data.day_of_week, data.time_slot_start, data.time_slot_end
+    )
 
     class_obj = Class(**data.model_dump())
     db.add(class_obj)
     await db.flush()
     await db.refresh(class_obj)
-    await invalidate_class_cache()
+    on_commit(db, invalidate_class_cache)
+    class_cache.write_through(db, class_obj)
     return class_obj
 
 
@@ -103,10 +322,16 @@ async def update_class(db: AsyncSession, class_id: int, data: ClassUpdate):
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Start time must be before end time"
         )
+    if update_data.keys() & {"teacher_name", "day_of_week", "time_slot_start", "time_slot_end"}:
+        await check_teacher_conflict(
+            db, class_obj.teacher_name, class_obj.day_of_week,
+            class_obj.time_slot_start, class_obj.time_slot_end, exclude_id=class_obj.id,
+        )
 
     await db.flush()
     await db.refresh(class_obj)
-    await invalidate_class_cache()
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, bump_class_generation)
     return class_obj
 
 
@@ -114,5 +339,7 @@ async def delete_class(db: AsyncSession, class_id: int):
     class_obj = await get_class_by_id(db, class_id)
     await db.delete(class_obj)
     await db.flush()
-    await invalidate_class_cache()
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, invalidate_class_roster, class_id)
+    on_commit(db, bump_class_generation)
     return {"message": f"Class '{class_obj.name}' deleted successfully"}
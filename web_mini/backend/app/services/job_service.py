@@ -0,0 +1,33 @@
+from fastapi import HTTPException, status
+
+from app.core.config import get_settings
+from app.jobs.queue import get_job_queue
+from app.jobs.tasks import JOB_HANDLERS, JOB_MAX_ATTEMPTS
+
+settings = get_settings()
+
+
+async def enqueue_job(name: str, params: dict = None):
+    """Queue a background job and return its record (status 'queued')."""
+    if name not in JOB_HANDLERS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown job '{name}'. Available: {', '.join(sorted(JOB_HANDLERS))}"
+        )
+
+    try:
+        return await get_job_queue().enqueue(
+            name, params or {}, JOB_MAX_ATTEMPTS.get(name, settings.JOB_MAX_ATTEMPTS)
+        )
+    except Exception:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Job queue unavailable"
+        )
+
+
+async def get_job(job_id: str):
+    job = await get_job_queue().get(job_id)
+    if not job:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return job
@@ -4,18 +4,56 @@ from sqlalchemy.orm import selectinload
 from fastapi import HTTPException, status
 
 from app.models.parent import Parent
-from app.schemas.parent import ParentCreate, ParentUpdate
+from app.models.student import Student
+from app.models.class_model import Class
+from app.models.registration import ClassRegistration
+from app.models.subscription import Subscription
+from app.schemas.parent import ParentCreate, ParentUpdate, ParentResponse, ParentOverviewResponse
+from app.db.database import on_commit
+from app.db.rows import response_columns
+from app.db.entity_cache import EntityCache
+from app.db.redis import cache_client
+from app.db.cache import cache_set_if_version, cache_invalidate, decode, version_key
+from app.services.search_service import apply_search
+from app.services.class_service import CLASSES_GENERATION_KEY
+from app.services.term_scope import in_current_term
 
+PARENT_OVERVIEW_CACHE_KEY = "parent:{parent_id}:overview"
+PARENT_OVERVIEW_CACHE_SCHEMA = 1
+
+
+async def invalidate_parent_overview(*parent_ids: int):
+    """Drop the cached family overview of the given parents."""
+    keys = [PARENT_OVERVIEW_CACHE_KEY.format(parent_id=pid) for pid in set(parent_ids) if pid]
+    if not keys:
+        return
+    try:
+        await cache_invalidate(*keys)
+    except Exception:
+        pass  # Redis down -> skip cache
+
+
+async def invalidate_parent_overview_for_students(db: AsyncSession, student_ids):
+    """Drop the overviews of the families these students belong to, once ``db`` commits."""
+    student_ids = set(student_ids)
+    if not student_ids:
+        return
+    result = await db.execute(select(Student.parent_id).where(Student.id.in_(student_ids)).distinct())
+    on_commit(db, invalidate_parent_overview, *result.scalars().all())
 
-async def get_all_parents(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(
-        select(Parent)
-        .options(selectinload(Parent.students))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Parent.id)
-    )
-    return result.scalars().all()
+
+PARENT_LIST_COLUMNS = response_columns(Parent, ParentResponse)
+
+# GET /parents/{id}
+parent_cache = EntityCache("parent", Parent, ParentResponse, not_found="Parent not found")
+
+
+async def get_all_parents(db: AsyncSession, skip: int = 0, limit: int = 100, q: str = None):
+    """Rows with just the ``ParentResponse`` columns (no ORM instances)."""
+    query = select(*PARENT_LIST_COLUMNS)
+    query = apply_search(query, Parent, q) if q else query.order_by(Parent.id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.all()
 
 
 async def get_parent_by_id(db: AsyncSession, parent_id: int):
@@ -30,6 +68,91 @@ async def get_parent_by_id(db: AsyncSession, parent_id: int):
     return parent
 
 
+async def get_parent_overview(db: AsyncSession, parent_id: int):
+    """
+    Parent + students + each student's classes and subscriptions.
+
+    At most four queries whatever the family size (parent, students, classes,
+    subscriptions), cached per parent. The cache entry records the class
+    generation it was built with, so class edits invalidate it too.
+    """
+    cache_key = PARENT_OVERVIEW_CACHE_KEY.format(parent_id=parent_id)
+    generation = version = None
+    try:
+        # The generation and version counters are plain integers, not codec payloads
+        cached, raw_generation, version = await cache_client.mget(
+            cache_key, CLASSES_GENERATION_KEY, version_key(cache_key)
+        )
+        version = version or b""
+        generation = int(raw_generation) if raw_generation else None
+        entry = decode(cached, schema=PARENT_OVERVIEW_CACHE_SCHEMA)
+        if entry is not None and entry["generation"] == generation:
+            return entry["data"]
+    except Exception:
+        pass  # Redis down -> fallback to DB
+
+    # 1. Parent
+    result = await db.execute(select(Parent).where(Parent.id == parent_id))
+    parent = result.scalar_one_or_none()
+    if not parent:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent not found")
+
+    # 2. Students
+    result = await db.execute(
+        select(Student).where(Student.parent_id == parent_id).order_by(Student.id)
+    )
+    students = result.scalars().all()
+    student_ids = [s.id for s in students]
+    classes_by_student = {sid: [] for sid in student_ids}
+    subs_by_student = {sid: [] for sid in student_ids}
+
+    if student_ids:
+        # 3. Classes of all students (current term)
+        result = await db.execute(
+            select(ClassRegistration.student_id, Class)
+            .join(Class, Class.id == ClassRegistration.class_id)
+            .where(ClassRegistration.student_id.in_(student_ids), in_current_term(ClassRegistration.term_id))
+            .order_by(Class.day_of_week, Class.time_slot_start)
+        )
+        for student_id, class_obj in result.all():
+            classes_by_student[student_id].append(class_obj)
+
+        # 4. Subscriptions of all students
+        result = await db.execute(
+            select(Subscription)
+            .where(Subscription.student_id.in_(student_ids))
+            .order_by(Subscription.end_date.desc())
+        )
+        for sub in result.scalars().all():
+            subs_by_student[sub.student_id].append(sub)
+
+    overview = ParentOverviewResponse.model_validate({
+        "id": parent.id,
+        "name": parent.name,
+        "phone": parent.phone,
+        "email": parent.email,
+        "students": [
+            {
+                **{c: getattr(s, c) for c in ("id", "name", "dob", "gender", "current_grade", "parent_id")},
+                "classes": classes_by_student[s.id],
+                "subscriptions": subs_by_student[s.id],
+            }
+            for s in students
+        ],
+    }, from_attributes=True).model_dump(mode="json")
+
+    try:
+        if version is not None:
+            await cache_set_if_version(
+                cache_key, {"generation": generation, "data": overview}, version,
+                schema=PARENT_OVERVIEW_CACHE_SCHEMA,
+            )
+    except Exception:
+        pass
+
+    return overview
+
+
 async def create_parent(db: AsyncSession, data: ParentCreate):
     # Check phone uniqueness
     existing = await db.execute(select(Parent).where(Parent.phone == data.phone))
@@ -43,6 +166,7 @@ async def create_parent(db: AsyncSession, data: ParentCreate):
     db.add(parent)
     await db.flush()
     await db.refresh(parent)
+    parent_cache.write_through(db, parent)
     return parent
 
 
@@ -63,6 +187,7 @@ async def update_parent(db: AsyncSession, parent_id: int, data: ParentUpdate):
 
     await db.flush()
     await db.refresh(parent)
+    on_commit(db, invalidate_parent_overview, parent.id)
     return parent
 
 
@@ -70,4 +195,5 @@ async def delete_parent(db: AsyncSession, parent_id: int):
     parent = await get_parent_by_id(db, parent_id)
     await db.delete(parent)
     await db.flush()
+    on_commit(db, invalidate_parent_overview, parent.id)
     return {"message": f"Parent '{parent.name}' deleted successfully"}
@@ -1,11 +1,27 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, update
 from fastapi import HTTPException, status
 
 from app.models.class_model import Class
 from app.models.student import Student
 from app.models.registration import ClassRegistration
-from app.services.class_service import invalidate_class_cache
+from app.schemas.student import StudentResponse
+from app.db.database import on_commit
+from app.db.cache import cache_hget_versioned, cache_hset_if_version
+from app.services.class_service import (
+    invalidate_class_cache, invalidate_class_roster, CLASS_ROSTER_CACHE_KEY, CLASS_ROSTER_CACHE_SCHEMA,
+)
+from app.services.parent_service import invalidate_parent_overview, invalidate_parent_overview_for_students
+from app.services.seat_service import publish_seats
+from app.services.term_scope import get_current_term_id, in_term
+
+
+async def invalidate_student_rosters(db: AsyncSession, student_id: int):
+    """Invalidate the rosters of every class the student is registered in, once ``db`` commits."""
+    result = await db.execute(
+        select(ClassRegistration.class_id).where(ClassRegistration.student_id == student_id)
+    )
+    on_commit(db, invalidate_class_roster, *result.scalars().all())
 
 
 async def check_schedule_overlap(db: AsyncSession, student_id: int, target_class: Class):
@@ -16,11 +32,12 @@ async def check_schedule_overlap(db: AsyncSession, student_id: int, target_class
     Overlap condition (same day):
         target.start < existing.end AND target.end > existing.start
     """
-    # Get all classes the student is currently registered for
+    # Get all classes the student is registered for this term
+    term_id = await get_current_term_id(db)
     result = await db.execute(
         select(Class)
         .join(ClassRegistration, Class.id == ClassRegistration.class_id)
-        .where(ClassRegistration.student_id == student_id)
+        .where(ClassRegistration.student_id == student_id, in_term(ClassRegistration.term_id, term_id))
     )
     registered_classes = result.scalars().all()
 
@@ -41,12 +58,27 @@ async def check_schedule_overlap(db: AsyncSession, student_id: int, target_class
                 )
 
 
+async def _bump_seat_version(db: AsyncSession, class_id: int) -> int:
+    """
+    Bump the class's seat version (published with the new seat count). The
+    UPDATE holds the class row lock until commit, so versions follow commit
+    order and a seat count read after it includes every earlier commit.
+    """
+    result = await db.execute(
+        update(Class)
+        .where(Class.id == class_id)
+        .values(seat_version=Class.seat_version + 1)
+        .returning(Class.seat_version)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one()
+
+
 async def register_student_to_class(db: AsyncSession, class_id: int, student_id: int):
     """Register a student to a class with full validation."""
 
-    # 1. Check class exists
-    class_result = await db.execute(select(Class).where(Class.id == class_id))
-    target_class = class_result.scalar_one_or_none()
+    # 1. Check class exists (identity map first: the route may have loaded it already)
+    target_class = await db.get(Class, class_id)
     if not target_class:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Class not found")
 
@@ -56,11 +88,13 @@ async def register_student_to_class(db: AsyncSession, class_id: int, student_id:
     if not student:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
 
-    # 3. Check if already registered
+    # 3. Check if already registered (this term)
+    term_id = await get_current_term_id(db)
     existing_reg = await db.execute(
         select(ClassRegistration).where(
             ClassRegistration.class_id == class_id,
-            ClassRegistration.student_id == student_id
+            ClassRegistration.student_id == student_id,
+            in_term(ClassRegistration.term_id, term_id),
         )
     )
     if existing_reg.scalar_one_or_none():
@@ -69,10 +103,12 @@ async def register_student_to_class(db: AsyncSession, class_id: int, student_id:
             detail="Student is already registered for this class"
         )
 
-    # 4. Check max students
+    # 4. Check max students, counted under the class row lock
+    seat_version = await _bump_seat_version(db, class_id)
     count_result = await db.execute(
         select(func.count(ClassRegistration.id)).where(
-            ClassRegistration.class_id == class_id
+            ClassRegistration.class_id == class_id,
+            in_term(ClassRegistration.term_id, term_id),
         )
     )
     current_count = count_result.scalar()
@@ -86,21 +122,26 @@ async def register_student_to_class(db: AsyncSession, class_id: int, student_id:
     await check_schedule_overlap(db, student_id, target_class)
 
     # 6. All checks passed -> Create registration
-    registration = ClassRegistration(class_id=class_id, student_id=student_id)
+    registration = ClassRegistration(class_id=class_id, student_id=student_id, term_id=term_id)
     db.add(registration)
     await db.flush()
     await db.refresh(registration)
-    await invalidate_class_cache()
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, invalidate_class_roster, class_id)
+    on_commit(db, invalidate_parent_overview, student.parent_id)
+    on_commit(db, publish_seats, class_id, current_count + 1, seat_version, unique=False)
 
     return registration
 
 
 async def unregister_student_from_class(db: AsyncSession, class_id: int, student_id: int):
-    """Remove a student's registration from a class."""
+    """Remove a student's registration from a class (current term)."""
+    term_id = await get_current_term_id(db)
     result = await db.execute(
         select(ClassRegistration).where(
             ClassRegistration.class_id == class_id,
-            ClassRegistration.student_id == student_id
+            ClassRegistration.student_id == student_id,
+            in_term(ClassRegistration.term_id, term_id),
         )
     )
     registration = result.scalar_one_or_none()
@@ -112,25 +153,80 @@ async def unregister_student_from_class(db: AsyncSession, class_id: int, student
 
     await db.delete(registration)
     await db.flush()
-    await invalidate_class_cache()
+    seat_version = await _bump_seat_version(db, class_id)
+    count_result = await db.execute(
+        select(func.count(ClassRegistration.id)).where(
+            ClassRegistration.class_id == class_id, in_term(ClassRegistration.term_id, term_id),
+        )
+    )
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, invalidate_class_roster, class_id)
+    await invalidate_parent_overview_for_students(db, [student_id])
+    on_commit(db, publish_seats, class_id, count_result.scalar(), seat_version, unique=False)
     return {"message": "Student unregistered successfully"}
 
 
-async def get_class_students(db: AsyncSession, class_id: int):
-    """Get all students registered in a class."""
+async def get_class_students(
+    db: AsyncSession, class_id: int, skip: int = 0, limit: int = 100, slim: bool = False
+) -> tuple[int, list[dict]]:
+    """
+    One page of a class roster, ordered by name, plus the roster size.
+
+    ``slim`` returns only id + name. Pages are cached per class and dropped on
+    register/unregister or when a registered student changes.
+    """
+    cache_key = CLASS_ROSTER_CACHE_KEY.format(class_id=class_id)
+    field = f"{'slim' if slim else 'full'}:{skip}:{limit}"
+
+    # Try cache first
+    version = None
+    try:
+        page, version = await cache_hget_versioned(cache_key, field, schema=CLASS_ROSTER_CACHE_SCHEMA)
+        if page is not None:
+            return page["total"], page["items"]
+    except Exception:
+        pass  # Redis down -> fallback to DB
+
+    term_id = await get_current_term_id(db)
+    total_result = await db.execute(
+        select(func.count(ClassRegistration.id)).where(
+            ClassRegistration.class_id == class_id, in_term(ClassRegistration.term_id, term_id),
+        )
+    )
+    total = total_result.scalar()
+
+    columns = (Student.id, Student.name) if slim else (Student,)
     result = await db.execute(
-        select(Student)
+        select(*columns)
         .join(ClassRegistration, Student.id == ClassRegistration.student_id)
-        .where(ClassRegistration.class_id == class_id)
+        .where(ClassRegistration.class_id == class_id, in_term(ClassRegistration.term_id, term_id))
+        .order_by(Student.name, Student.id)
+        .offset(skip)
+        .limit(limit)
     )
-    return result.scalars().all()
+    if slim:
+        items = [{"id": row.id, "name": row.name} for row in result.all()]
+    else:
+        items = [StudentResponse.model_validate(s).model_dump(mode="json") for s in result.scalars().all()]
+
+    # Cache the page, unless a write invalidated the roster meanwhile
+    try:
+        if version is not None:
+            await cache_hset_if_version(
+                cache_key, field, {"total": total, "items": items}, version, schema=CLASS_ROSTER_CACHE_SCHEMA,
+            )
+    except Exception:
+        pass
+
+    return total, items
 
 
 async def get_student_classes(db: AsyncSession, student_id: int):
-    """Get all classes a student is registered in."""
+    """Get all classes a student is registered in this term (past terms: /api/terms/{id}/archive)."""
+    term_id = await get_current_term_id(db)
     result = await db.execute(
         select(Class)
         .join(ClassRegistration, Class.id == ClassRegistration.class_id)
-        .where(ClassRegistration.student_id == student_id)
+        .where(ClassRegistration.student_id == student_id, in_term(ClassRegistration.term_id, term_id))
     )
     return result.scalars().all()
@@ -0,0 +1,191 @@
+"""
+Rush mode: queued, FIFO registration for classes that sell out in seconds.
+
+``POST /classes/{id}/register`` on a rush class only appends a ticket to the
+class's Redis list. A single consumer per class (guarded by a Redis lock)
+drains the list in order and registers a batch of tickets per transaction,
+reusing ``registration_service`` validation. Clients poll the ticket.
+
+A batch is moved to ``rush:processing:<class_id>`` rather than popped, and
+removed only once its transaction committed; the next owner of the class
+lock puts whatever a dead consumer left there back at the head of the queue.
+
+Each ticket runs in its own savepoint. A ticket that fails for any other
+reason than a validation error is marked ``failed`` and its entry moved to
+``rush:dead:<class_id>``, so one bad entry cannot block the queue; only an
+unreachable database puts the whole batch back for the next round.
+"""
+import asyncio
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import InterfaceError, OperationalError
+
+from app.core.config import get_settings
+from app.db.database import async_session
+from app.db.redis import redis_client
+from app.services import registration_service
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+RUSH_QUEUE_KEY = "rush:queue:{class_id}"
+RUSH_TICKET_KEY = "rush:ticket:{ticket_id}"
+RUSH_PROCESSING_KEY = "rush:processing:{class_id}"  # batch being registered
+RUSH_LOCK_KEY = "rush:lock:{class_id}"
+RUSH_ACTIVE_KEY = "rush:active"  # set of class ids with pending tickets
+RUSH_DEAD_KEY = "rush:dead:{class_id}"  # entries that failed to process, for inspection
+RUSH_LOCK_TTL = 30  # seconds; refreshed after every batch
+
+# KEYS[1] = lock key; ARGV[1] = owner. Delete the lock only if we still own it
+RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# KEYS[1] = lock key; ARGV = owner, ttl. Returns 0 if the lock expired and was taken over
+REFRESH_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+async def enqueue_registration(class_id: int, student_id: int) -> dict:
+    """Queue a registration request and return its ticket."""
+    now = _now()
+    ticket = {
+        "ticket_id": uuid.uuid4().hex,
+        "class_id": class_id,
+        "student_id": student_id,
+        "status": "queued",
+        "created_at": now,
+        "updated_at": now,
+    }
+    ticket_key = RUSH_TICKET_KEY.format(ticket_id=ticket["ticket_id"])
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hset(ticket_key, mapping=ticket)
+        pipe.expire(ticket_key, settings.RUSH_TICKET_TTL)
+        pipe.rpush(RUSH_QUEUE_KEY.format(class_id=class_id), f"{ticket['ticket_id']}:{student_id}")
+        pipe.sadd(RUSH_ACTIVE_KEY, class_id)
+        await pipe.execute()
+    return ticket
+
+
+async def get_ticket(class_id: int, ticket_id: str) -> dict:
+    ticket = await redis_client.hgetall(RUSH_TICKET_KEY.format(ticket_id=ticket_id))
+    if not ticket or int(ticket["class_id"]) != class_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Ticket not found")
+    return ticket
+
+
+def _database_unavailable(exc: Exception) -> bool:
+    """Errors every ticket of the batch would hit: retry the batch rather than fail them."""
+    return isinstance(exc, (OperationalError, InterfaceError)) or getattr(exc, "connection_invalidated", False)
+
+
+async def requeue_processing(class_id: int) -> int:
+    """Put a batch left in the processing list back at the head of the queue, in order."""
+    queue_key = RUSH_QUEUE_KEY.format(class_id=class_id)
+    processing_key = RUSH_PROCESSING_KEY.format(class_id=class_id)
+    moved = 0
+    while await redis_client.lmove(processing_key, queue_key, "RIGHT", "LEFT"):
+        moved += 1
+    return moved
+
+
+async def process_batch(class_id: int, batch_size: int = None) -> int:
+    """Register the next batch of queued tickets in FIFO order, in one transaction."""
+    queue_key = RUSH_QUEUE_KEY.format(class_id=class_id)
+    processing_key = RUSH_PROCESSING_KEY.format(class_id=class_id)
+    async with redis_client.pipeline(transaction=True) as pipe:
+        for _ in range(batch_size or settings.RUSH_BATCH_SIZE):
+            pipe.lmove(queue_key, processing_key, "LEFT", "RIGHT")
+        entries = [entry for entry in await pipe.execute() if entry is not None]
+    if not entries:
+        return 0
+
+    outcomes = {}
+    dead = []
+    try:
+        async with async_session() as session:
+            for entry in entries:
+                ticket_id, _, student_id = entry.partition(":")
+                try:
+                    async with session.begin_nested():
+                        registration = await registration_service.register_student_to_class(
+                            session, class_id, int(student_id)
+                        )
+                    outcomes[ticket_id] = {"status": "registered", "registration_id": registration.id}
+                except HTTPException as exc:
+                    outcomes[ticket_id] = {"status": "rejected", "detail": exc.detail}
+                except Exception as exc:
+                    if _database_unavailable(exc):
+                        raise
+                    logger.exception("Rush ticket %r for class %d failed", entry, class_id)
+                    outcomes[ticket_id] = {"status": "failed", "detail": "Registration could not be processed"}
+                    dead.append(entry)
+            await session.commit()
+    except Exception:
+        # Nothing was committed: put the batch back at the head, in order
+        await requeue_processing(class_id)
+        raise
+
+    now = _now()
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.delete(processing_key)
+        for ticket_id, outcome in outcomes.items():
+            pipe.hset(RUSH_TICKET_KEY.format(ticket_id=ticket_id), mapping={**outcome, "updated_at": now})
+        for entry in dead:
+            # A malformed entry may not name a real ticket: don't leave a key without TTL behind
+            pipe.expire(RUSH_TICKET_KEY.format(ticket_id=entry.partition(":")[0]), settings.RUSH_TICKET_TTL)
+        if dead:
+            pipe.rpush(RUSH_DEAD_KEY.format(class_id=class_id), *dead)
+        await pipe.execute()
+    return len(entries)
+
+
+async def _drain_class(class_id: int, consumer: str):
+    lock_key = RUSH_LOCK_KEY.format(class_id=class_id)
+    if not await redis_client.set(lock_key, consumer, nx=True, ex=RUSH_LOCK_TTL):
+        return  # another consumer owns this class
+    try:
+        if await requeue_processing(class_id):
+            logger.warning("Requeued an unfinished rush batch for class %d", class_id)
+        refresh_lock = redis_client.register_script(REFRESH_LOCK_LUA)
+        while await process_batch(class_id):
+            if not await refresh_lock(keys=[lock_key], args=[consumer, RUSH_LOCK_TTL]):
+                logger.warning("Lost the rush lock of class %d", class_id)
+                return
+
+        # Retire the class from the active set, unless a ticket slipped in meanwhile
+        await redis_client.srem(RUSH_ACTIVE_KEY, class_id)
+        if await redis_client.llen(RUSH_QUEUE_KEY.format(class_id=class_id)):
+            await redis_client.sadd(RUSH_ACTIVE_KEY, class_id)
+    finally:
+        await redis_client.register_script(RELEASE_LOCK_LUA)(keys=[lock_key], args=[consumer])
+
+
+async def run_consumers(consumer: str, stop: asyncio.Event):
+    """Drain every class with pending tickets; one consumer per class across workers."""
+    while not stop.is_set():
+        try:
+            class_ids = await redis_client.smembers(RUSH_ACTIVE_KEY)
+            results = await asyncio.gather(
+                *(_drain_class(int(cid), consumer) for cid in class_ids), return_exceptions=True
+            )
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error("Rush batch failed: %r", result)
+        except Exception as exc:
+            logger.warning("Rush consumer error: %r", exc)
+        await asyncio.sleep(settings.RUSH_POLL_INTERVAL)
@@ -0,0 +1,37 @@
+from sqlalchemy import case, func, or_
+
+from app.core.text import normalize_search_text
+from app.models.parent import Parent
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def apply_search(query, model, q: str):
+    """
+    Filter ``query`` to rows of ``model`` matching ``q`` and order them by relevance.
+
+    Matches the accent-free ``search_text`` column by substring (trigram index on
+    Postgres) and, for parents, phone numbers by prefix. Ranking: whole-text
+    prefix, then word prefix, then any substring; shorter texts first.
+    """
+    term = _escape_like(normalize_search_text(q))
+    conditions = [model.search_text.like(f"%{term}%", escape="\\")]
+    rank = case(
+        (model.search_text.like(f"{term}%", escape="\\"), 0),
+        (model.search_text.like(f"% {term}%", escape="\\"), 1),
+        else_=2,
+    )
+
+    if model is Parent:
+        digits = "".join(ch for ch in q if ch.isdigit())
+        if digits:
+            conditions.append(Parent.phone.like(f"{digits}%"))
+            rank = case((Parent.phone.like(f"{digits}%"), 0), else_=rank)
+
+    return (
+        query.where(or_(*conditions))
+        .order_by(rank, func.length(model.search_text), model.id)
+    )
+
@@ -0,0 +1,153 @@
+"""
+Live seat availability over Server-Sent Events.
+
+Register/unregister publish ``{class_id: {"registered": n, "version": v}}``
+on a Redis pub/sub channel once their transaction commits: the class's
+absolute seat count and its ``seat_version``, which the catalog also
+returns. Clients keep, per class, only a state newer than the one they
+have, so duplicates, reordering and a refetch racing the stream cannot
+double-count. Each worker holds a single subscription (``SeatHub``) and
+fans the states out to its connected SSE clients.
+
+Backpressure: a client never queues messages, it keeps the newest state per
+class until its stream is ready to write, so a slow or idle client costs a
+small dict no matter how busy registration is. Idle streams get a comment
+heartbeat; after a Redis outage clients are told to resync.
+"""
+import asyncio
+import json
+import logging
+from typing import AsyncIterator, Optional
+
+from fastapi import HTTPException, status
+
+from app.core import metrics
+from app.core.config import get_settings
+from app.db.redis import redis_client
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+SEAT_CHANNEL = "classes:seats"
+
+
+async def publish_seats(class_id: int, registered: int, version: int):
+    """Broadcast a class's seat count to every worker (best effort)."""
+    try:
+        await redis_client.publish(SEAT_CHANNEL, json.dumps({class_id: {"registered": registered, "version": version}}))
+    except Exception:
+        pass
+
+
+class SeatSubscriber:
+    def __init__(self, class_ids: Optional[set[int]] = None):
+        self.class_ids = class_ids
+        self.pending: dict[int, dict] = {}
+        self.resync = False
+        self.ready = asyncio.Event()
+
+    def push(self, seats: dict[int, dict]):
+        for class_id, state in seats.items():
+            if self.class_ids is None or class_id in self.class_ids:
+                pending = self.pending.get(class_id)
+                if pending is None or state["version"] > pending["version"]:
+                    self.pending[class_id] = state
+                    self.ready.set()
+
+    def request_resync(self):
+        self.resync = True
+        self.ready.set()
+
+    async def events(self, heartbeat: float) -> AsyncIterator[str]:
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout=heartbeat)
+            except asyncio.TimeoutError:
+                yield ": ping\n\n"
+                continue
+            self.ready.clear()
+            if self.resync:
+                self.resync = False
+                self.pending.clear()
+                yield "event: resync\ndata: {}\n\n"
+                continue
+            seats, self.pending = self.pending, {}
+            if seats:
+                yield f"event: seats\ndata: {json.dumps(seats)}\n\n"
+
+
+class SeatHub:
+    """Per-worker fan-out: one Redis subscription shared by every SSE client."""
+
+    def __init__(self, max_clients: int):
+        self.max_clients = max_clients
+        self._clients: set[SeatSubscriber] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def connect(self, class_ids: Optional[set[int]] = None) -> SeatSubscriber:
+        if len(self._clients) >= self.max_clients:
+            metrics.incr("seat_stream_rejected")
+            raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Too many live connections")
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen())
+        subscriber = SeatSubscriber(class_ids)
+        self._clients.add(subscriber)
+        return subscriber
+
+    def disconnect(self, subscriber: SeatSubscriber):
+        self._clients.discard(subscriber)
+
+    def dispatch(self, seats: dict[int, dict]):
+        for subscriber in self._clients:
+            subscriber.push(seats)
+
+    async def _listen(self):
+        failed = False
+        while True:
+            pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(SEAT_CHANNEL)
+                if failed:
+                    # Updates published during the outage were lost
+                    for subscriber in self._clients:
+                        subscriber.request_resync()
+                    failed = False
+                while True:
+                    message = await pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        data = json.loads(message["data"])
+                        self.dispatch({int(class_id): state for class_id, state in data.items()})
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                failed = True
+                logger.warning("Seat stream subscription error: %r", exc)
+                await asyncio.sleep(1)
+            finally:
+                try:
+                    await pubsub.aclose()
+                except Exception:
+                    pass
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+seat_hub = SeatHub(settings.SEAT_STREAM_MAX_CLIENTS)
+metrics.register_gauge("seat_stream_clients", lambda: len(seat_hub._clients))
+
+
+async def stream_seats(subscriber: SeatSubscriber) -> AsyncIterator[str]:
+    """SSE body for a connected subscriber; unregisters it when the client goes away."""
+    try:
+        async for chunk in subscriber.events(settings.SEAT_STREAM_HEARTBEAT):
+            yield chunk
+    finally:
+        seat_hub.disconnect(subscriber)
@@ -0,0 +1,176 @@
+"""
+Timetable slot recommender for new classes.
+
+The week is a grid of 15-minute cells (7 days x 96) and a slot is a start
+cell plus the class length in cells. Occupancy is kept sparse, as one row of
+blocked start ranges per candidate student: each current-term class blocks
+the starts whose window would overlap it. Merging each student's ranges and
+sweeping them once gives, for every start at once, how many students are
+busy -- the column sums of the students x starts matrix without building it
+(a dense matrix costs a cumulative sum over ~670 x students cells). Starts
+overlapping one of the teacher's classes are dropped the same way.
+
+Three queries whatever the number of students: the candidates, their
+(student, class) registrations, and the classes involved plus the teacher's.
+Existing classes are rounded outward to the grid (a class ending at 08:10
+blocks the 08:00-08:15 cell), so a suggested slot never overlaps a
+registration that ``check_schedule_overlap`` would reject.
+"""
+from datetime import time
+from itertools import chain
+
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select, exists, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.text import normalize_search_text
+from app.models.class_model import Class
+from app.models.registration import ClassRegistration
+from app.models.student import Student
+from app.schemas.class_schema import SlotSuggestionRequest
+from app.services.term_scope import get_current_term_id, in_term
+
+CELL_MINUTES = 15
+CELLS_PER_DAY = 24 * 60 // CELL_MINUTES
+WEEK_CELLS = 7 * CELLS_PER_DAY
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+def _minutes_time(minutes: int) -> time:
+    return time(minutes // 60, minutes % 60)
+
+
+def _blocked_starts(day: int, start: time, end: time, length: int) -> tuple[int, int]:
+    """Start cells ``[lo, hi)`` of the windows overlapping a class, rounded outward."""
+    first = day * CELLS_PER_DAY + _minutes(start) // CELL_MINUTES
+    last = day * CELLS_PER_DAY - (-_minutes(end) // CELL_MINUTES)
+    return max(first - length + 1, 0), last
+
+
+def _busy_count(lo: np.ndarray, hi: np.ndarray, owners: np.ndarray) -> np.ndarray:
+    """
+    Number of distinct owners (students) with a ``[lo, hi)`` range containing
+    each start cell. Each owner's ranges are merged first (sorted by owner,
+    then start; a range opens a new block unless it starts inside the running
+    end of the previous ones), so a sweep over the merged blocks counts each
+    busy student once per cell.
+    """
+    if not len(lo):
+        return np.zeros(WEEK_CELLS, dtype=np.int64)
+    order = np.lexsort((lo, owners))
+    # Offsetting by owner keeps one running maximum from leaking into the next owner
+    offset = owners[order] * (WEEK_CELLS + 1)
+    lo, hi = lo[order] + offset, hi[order] + offset
+    reach = np.maximum.accumulate(hi)
+    opens = np.ones(len(lo), dtype=bool)
+    opens[1:] = lo[1:] > reach[:-1]
+    closes = np.append(opens[1:], True)
+    cells = np.bincount(lo[opens] - offset[opens], minlength=WEEK_CELLS + 1)
+    cells -= np.bincount(reach[closes] - offset[closes], minlength=WEEK_CELLS + 1)
+    return np.cumsum(cells[:WEEK_CELLS])
+
+
+def _candidate_query(data: SlotSuggestionRequest, term_id):
+    query = select(Student.id)
+    if data.student_ids:
+        query = query.where(Student.id.in_(data.student_ids))
+    if data.grade is not None:
+        query = query.where(Student.current_grade == data.grade)
+    if data.subject:
+        # Already taking the subject this term -> not a candidate
+        query = query.where(~exists().where(
+            ClassRegistration.student_id == Student.id,
+            in_term(ClassRegistration.term_id, term_id),
+            ClassRegistration.class_id == Class.id,
+            Class.subject == data.subject,
+        ))
+    return query
+
+
+def _validate(data: SlotSuggestionRequest):
+    if not data.student_ids and data.grade is None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Provide student_ids or grade")
+    if any(day < 0 or day > 6 for day in data.days):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="days must be between 0 and 6")
+    if _minutes(data.latest) - _minutes(data.earliest) < data.duration_minutes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="The class does not fit between earliest and latest",
+        )
+
+
+async def suggest_slots(db: AsyncSession, data: SlotSuggestionRequest) -> dict:
+    """Top ``top_k`` slots by number of free candidates, earliest first on ties."""
+    _validate(data)
+    length = -(-data.duration_minutes // CELL_MINUTES)
+    term_id = await get_current_term_id(db)
+
+    candidate_query = _candidate_query(data, term_id)
+    candidates = np.array(sorted((await db.execute(candidate_query)).scalars().all()), dtype=np.int64)
+    if not len(candidates):
+        return {"candidates": 0, "suggestions": []}
+
+    # Start cells allowed by days / earliest / latest, the window staying inside one day
+    starts = np.arange(WEEK_CELLS - length + 1)
+    day, offset = np.divmod(starts, CELLS_PER_DAY)
+    valid = (
+        np.isin(day, data.days)
+        & (offset + length <= CELLS_PER_DAY)
+        & (offset * CELL_MINUTES >= _minutes(data.earliest))
+        & (offset * CELL_MINUTES + data.duration_minutes <= _minutes(data.latest))
+    )
+
+    registered = (
+        select(ClassRegistration.student_id, ClassRegistration.class_id)
+        .where(
+            ClassRegistration.student_id.in_(candidate_query.scalar_subquery()),
+            in_term(ClassRegistration.term_id, term_id),
+        )
+    )
+    result = await db.execute(registered)
+    pairs = np.fromiter(chain.from_iterable(result.tuples()), dtype=np.int64).reshape(-1, 2)
+
+    # Times of the classes involved, converted once per class rather than per registration
+    teacher_key = normalize_search_text(data.teacher_name) if data.teacher_name else None
+    class_filter = Class.id.in_(registered.with_only_columns(ClassRegistration.class_id).distinct())
+    if teacher_key:
+        class_filter = or_(class_filter, Class.teacher_key == teacher_key)
+    result = await db.execute(
+        select(Class.id, Class.day_of_week, Class.time_slot_start, Class.time_slot_end, Class.teacher_key)
+        .where(class_filter).order_by(Class.id)
+    )
+    classes = result.all()
+    class_ids = np.array([row.id for row in classes], dtype=np.int64)
+    ranges = np.array(
+        [_blocked_starts(row.day_of_week, row.time_slot_start, row.time_slot_end, length) for row in classes],
+        dtype=np.int64,
+    ).reshape(-1, 2)
+
+    if teacher_key:
+        teaching = np.array([row.teacher_key == teacher_key for row in classes], dtype=bool)
+        lo, hi = ranges[teaching].T
+        valid &= _busy_count(lo, hi, np.zeros(len(lo), dtype=np.int64))[:len(starts)] == 0
+    starts = starts[valid]
+
+    lo, hi = ranges[np.searchsorted(class_ids, pairs[:, 1])].T
+    free = len(candidates) - _busy_count(lo, hi, pairs[:, 0])[starts]
+
+    best = np.lexsort((starts, -free))[:data.top_k]
+    return {
+        "candidates": len(candidates),
+        "suggestions": [
+            {
+                "day_of_week": int(starts[i] // CELLS_PER_DAY),
+                "time_slot_start": _minutes_time(int(starts[i]) % CELLS_PER_DAY * CELL_MINUTES),
+                "time_slot_end": _minutes_time(
+                    int(starts[i]) % CELLS_PER_DAY * CELL_MINUTES + data.duration_minutes
+                ),
+                "free_students": int(free[i]),
+            }
+            for i in best
+        ],
+    }
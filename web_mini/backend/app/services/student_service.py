@@ -5,18 +5,27 @@ from fastapi import HTTPException, status
 
 from app.models.student import Student
 from app.models.parent import Parent
-from app.schemas.student import StudentCreate, StudentUpdate
+from app.schemas.student import StudentCreate, StudentUpdate, StudentResponse
+from app.db.database import on_commit
+from app.db.rows import response_columns
+from app.db.entity_cache import EntityCache
+from app.services.search_service import apply_search
+from app.services.parent_service import invalidate_parent_overview
+from app.services.registration_service import invalidate_student_rosters
 
 
-async def get_all_students(db: AsyncSession, skip: int = 0, limit: int = 100):
-    result = await db.execute(
-        select(Student)
-        .options(selectinload(Student.parent))
-        .offset(skip)
-        .limit(limit)
-        .order_by(Student.id)
-    )
-    return result.scalars().all()
+STUDENT_LIST_COLUMNS = response_columns(Student, StudentResponse)
+
+# GET /students/{id}
+student_cache = EntityCache("student", Student, StudentResponse, not_found="Student not found")
+
+
+async def get_all_students(db: AsyncSession, skip: int = 0, limit: int = 100, q: str = None):
+    """Rows with just the ``StudentResponse`` columns (no ORM instances)."""
+    query = select(*STUDENT_LIST_COLUMNS)
+    query = apply_search(query, Student, q) if q else query.order_by(Student.id)
+    result = await db.execute(query.offset(skip).limit(limit))
+    return result.all()
 
 
 async def get_student_by_id(db: AsyncSession, student_id: int):
@@ -44,12 +53,15 @@ async def create_student(db: AsyncSession, data: StudentCreate):
     db.add(student)
     await db.flush()
     await db.refresh(student)
+    on_commit(db, invalidate_parent_overview, student.parent_id)
+    student_cache.write_through(db, student)
     return student
 
 
 async def update_student(db: AsyncSession, student_id: int, data: StudentUpdate):
     student = await get_student_by_id(db, student_id)
     update_data = data.model_dump(exclude_unset=True)
+    old_parent_id = student.parent_id
 
     if "parent_id" in update_data:
         parent_result = await db.execute(select(Parent).where(Parent.id == update_data["parent_id"]))
@@ -64,11 +76,15 @@ async def update_student(db: AsyncSession, student_id: int, data: StudentUpdate)
 
     await db.flush()
     await db.refresh(student)
+    on_commit(db, invalidate_parent_overview, old_parent_id, student.parent_id)
+    await invalidate_student_rosters(db, student_id)
     return student
 
 
 async def delete_student(db: AsyncSession, student_id: int):
     student = await get_student_by_id(db, student_id)
+    await invalidate_student_rosters(db, student_id)
     await db.delete(student)
     await db.flush()
+    on_commit(db, invalidate_parent_overview, student.parent_id)
     return {"message": f"Student '{student.name}' deleted successfully"}
@@ -1,17 +1,37 @@
+from datetime import date
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, update, and_, not_
 from fastapi import HTTPException, status
 
 from app.models.subscription import Subscription
 from app.models.student import Student
-from app.schemas.subscription import SubscriptionCreate, SubscriptionUpdate
+from app.schemas.subscription import (
+    SubscriptionCreate, SubscriptionUpdate, SubscriptionBulkUpdate, SubscriptionResponse,
+)
+from app.db.database import on_commit
+from app.db.rows import response_columns
+from app.db.entity_cache import EntityCache
+from app.services.attendance_service import attendance_buffer
+from app.services.change_service import log_changes
+from app.services.class_service import class_cache
+from app.services.parent_service import invalidate_parent_overview, invalidate_parent_overview_for_students
+from app.services.term_scope import get_current_term_id
+
+
+SUBSCRIPTION_LIST_COLUMNS = response_columns(Subscription, SubscriptionResponse)
+
+# GET /subscriptions/{id}
+subscription_cache = EntityCache(
+    "subscription", Subscription, SubscriptionResponse, not_found="Subscription not found",
+)
 
 
 async def get_all_subscriptions(db: AsyncSession, skip: int = 0, limit: int = 100):
+    """Rows with just the ``SubscriptionResponse`` columns (no ORM instances)."""
     result = await db.execute(
-        select(Subscription).offset(skip).limit(limit).order_by(Subscription.id)
+        select(*SUBSCRIPTION_LIST_COLUMNS).offset(skip).limit(limit).order_by(Subscription.id)
     )
-    return result.scalars().all()
+    return result.all()
 
 
 async def get_subscription_by_id(db: AsyncSession, sub_id: int):
@@ -32,16 +52,19 @@ async def get_student_subscriptions(db: AsyncSession, student_id: int):
 async def create_subscription(db: AsyncSession, data: SubscriptionCreate):
     # Verify student exists
     student_result = await db.execute(select(Student).where(Student.id == data.student_id))
-    if not student_result.scalar_one_or_none():
+    student = student_result.scalar_one_or_none()
+    if not student:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Student with id {data.student_id} not found"
         )
 
-    sub = Subscription(**data.model_dump())
+    sub = Subscription(**data.model_dump(), term_id=await get_current_term_id(db))
     db.add(sub)
     await db.flush()
     await db.refresh(sub)
+    on_commit(db, invalidate_parent_overview, student.parent_id)
+    subscription_cache.write_through(db, sub)
     return sub
 
 
@@ -60,12 +83,87 @@ async def update_subscription(db: AsyncSession, sub_id: int, data: SubscriptionU
 
     await db.flush()
     await db.refresh(sub)
+    await invalidate_parent_overview_for_students(db, [sub.student_id])
     return sub
 
 
-async def use_session(db: AsyncSession, sub_id: int):
-    """Decrement one session from the subscription."""
+def _subscription_filters(data) -> list:
+    filters = []
+    if data.ids is not None:
+        filters.append(Subscription.id.in_(data.ids))
+    if data.student_id is not None:
+        filters.append(Subscription.student_id == data.student_id)
+    if data.package_name is not None:
+        filters.append(Subscription.package_name == data.package_name)
+    if data.is_active is not None:
+        filters.append(Subscription.is_active == data.is_active)
+    if data.end_date_from is not None:
+        filters.append(Subscription.end_date >= data.end_date_from)
+    if data.end_date_to is not None:
+        filters.append(Subscription.end_date <= data.end_date_to)
+    return filters
+
+
+async def bulk_update_subscriptions(db: AsyncSession, data: SubscriptionBulkUpdate):
+    """
+    Apply one patch to every matching subscription with a single UPDATE ... RETURNING.
+
+    The single-row rules (used <= total sessions, end date not before start)
+    are SQL conditions: any matching row that would break them fails the
+    request, and the UPDATE repeats them as a guard against concurrent writes.
+    """
+    filters = _subscription_filters(data.filter)
+    patch = data.patch.model_dump(exclude_unset=True)
+    if not filters:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Bulk update needs at least one filter")
+    if not patch:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Nothing to update")
+    if "total_sessions" in patch and "add_sessions" in patch:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either total_sessions or add_sessions, not both"
+        )
+
+    values = {key: patch[key] for key in ("package_name", "end_date", "total_sessions", "is_active") if key in patch}
+    if "add_sessions" in patch:
+        values["total_sessions"] = Subscription.total_sessions + patch["add_sessions"]
+    guard = and_(
+        Subscription.used_sessions <= values.get("total_sessions", Subscription.total_sessions),
+        Subscription.start_date <= values.get("end_date", Subscription.end_date),
+    )
+
+    invalid = await db.execute(
+        select(Subscription.id).where(*filters, not_(guard)).order_by(Subscription.id).limit(20)
+    )
+    invalid_ids = invalid.scalars().all()
+    if invalid_ids:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Used sessions cannot exceed total sessions and end date cannot precede start date "
+                f"(subscriptions {invalid_ids})"
+            )
+        )
+
+    result = await db.execute(
+        update(Subscription)
+        .where(*filters, guard)
+        .values(**values)
+        .returning(Subscription)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    subs = result.scalars().all()
+    await log_changes(db, subs)
+    await invalidate_parent_overview_for_students(db, [sub.student_id for sub in subs])
+    subscription_cache.invalidate_on_commit(db, [sub.id for sub in subs])
+    return {"updated": len(subs), "ids": [sub.id for sub in subs]}
+
+
+async def use_session(db: AsyncSession, sub_id: int, class_id: int = None):
+    """Decrement one session from the subscription and log the check-in."""
     sub = await get_subscription_by_id(db, sub_id)
+    if class_id is not None:
+        await class_cache.get(db, class_id)  # 404 before the attendance event points at a missing class
 
     if not sub.is_active:
         raise HTTPException(
@@ -87,11 +185,119 @@ async def use_session(db: AsyncSession, sub_id: int):
 
     await db.flush()
     await db.refresh(sub)
+    await invalidate_parent_overview_for_students(db, [sub.student_id])
+    on_commit(db, attendance_buffer.record, sub.student_id, sub.id, class_id, unique=False)
     return sub
 
 
+def _check_in_target(student_id, today: date):
+    """The subscription a check-in draws from: in date, sessions left, earliest end_date first."""
+    return (
+        select(Subscription.id)
+        .where(
+            Subscription.student_id == student_id,
+            Subscription.is_active == True,
+            Subscription.used_sessions < Subscription.total_sessions,
+            Subscription.start_date <= today,
+            Subscription.end_date >= today,
+        )
+        .order_by(Subscription.end_date, Subscription.id)
+        .limit(1)
+    )
+
+
+async def check_in_students(db: AsyncSession, student_ids: list[int], class_id: int = None) -> list[Subscription]:
+    """
+    Deduct one session for each student, from the subscription picked by
+    ``_check_in_target``, in a single UPDATE ... RETURNING.
+
+    The pick is ``FOR UPDATE SKIP LOCKED``: a subscription another desk is
+    deducting from right now is skipped (the student falls to their next
+    subscription or is left out) instead of waiting on it. Students listed
+    twice are checked in once. ``class_id``, if given, must exist (404).
+    """
+    if class_id is not None:
+        await class_cache.get(db, class_id)
+    today = date.today()
+    picked = (
+        select(_check_in_target(Student.id, today).with_for_update(skip_locked=True).scalar_subquery())
+        .where(Student.id.in_(set(student_ids)))
+    )
+    result = await db.execute(
+        update(Subscription)
+        .where(Subscription.id.in_(picked))
+        .values(
+            used_sessions=Subscription.used_sessions + 1,
+            # Auto-deactivate if all sessions used
+            is_active=Subscription.used_sessions + 1 < Subscription.total_sessions,
+        )
+        .returning(Subscription)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    subs = result.scalars().all()
+    await log_changes(db, subs)
+    await invalidate_parent_overview_for_students(db, [sub.student_id for sub in subs])
+    subscription_cache.invalidate_on_commit(db, [sub.id for sub in subs])
+    for sub in subs:
+        on_commit(db, attendance_buffer.record, sub.student_id, sub.id, class_id, unique=False)
+    return subs
+
+
+async def check_in_student(db: AsyncSession, student_id: int, class_id: int = None):
+    """Check in one student; on failure, tell why (one extra query, only then)."""
+    subs = await check_in_students(db, [student_id], class_id)
+    if subs:
+        return subs[0]
+
+    result = await db.execute(
+        select(Student.id, _check_in_target(Student.id, date.today()).scalar_subquery())
+        .where(Student.id == student_id)
+    )
+    row = result.first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Student not found")
+    if row[1] is not None:  # usable, but locked by a concurrent check-in
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Student is being checked in elsewhere, please retry"
+        )
+    raise HTTPException(
+        status_code=status.HTTP_400_BAD_REQUEST,
+        detail="No active subscription with remaining sessions"
+    )
+
+
 async def delete_subscription(db: AsyncSession, sub_id: int):
     sub = await get_subscription_by_id(db, sub_id)
     await db.delete(sub)
     await db.flush()
+    await invalidate_parent_overview_for_students(db, [sub.student_id])
     return {"message": "Subscription deleted successfully"}
+
+
+async def deactivate_expired_batch(db: AsyncSession, today: date, batch_size: int) -> int:
+    """
+    Deactivate up to ``batch_size`` subscriptions whose end_date has passed.
+
+    One set-based UPDATE; rows locked by concurrent writers are skipped and
+    picked up by the next batch. Returns the number of rows deactivated.
+    """
+    expired_ids = (
+        select(Subscription.id)
+        .where(Subscription.is_active == True, Subscription.end_date < today)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Subscription)
+        .where(Subscription.id.in_(expired_ids))
+        .values(is_active=False)
+        .returning(Subscription)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    subs = result.scalars().all()
+    await log_changes(db, subs)
+    await invalidate_parent_overview_for_students(db, [sub.student_id for sub in subs])
+    subscription_cache.invalidate_on_commit(db, [sub.id for sub in subs])
+    return len(subs)
@@ -0,0 +1,47 @@
+import time
+from typing import Optional
+
+from sqlalchemy import select, and_, or_, exists
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.term import Term
+
+settings = get_settings()
+
+# (expires_at, term_id): the current term changes a few times a year, so it
+# is cached per process instead of being looked up by every hot query
+_current_term = (0.0, None)
+
+
+async def get_current_term_id(db: AsyncSession) -> Optional[int]:
+    """Id of the current term; None until a term has been activated."""
+    global _current_term
+    expires_at, term_id = _current_term
+    if time.monotonic() < expires_at:
+        return term_id
+    term_id = await db.scalar(select(Term.id).where(Term.is_current == True))
+    _current_term = (time.monotonic() + settings.TERM_CACHE_TTL, term_id)
+    return term_id
+
+
+def forget_current_term():
+    global _current_term
+    _current_term = (0.0, None)
+
+
+def in_term(column, term_id: Optional[int]):
+    """Condition: ``column`` (a ``term_id``) is ``term_id``; rows predating terms have NULL."""
+    return column.is_(None) if term_id is None else column == term_id
+
+
+def in_current_term(column):
+    """
+    ``in_term`` for the current term without a round trip of its own: the
+    cached id, or while the cache is cold a subquery inside the caller's query.
+    """
+    expires_at, term_id = _current_term
+    if time.monotonic() < expires_at:
+        return in_term(column, term_id)
+    current = select(Term.id).where(Term.is_current == True)
+    return or_(column == current.scalar_subquery(), and_(column.is_(None), ~exists(current)))
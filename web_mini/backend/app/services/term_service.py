@@ -0,0 +1,167 @@
+from datetime import date, datetime, timezone
+
+from fastapi import HTTPException, status
+from sqlalchemy import select, update, delete, insert, literal, and_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.database import on_commit
+from app.models.class_model import Class
+from app.models.registration import ClassRegistration
+from app.models.subscription import Subscription
+from app.models.term import Term, ClassRegistrationArchive, SubscriptionArchive
+from app.schemas.term import TermCreate
+from app.services.change_service import log_changes, log_removed
+from app.services.class_service import invalidate_class_cache, invalidate_class_roster, bump_class_generation
+from app.services.subscription_service import subscription_cache
+from app.services.term_scope import forget_current_term
+
+
+async def get_terms(db: AsyncSession):
+    result = await db.execute(select(Term).order_by(Term.start_date.desc()))
+    return result.scalars().all()
+
+
+async def get_term_by_id(db: AsyncSession, term_id: int) -> Term:
+    term = await db.get(Term, term_id)
+    if not term:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Term not found")
+    return term
+
+
+async def create_term(db: AsyncSession, data: TermCreate):
+    if data.start_date >= data.end_date:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Start date must be before end date")
+
+    overlapping = await db.scalar(
+        select(Term.name).where(Term.start_date <= data.end_date, Term.end_date >= data.start_date).limit(1)
+    )
+    if overlapping:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Term overlaps '{overlapping}'"
+        )
+    if await db.scalar(select(Term.id).where(Term.name == data.name)):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Term '{data.name}' already exists")
+
+    term = Term(**data.model_dump())
+    db.add(term)
+    await db.flush()
+    await db.refresh(term)
+    return term
+
+
+async def activate_term(db: AsyncSession, term_id: int):
+    """
+    Make ``term_id`` the current term: new registrations go into it and hot
+    queries read only its registrations. The first activation adopts every
+    row that predates terms.
+    """
+    term = await get_term_by_id(db, term_id)
+    if term.archived_at is not None:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Term is archived")
+
+    previous = await db.scalar(select(Term.id).where(Term.is_current == True))
+    if previous == term.id:
+        return term
+    if previous is None:
+        for model in (ClassRegistration, Subscription):
+            result = await db.execute(
+                update(model).where(model.term_id.is_(None)).values(term_id=term.id)
+                .returning(model)
+                .execution_options(synchronize_session=False, populate_existing=True)
+            )
+            await log_changes(db, result.scalars().all())
+    else:
+        await db.execute(update(Term).where(Term.id == previous).values(is_current=False))
+    await db.flush()  # the partial unique index allows one current term at a time
+    term.is_current = True
+    await db.flush()
+
+    # Every seat count and roster changes meaning
+    class_ids = (await db.execute(select(Class.id))).scalars().all()
+    on_commit(db, forget_current_term)
+    on_commit(db, invalidate_class_cache)
+    on_commit(db, invalidate_class_roster, *class_ids)
+    on_commit(db, bump_class_generation)
+    return term
+
+
+async def check_archivable(db: AsyncSession, term_id: int) -> Term:
+    term = await get_term_by_id(db, term_id)
+    if term.is_current or term.end_date >= date.today():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Only closed terms (ended, not current) can be archived"
+        )
+    return term
+
+
+async def archive_batch(db: AsyncSession, term_id: int, batch_size: int) -> int:
+    """
+    Move up to ``batch_size`` registrations, then inactive subscriptions, of
+    a closed term into the archive tables (INSERT ... SELECT + DELETE).
+    Returns the number of rows moved; 0 once the term is fully archived.
+    Active subscriptions stay hot until they expire or are used up.
+    """
+    now = datetime.now(timezone.utc)
+    moves = (
+        (ClassRegistration, ClassRegistrationArchive, "registration",
+         ClassRegistration.term_id == term_id),
+        (Subscription, SubscriptionArchive, "subscription",
+         and_(Subscription.term_id == term_id, Subscription.is_active == False)),
+    )
+    for model, archive, entity, condition in moves:
+        ids = (await db.execute(
+            select(model.id).where(condition).order_by(model.id).limit(batch_size)
+        )).scalars().all()
+        if not ids:
+            continue
+
+        columns = [column.name for column in model.__table__.columns]
+        await db.execute(
+            insert(archive).from_select(
+                columns + ["archived_at"],
+                select(*model.__table__.columns, literal(now, archive.archived_at.type)).where(model.id.in_(ids)),
+            )
+        )
+        if model is ClassRegistration:
+            class_ids = (await db.execute(
+                delete(model).where(model.id.in_(ids)).returning(model.class_id)
+                .execution_options(synchronize_session=False)
+            )).scalars().all()
+            on_commit(db, invalidate_class_roster, *set(class_ids))
+        else:
+            await db.execute(
+                delete(model).where(model.id.in_(ids)).execution_options(synchronize_session=False)
+            )
+            subscription_cache.invalidate_on_commit(db, ids)
+        await log_removed(db, entity, ids, op="archive")
+        on_commit(db, bump_class_generation)
+        return len(ids)
+    return 0
+
+
+async def mark_archived(db: AsyncSession, term_id: int):
+    await db.execute(update(Term).where(Term.id == term_id).values(archived_at=datetime.now(timezone.utc)))
+
+
+async def get_archived_registrations(
+    db: AsyncSession, term_id: int, student_id: int = None, class_id: int = None, skip: int = 0, limit: int = 100,
+):
+    query = select(ClassRegistrationArchive).where(ClassRegistrationArchive.term_id == term_id)
+    if student_id is not None:
+        query = query.where(ClassRegistrationArchive.student_id == student_id)
+    if class_id is not None:
+        query = query.where(ClassRegistrationArchive.class_id == class_id)
+    result = await db.execute(query.order_by(ClassRegistrationArchive.id).offset(skip).limit(limit))
+    return result.scalars().all()
+
+
+async def get_archived_subscriptions(
+    db: AsyncSession, term_id: int, student_id: int = None, skip: int = 0, limit: int = 100,
+):
+    query = select(SubscriptionArchive).where(SubscriptionArchive.term_id == term_id)
+    if student_id is not None:
+        query = query.where(SubscriptionArchive.student_id == student_id)
+    result = await db.execute(query.order_by(SubscriptionArchive.id).offset(skip).limit(limit))
+    return result.scalars().all()
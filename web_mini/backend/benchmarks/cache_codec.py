@@ -0,0 +1,59 @@
+"""
+Cache payload size and decode time: JSON strings vs the msgpack codec.
+
+Run from backend/:  python -m benchmarks.cache_codec [classes]
+"""
+import json
+import sys
+import timeit
+from datetime import time
+
+from app.db.cache import encode, decode
+
+SUBJECTS = ["Toán", "Ngữ văn", "Tiếng Anh", "Vật lý", "Hóa học", "Sinh học", "Tin học"]
+
+
+def build_catalog(size: int) -> list[dict]:
+    """Catalog entries shaped like ``class_service.get_all_classes``."""
+    return [
+        {
+            "id": i,
+            "name": f"{SUBJECTS[i % len(SUBJECTS)]} lớp {i % 12 + 1} - nhóm {i}",
+            "subject": SUBJECTS[i % len(SUBJECTS)],
+            "teacher_name": f"Giáo viên {i % 150}",
+            "day_of_week": i % 7,
+            "time_slot_start": time(7 + i % 12, 0).isoformat(),
+            "time_slot_end": time(8 + i % 12, 30).isoformat(),
+            "max_students": 30,
+            "rush_mode": i % 50 == 0,
+            "current_students": i % 31,
+        }
+        for i in range(1, size + 1)
+    ]
+
+
+def main(size: int = 2000, repeat: int = 200):
+    catalog = build_catalog(size)
+    variants = {
+        "json (current)": (
+            lambda: json.dumps(catalog).encode(),
+            lambda payload: json.loads(payload),
+        ),
+    }
+    for compression in ("none", "zstd", "lz4"):
+        variants[f"msgpack + {compression}"] = (
+            lambda c=compression: encode(catalog, compression=c),
+            lambda payload: decode(payload),
+        )
+
+    print(f"{size} classes, {repeat} decodes per variant")
+    print(f"{'variant':<20} {'bytes':>10} {'decode ms':>10}")
+    for name, (dump, load) in variants.items():
+        payload = dump()
+        assert load(payload) == catalog
+        seconds = timeit.timeit(lambda: load(payload), number=repeat) / repeat
+        print(f"{name:<20} {len(payload):>10} {seconds * 1000:>10.3f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,243 @@
+"""
+Fixtures for the service microbenchmarks.
+
+Runs against a throwaway SQLite file by default; point BENCH_DATABASE_URL at
+an empty Postgres database to benchmark the real engine (its tables are
+dropped and recreated). Redis is an in-memory fakeredis server, or an
+unreachable address for the "Redis down" cases.
+
+    pytest benchmarks                                # all dataset sizes
+    BENCH_SIZES=500 pytest benchmarks -k register    # one size, one path
+    pytest benchmarks --benchmark-autosave           # save the baseline later runs must not regress from
+"""
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+from dataclasses import dataclass
+from datetime import date, time, timedelta
+
+import pytest
+from pytest_benchmark.logger import Logger
+from pytest_benchmark.utils import get_machine_id, load_storage
+
+# Settings are read at import time: configure before importing the app
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCH_DATABASE_URL",
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "mini_lms_bench.db"),
+)
+os.environ["JOB_QUEUE_BACKEND"] = "memory"
+os.environ["DEBUG"] = "false"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import fakeredis  # noqa: E402
+import redis.asyncio as aioredis  # noqa: E402
+from sqlalchemy import event, insert  # noqa: E402
+
+from app.core.text import normalize_search_text  # noqa: E402
+from app.core.config import get_settings  # noqa: E402
+from app.db.circuit_breaker import CircuitBreaker  # noqa: E402
+from app.db.redis import BreakerRedis  # noqa: E402
+from app.db.database import engine, Base, async_session  # noqa: E402
+from app.models import Parent, Student, Class, ClassRegistration, Subscription  # noqa: E402
+import app.main  # noqa: E402,F401  (imports every router, service and model)
+from app.services.term_scope import get_current_term_id, forget_current_term  # noqa: E402
+
+settings = get_settings()
+
+SIZES = [int(size) for size in os.environ.get("BENCH_SIZES", "500,5000").split(",")]
+
+CLASSES_PER_STUDENT = 3
+STUDENTS_PER_CLASS = 10  # dataset has size / 10 classes
+FREE_STUDENT_SHARE = 0.2  # students with no registration (registration benchmarks)
+
+
+@dataclass
+class Dataset:
+    size: int
+    classes: int
+    free_student_id: int  # no registrations
+    busy_student_id: int  # CLASSES_PER_STUDENT registrations
+    open_class_id: int  # has free seats
+    subscription_id: int  # active, plenty of sessions left
+
+
+def pytest_configure(config):
+    # pytest.ini compares every run with the latest saved one; until a run is saved there is nothing to compare with
+    if not config.getoption("benchmark_compare", None):
+        return
+    storage = load_storage(
+        config.getoption("benchmark_storage"),
+        logger=Logger(Logger.QUIET, config=config),
+        default_machine_id=get_machine_id(),
+        netrc=config.getoption("benchmark_netrc"),
+    )
+    if not storage.query():
+        config.option.benchmark_compare = False
+        config.option.benchmark_compare_fail = None
+
+
+@pytest.fixture(scope="session")
+def run():
+    """Run a coroutine on the benchmark event loop (one loop for the whole session)."""
+    loop = asyncio.new_event_loop()
+    yield loop.run_until_complete
+    loop.run_until_complete(engine.dispose())
+    loop.close()
+
+
+# --- Redis stand-ins -------------------------------------------------------
+
+def _swap_redis(text_client, binary_client) -> dict:
+    """Point every ``redis_client`` / ``cache_client`` imported by the app at new clients."""
+    replacements = {"redis_client": text_client, "cache_client": binary_client}
+    previous = {}
+    for name, module in list(sys.modules.items()):
+        if name != "app" and not name.startswith("app."):
+            continue
+        for attr, client in replacements.items():
+            if hasattr(module, attr):
+                previous[(name, attr)] = getattr(module, attr)
+                setattr(module, attr, client)
+    return previous
+
+
+def _restore_redis(previous: dict):
+    for (name, attr), client in previous.items():
+        setattr(sys.modules[name], attr, client)
+
+
+@pytest.fixture(scope="session", autouse=True)
+def fake_redis():
+    server = fakeredis.FakeServer()
+    text = fakeredis.FakeAsyncRedis(server=server, decode_responses=True)
+    binary = fakeredis.FakeAsyncRedis(server=server, decode_responses=False)
+    previous = _swap_redis(text, binary)
+    yield text
+    _restore_redis(previous)
+
+
+def _breaker_cache_client(port: int) -> BreakerRedis:
+    """Cache client configured like production (short timeouts + circuit breaker)."""
+    breaker = CircuitBreaker(
+        "bench", failure_threshold=settings.CACHE_BREAKER_FAILURE_THRESHOLD, cooldown=settings.CACHE_BREAKER_COOLDOWN,
+    )
+    return BreakerRedis(
+        breaker, host="127.0.0.1", port=port,
+        socket_timeout=settings.CACHE_SOCKET_TIMEOUT, socket_connect_timeout=settings.CACHE_SOCKET_CONNECT_TIMEOUT,
+    )
+
+
+@pytest.fixture
+def redis_down(fake_redis):
+    """Clients pointing at a closed port: every call fails fast with a connection error."""
+    kwargs = {"host": "127.0.0.1", "port": 1, "socket_connect_timeout": 0.05}
+    previous = _swap_redis(aioredis.Redis(decode_responses=True, **kwargs), _breaker_cache_client(port=1))
+    yield
+    _restore_redis(previous)
+
+
+@pytest.fixture
+def redis_hung(fake_redis):
+    """Cache client pointing at a socket that accepts connections and never answers."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(64)  # the kernel completes handshakes; nothing ever reads or replies
+    client = _breaker_cache_client(port=server.getsockname()[1])
+    previous = _swap_redis(fake_redis, client)
+    yield client.breaker
+    _restore_redis(previous)
+    server.close()
+
+
+# --- Datasets ---------------------------------------------------------------
+
+async def _build_dataset(size: int) -> Dataset:
+    n_classes = max(size // STUDENTS_PER_CLASS, 14)
+    n_parents = max(size // 2, 1)
+    registered = int(size * (1 - FREE_STUDENT_SHARE))
+    today = date.today()
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+        await conn.execute(insert(Parent), [
+            {"id": i, "name": f"Phụ huynh {i}", "phone": f"09{i:08d}", "email": f"ph{i}@example.com",
+             "search_text": normalize_search_text(f"Phụ huynh {i}", f"ph{i}@example.com")}
+            for i in range(1, n_parents + 1)
+        ])
+        await conn.execute(insert(Student), [
+            {"id": i, "name": f"Học sinh {i}", "current_grade": i % 12 + 1, "parent_id": i % n_parents + 1,
+             "search_text": normalize_search_text(f"Học sinh {i}")}
+            for i in range(1, size + 1)
+        ])
+        # Class i: day i % 7, one-hour slot; consecutive ids never share a day
+        await conn.execute(insert(Class), [
+            {"id": i, "name": f"Lớp {i}", "subject": f"Môn {i % 9}", "teacher_name": f"Giáo viên {i}",
+             "teacher_key": normalize_search_text(f"Giáo viên {i}"), "day_of_week": i % 7,
+             "time_slot_start": time(7 + (i // 7) % 12), "time_slot_end": time(8 + (i // 7) % 12),
+             "max_students": STUDENTS_PER_CLASS * CLASSES_PER_STUDENT * 2, "rush_mode": False,
+             "search_text": normalize_search_text(f"Lớp {i}", f"Môn {i % 9}", f"Giáo viên {i}")}
+            for i in range(1, n_classes + 1)
+        ])
+        await conn.execute(insert(ClassRegistration), [
+            {"student_id": s, "class_id": (s * CLASSES_PER_STUDENT + k) % n_classes + 1}
+            for s in range(1, registered + 1)
+            for k in range(CLASSES_PER_STUDENT)
+        ])
+        await conn.execute(insert(Subscription), [
+            {"student_id": s, "package_name": f"Gói {s % 4}", "total_sessions": 1000, "used_sessions": s % 20,
+             "start_date": today - timedelta(days=30), "end_date": today + timedelta(days=60), "is_active": True}
+            for s in range(1, size + 1)
+        ])
+
+    forget_current_term()
+
+    return Dataset(
+        size=size,
+        classes=n_classes,
+        free_student_id=size,
+        busy_student_id=1,
+        open_class_id=n_classes,
+        subscription_id=1,
+    )
+
+
+@pytest.fixture(scope="session", params=SIZES, ids=lambda size: f"size={size}")
+def dataset(request, run) -> Dataset:
+    return run(_build_dataset(request.param))
+
+
+# --- Query counting ---------------------------------------------------------
+
+@pytest.fixture(scope="session")
+def count_queries(run):
+    """
+    ``count_queries(coro_fn)`` -> number of SQL statements one call executes.
+    ``term_cached=False`` counts it with the current-term cache cold.
+    """
+    statements = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, "before_cursor_execute", on_execute)
+
+    async def warm_caches():
+        # Steady state: the current term is cached per process, not looked up per call
+        async with async_session() as db:
+            await get_current_term_id(db)
+
+    def count(coro_fn, term_cached: bool = True) -> int:
+        run(warm_caches())
+        if not term_cached:
+            forget_current_term()
+        statements.clear()
+        run(coro_fn())
+        return len(statements)
+
+    yield count
+    event.remove(engine.sync_engine, "before_cursor_execute", on_execute)
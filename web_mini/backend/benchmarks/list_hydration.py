@@ -0,0 +1,112 @@
+"""
+List read paths: full ORM hydration vs column-only rows (``app/db/rows.py``).
+
+For each list service, times a page fetch + response validation/serialization
+(what FastAPI does with the result) and measures the peak Python memory
+allocated while doing it, per row. "orm" is the previous query (whole entity,
+relationship eager load); "rows" is the current service.
+
+Run from backend/:  python -m benchmarks.list_hydration [rows]
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+os.environ["DATABASE_URL"] = os.environ.get(
+    "BENCH_DATABASE_URL",
+    "sqlite+aiosqlite:///" + os.path.join(tempfile.gettempdir(), "mini_lms_hydration.db"),
+)
+os.environ["DEBUG"] = "false"
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import insert, select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.core.text import normalize_search_text  # noqa: E402
+from app.db.database import engine, Base, async_session  # noqa: E402
+from app.models import Parent, Student, Subscription  # noqa: E402
+from app.schemas.parent import ParentResponse  # noqa: E402
+from app.schemas.student import StudentResponse  # noqa: E402
+from app.schemas.subscription import SubscriptionResponse  # noqa: E402
+from app.services import parent_service, student_service, subscription_service  # noqa: E402
+
+REPEAT = 5
+
+
+async def build(size: int):
+    today = date.today()
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(insert(Parent), [
+            {"id": i, "name": f"Phụ huynh {i}", "phone": f"09{i:08d}", "email": f"ph{i}@example.com",
+             "search_text": normalize_search_text(f"Phụ huynh {i}", f"ph{i}@example.com")}
+            for i in range(1, size + 1)
+        ])
+        await conn.execute(insert(Student), [
+            {"id": i, "name": f"Học sinh {i}", "dob": today - timedelta(days=3650 + i % 2000), "gender": "Nam",
+             "current_grade": i % 12 + 1, "parent_id": i, "search_text": normalize_search_text(f"Học sinh {i}")}
+            for i in range(1, size + 1)
+        ])
+        await conn.execute(insert(Subscription), [
+            {"student_id": i, "package_name": f"Gói {i % 4}", "total_sessions": 40, "used_sessions": i % 40,
+             "start_date": today - timedelta(days=30), "end_date": today + timedelta(days=60), "is_active": True}
+            for i in range(1, size + 1)
+        ])
+
+
+def _orm_query(model, size: int):
+    query = select(model)
+    if model is Student:
+        query = query.options(selectinload(Student.parent))
+    elif model is Parent:
+        query = query.options(selectinload(Parent.students))
+    return lambda db: _scalars(db, query.order_by(model.id).limit(size))
+
+
+async def _scalars(db, query):
+    return (await db.execute(query)).scalars().all()
+
+
+async def measure(fetch, adapter: TypeAdapter) -> tuple[float, int]:
+    """(seconds, peak bytes) for fetch + validate + JSON dump of one page."""
+    best = float("inf")
+    for _ in range(REPEAT):
+        async with async_session() as db:
+            start = time.perf_counter()
+            adapter.dump_json(adapter.validate_python(await fetch(db)))
+            best = min(best, time.perf_counter() - start)
+
+    async with async_session() as db:
+        tracemalloc.start()
+        adapter.dump_json(adapter.validate_python(await fetch(db)))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+async def main(size: int):
+    await build(size)
+    cases = {
+        "students": (Student, StudentResponse, lambda db: student_service.get_all_students(db, 0, size)),
+        "parents": (Parent, ParentResponse, lambda db: parent_service.get_all_parents(db, 0, size)),
+        "subscriptions": (
+            Subscription, SubscriptionResponse, lambda db: subscription_service.get_all_subscriptions(db, 0, size),
+        ),
+    }
+    print(f"{size}-row pages, best of {REPEAT} (fetch + validate + JSON)")
+    print(f"{'list':<15} {'path':<5} {'us/row':>8} {'KiB peak':>10} {'B/row':>8}")
+    for name, (model, schema, rows_fetch) in cases.items():
+        adapter = TypeAdapter(list[schema])
+        for path, fetch in (("orm", _orm_query(model, size)), ("rows", rows_fetch)):
+            seconds, peak = await measure(fetch, adapter)
+            print(f"{name:<15} {path:<5} {seconds / size * 1e6:>8.1f} {peak / 1024:>10.0f} {peak / size:>8.0f}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(int(sys.argv[1]) if len(sys.argv) > 1 else 10000))
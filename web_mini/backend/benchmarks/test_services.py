@@ -0,0 +1,179 @@
+"""
+Hot-path service benchmarks.
+
+Every benchmark records ``queries`` (SQL statements per call) in the report's
+extra info and fails when a call issues more statements than its budget.
+Write paths run inside a transaction that is rolled back, so the dataset is
+identical for every round.
+
+Timing regressions: once a baseline is saved, every run is compared with it
+and fails when a benchmark's min time is 25% slower (``pytest.ini``)::
+
+    pytest benchmarks --benchmark-autosave
+    pytest benchmarks
+"""
+from app.api.dashboard import get_dashboard_stats
+from app.db.database import async_session
+from app.schemas.class_schema import SlotSuggestionRequest
+from app.services import class_service, parent_service, registration_service, slot_service, subscription_service
+from app.services.term_scope import forget_current_term
+
+# Max SQL statements per call; raise only with a reason
+# (+1 on writes: the change-log INSERT issued by each flush)
+QUERY_BUDGET = {
+    "register_student_to_class": 9,  # + seat version bump (class row lock, live seat order)
+    "check_schedule_overlap": 1,
+    "get_all_classes_hit": 0,
+    "get_all_classes_miss": 1,
+    "use_session": 5,
+    "check_in": 3,  # one student or a whole class: UPDATE ... RETURNING, parent ids, change log
+    "get_dashboard_stats": 6,
+    "suggest_slots": 3,  # candidates, their registrations, the teacher's classes
+    "get_parent_overview_miss": 4,  # parent, students, classes, subscriptions; even with a cold term cache
+}
+
+
+def _check_budget(benchmark, name: str, queries: int):
+    benchmark.extra_info["queries"] = queries
+    assert queries <= QUERY_BUDGET[name], f"{name}: {queries} queries per call (budget {QUERY_BUDGET[name]})"
+
+
+async def _register(dataset):
+    async with async_session() as db:
+        await registration_service.register_student_to_class(db, dataset.open_class_id, dataset.free_student_id)
+        await db.rollback()
+
+
+async def _check_overlap(dataset):
+    async with async_session() as db:
+        # Busy student (id 1) is in classes 4..6 (days 4-6); class 1 is on day 1: no overlap, full scan
+        target = await db.get(registration_service.Class, 1)
+        await registration_service.check_schedule_overlap(db, dataset.busy_student_id, target)
+
+
+async def _list_classes():
+    async with async_session() as db:
+        return await class_service.get_all_classes(db)
+
+
+async def _use_session(dataset):
+    async with async_session() as db:
+        await subscription_service.use_session(db, dataset.subscription_id)
+        await db.rollback()
+
+
+async def _suggest_slots(dataset):
+    # Every student of the dataset is a candidate
+    data = SlotSuggestionRequest(
+        student_ids=list(range(1, dataset.size + 1)), teacher_name="Giáo viên 1", duration_minutes=90,
+    )
+    async with async_session() as db:
+        return await slot_service.suggest_slots(db, data)
+
+
+async def _check_in(student_ids):
+    async with async_session() as db:
+        subs = await subscription_service.check_in_students(db, student_ids)
+        await db.rollback()
+        return subs
+
+
+async def _parent_overview(dataset):
+    async with async_session() as db:
+        return await parent_service.get_parent_overview(db, dataset.busy_student_id + 1)
+
+
+def _forget_overview(dataset):
+    forget_current_term()
+    return parent_service.invalidate_parent_overview(dataset.busy_student_id + 1)
+
+
+async def _dashboard():
+    async with async_session() as db:
+        return await get_dashboard_stats(db=db)
+
+
+def test_register_student_to_class(benchmark, run, dataset, count_queries):
+    _check_budget(benchmark, "register_student_to_class", count_queries(lambda: _register(dataset)))
+    benchmark(lambda: run(_register(dataset)))
+
+
+def test_check_schedule_overlap(benchmark, run, dataset, count_queries):
+    # The class lookup is part of the helper coroutine; budget the overlap query alone
+    queries = count_queries(lambda: _check_overlap(dataset)) - 1
+    _check_budget(benchmark, "check_schedule_overlap", queries)
+    benchmark(lambda: run(_check_overlap(dataset)))
+
+
+def test_get_all_classes_cache_hit(benchmark, run, dataset, count_queries):
+    run(class_service.invalidate_class_cache())
+    run(_list_classes())  # warm
+    _check_budget(benchmark, "get_all_classes_hit", count_queries(_list_classes))
+    result = benchmark(lambda: run(_list_classes()))
+    assert len(result) == min(dataset.classes, 100)
+
+
+def test_get_all_classes_cache_miss(benchmark, run, dataset, count_queries):
+    run(class_service.invalidate_class_cache())
+    _check_budget(benchmark, "get_all_classes_miss", count_queries(_list_classes))
+    benchmark.pedantic(
+        lambda: run(_list_classes()),
+        setup=lambda: run(class_service.invalidate_class_cache()),
+        rounds=50,
+    )
+
+
+def test_get_all_classes_redis_down(benchmark, run, dataset, count_queries, redis_down):
+    _check_budget(benchmark, "get_all_classes_miss", count_queries(_list_classes))
+    result = benchmark(lambda: run(_list_classes()))
+    assert len(result) == min(dataset.classes, 100)
+
+
+def test_get_all_classes_redis_hung(benchmark, run, dataset, count_queries, redis_hung):
+    # The first calls wait out the socket timeout and open the circuit; the rest fail fast
+    for _ in range(redis_hung.failure_threshold):
+        run(_list_classes())
+    assert redis_hung.state == "open"
+    _check_budget(benchmark, "get_all_classes_miss", count_queries(_list_classes))
+    result = benchmark(lambda: run(_list_classes()))
+    assert len(result) == min(dataset.classes, 100)
+
+
+def test_use_session(benchmark, run, dataset, count_queries):
+    _check_budget(benchmark, "use_session", count_queries(lambda: _use_session(dataset)))
+    benchmark(lambda: run(_use_session(dataset)))
+
+
+def test_check_in_student(benchmark, run, dataset, count_queries):
+    _check_budget(benchmark, "check_in", count_queries(lambda: _check_in([dataset.busy_student_id])))
+    benchmark(lambda: run(_check_in([dataset.busy_student_id])))
+
+
+def test_check_in_class(benchmark, run, dataset, count_queries):
+    student_ids = list(range(1, 31))
+    _check_budget(benchmark, "check_in", count_queries(lambda: _check_in(student_ids)))
+    subs = benchmark(lambda: run(_check_in(student_ids)))
+    assert len(subs) == len(student_ids)
+
+
+def test_get_parent_overview_cold_term(benchmark, run, dataset, count_queries):
+    run(_forget_overview(dataset))
+    queries = count_queries(lambda: _parent_overview(dataset), term_cached=False)
+    _check_budget(benchmark, "get_parent_overview_miss", queries)
+    overview = benchmark.pedantic(
+        lambda: run(_parent_overview(dataset)), setup=lambda: run(_forget_overview(dataset)), rounds=50,
+    )
+    assert overview["students"] and all(student["classes"] for student in overview["students"])
+
+
+def test_get_dashboard_stats(benchmark, run, dataset, count_queries):
+    _check_budget(benchmark, "get_dashboard_stats", count_queries(_dashboard))
+    stats = benchmark(lambda: run(_dashboard()))
+    assert stats["total_students"] == dataset.size
+
+
+def test_suggest_slots(benchmark, run, dataset, count_queries):
+    _check_budget(benchmark, "suggest_slots", count_queries(lambda: _suggest_slots(dataset)))
+    result = benchmark(lambda: run(_suggest_slots(dataset)))
+    assert result["candidates"] == dataset.size
+    assert len(result["suggestions"]) == 5
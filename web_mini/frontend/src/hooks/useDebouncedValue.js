@@ -0,0 +1,13 @@
+import { useEffect, useState } from 'react'
+
+// Returns `value` once it has stopped changing for `delay` ms (search-as-you-type)
+export default function useDebouncedValue(value, delay = 300) {
+  const [debounced, setDebounced] = useState(value)
+
+  useEffect(() => {
+    const timer = setTimeout(() => setDebounced(value), delay)
+    return () => clearTimeout(timer)
+  }, [value, delay])
+
+  return debounced
+}
@@ -0,0 +1,55 @@
+import { useEffect, useState } from 'react'
+import { useQueryClient } from '@tanstack/react-query'
+
+// seats: { [classId]: { registered, version } }. A state only replaces what the
+// list holds if it is newer, so duplicates and stale events are ignored.
+const applySeats = (seats) => (classes) =>
+  Array.isArray(classes)
+    ? classes.map(c => {
+      const state = seats[c.id]
+      return state && state.version > (c.seat_version ?? 0)
+        ? { ...c, current_students: state.registered, seat_version: state.version }
+        : c
+    })
+    : classes
+
+// Keeps every cached ['classes', ...] list's seat counts live over SSE instead of refetching.
+// Returns true while the stream is connected.
+export default function useSeatStream() {
+  const queryClient = useQueryClient()
+  const [live, setLive] = useState(false)
+
+  useEffect(() => {
+    const source = new EventSource('/api/classes/seats/stream')
+    // Newest state seen per class, re-applied over a refetch that started before it
+    const latest = {}
+    const resync = () => queryClient.invalidateQueries({ queryKey: ['classes'] })
+
+    // (Re)connected or told updates were lost: refetch once, then apply updates
+    source.onopen = () => {
+      setLive(true)
+      resync()
+    }
+    source.onerror = () => setLive(false)
+    source.addEventListener('resync', resync)
+    source.addEventListener('seats', (event) => {
+      for (const [classId, state] of Object.entries(JSON.parse(event.data))) {
+        if (!latest[classId] || state.version > latest[classId].version) latest[classId] = state
+      }
+      queryClient.setQueriesData({ queryKey: ['classes'] }, applySeats(latest))
+    })
+    // Fetched (not manually set, which would loop) class lists
+    const unsubscribe = queryClient.getQueryCache().subscribe((event) => {
+      const { type, action, query } = event
+      if (type === 'updated' && action.type === 'success' && !action.manual && query.queryKey[0] === 'classes') {
+        queryClient.setQueryData(query.queryKey, applySeats(latest))
+      }
+    })
+    return () => {
+      unsubscribe()
+      source.close()
+    }
+  }, [queryClient])
+
+  return live
+}
@@ -1,12 +1,14 @@
 import { useState } from 'react'
 import {
-  Table, Button, Modal, Form, Input, InputNumber, Select, TimePicker,
+  Table, Button, Modal, Form, Input, InputNumber, Select, TimePicker, Switch,
   Space, Card, Typography, Popconfirm, message, Tag, Tabs, Progress, Tooltip, Row, Col,
 } from 'antd'
 import { PlusOutlined, EditOutlined, DeleteOutlined, SearchOutlined, UnorderedListOutlined, CalendarOutlined } from '@ant-design/icons'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import dayjs from 'dayjs'
 import { classApi } from '../services/api'
+import useDebouncedValue from '../hooks/useDebouncedValue'
+import useSeatStream from '../hooks/useSeatStream'
 import React from 'react'
 
 const dayOptions = [
@@ -112,11 +114,21 @@ export default function ClassesPage() {
   const [form] = Form.useForm()
   const queryClient = useQueryClient()
 
+  const search = useDebouncedValue(searchText.trim())
+  useSeatStream()
+
   const { data: classes = [], isLoading } = useQuery({
     queryKey: ['classes'],
     queryFn: () => classApi.getAll(),
   })
 
+  // The table searches server-side; the timetable always shows the full catalog
+  const { data: searchResults = [], isFetching: isSearching } = useQuery({
+    queryKey: ['classes', 'search', search],
+    queryFn: () => classApi.getAll(0, 100, search),
+    enabled: !!search,
+  })
+
   const createMutation = useMutation({
     mutationFn: classApi.create,
     onSuccess: () => {
@@ -184,17 +196,18 @@ export default function ClassesPage() {
     }
   }
 
-  const filteredClasses = classes.filter(c =>
-    c.name?.toLowerCase().includes(searchText.toLowerCase()) ||
-    c.subject?.toLowerCase().includes(searchText.toLowerCase()) ||
-    c.teacher_name?.toLowerCase().includes(searchText.toLowerCase())
-  )
+  const filteredClasses = search ? searchResults : classes
 
   const columns = [
     { title: 'ID', dataIndex: 'id', key: 'id', width: 50, align: 'center' },
     {
       title: 'Tên lớp', dataIndex: 'name', key: 'name', ellipsis: true,
-      render: (name) => <Typography.Text strong>{name}</Typography.Text>,
+      render: (name, r) => (
+        <Space>
+          <Typography.Text strong>{name}</Typography.Text>
+          {r.rush_mode && <Tag color="volcano">Rush</Tag>}
+        </Space>
+      ),
     },
     {
       title: 'Môn học', dataIndex: 'subject', key: 'subject', width: 120,
@@ -283,7 +296,7 @@ export default function ClassesPage() {
                   columns={columns}
                   dataSource={filteredClasses}
                   rowKey="id"
-                  loading={isLoading}
+                  loading={isLoading || isSearching}
                   pagination={{ pageSize: 10, showTotal: (total) => `Tổng: ${total} lớp` }}
                   size="middle"
                 />
@@ -322,6 +335,15 @@ export default function ClassesPage() {
               </Form.Item>
             </Col>
           </Row>
+          <Form.Item
+            name="rush_mode"
+            label="Đăng ký xếp hàng (rush mode)"
+            valuePropName="checked"
+            initialValue={false}
+            tooltip="Dùng cho lớp hết chỗ trong vài giây: yêu cầu đăng ký được xếp hàng và xử lý lần lượt"
+          >
+            <Switch />
+          </Form.Item>
           <Row gutter={16}>
             <Col span={12}>
               <Form.Item name="subject" label="Môn học" rules={[{ required: true, message: 'Vui lòng nhập môn học!' }]}>
@@ -5,6 +5,7 @@ import {
 import { PlusOutlined, EditOutlined, DeleteOutlined, PhoneOutlined, MailOutlined, SearchOutlined } from '@ant-design/icons'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { parentApi } from '../services/api'
+import useDebouncedValue from '../hooks/useDebouncedValue'
 
 export default function ParentsPage() {
   const [isModalOpen, setIsModalOpen] = useState(false)
@@ -12,10 +13,12 @@ export default function ParentsPage() {
   const [searchText, setSearchText] = useState('')
   const [form] = Form.useForm()
   const queryClient = useQueryClient()
+  const search = useDebouncedValue(searchText.trim())
 
+  // Filtering happens server-side (name, email, phone prefix)
   const { data: parents = [], isLoading } = useQuery({
-    queryKey: ['parents'],
-    queryFn: () => parentApi.getAll(),
+    queryKey: ['parents', search],
+    queryFn: () => parentApi.getAll(0, 100, search),
   })
 
   const createMutation = useMutation({
@@ -74,12 +77,6 @@ export default function ParentsPage() {
     }
   }
 
-  const filteredParents = parents.filter(p =>
-    p.name?.toLowerCase().includes(searchText.toLowerCase()) ||
-    p.phone?.includes(searchText) ||
-    p.email?.toLowerCase().includes(searchText.toLowerCase())
-  )
-
   const columns = [
     { title: 'ID', dataIndex: 'id', key: 'id', width: 60, align: 'center' },
     {
@@ -155,7 +152,7 @@ export default function ParentsPage() {
       >
         <Table
           columns={columns}
-          dataSource={filteredParents}
+          dataSource={parents}
           rowKey="id"
           loading={isLoading}
           pagination={{ pageSize: 10, showSizeChanger: true, showTotal: (total) => `Tổng: ${total} phụ huynh` }}
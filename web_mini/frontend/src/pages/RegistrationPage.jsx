@@ -5,6 +5,7 @@ import {
 import { CheckCircleOutlined, CloseCircleOutlined } from '@ant-design/icons'
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import { studentApi, classApi } from '../services/api'
+import useSeatStream from '../hooks/useSeatStream'
 
 const dayLabels = ['CN', 'T2', 'T3', 'T4', 'T5', 'T6', 'T7']
 
@@ -12,7 +13,11 @@ export default function RegistrationPage() {
   const [selectedStudent, setSelectedStudent] = useState(null)
   const [selectedClass, setSelectedClass] = useState(null)
   const [error, setError] = useState(null)
+  const [rosterPage, setRosterPage] = useState(1)
+  const rosterPageSize = 20
   const queryClient = useQueryClient()
+  // Seat counts arrive over SSE; refetch the catalog only when the stream is down
+  const seatsLive = useSeatStream()
 
   const { data: students = [] } = useQuery({
     queryKey: ['students'],
@@ -25,18 +30,22 @@ export default function RegistrationPage() {
   })
 
   // Get students for a selected class
-  const { data: classStudents = [], isLoading: loadingClassStudents } = useQuery({
-    queryKey: ['class-students', selectedClass],
-    queryFn: () => classApi.getStudents(selectedClass),
+  const { data: classStudents = { items: [], total: 0 }, isLoading: loadingClassStudents } = useQuery({
+    queryKey: ['class-students', selectedClass, rosterPage],
+    queryFn: () => classApi.getStudents(selectedClass, (rosterPage - 1) * rosterPageSize, rosterPageSize),
+    placeholderData: (previous) => previous,
     enabled: !!selectedClass,
   })
 
   const registerMutation = useMutation({
-    mutationFn: ({ classId, studentId }) => classApi.register(classId, studentId),
+    mutationFn: async ({ classId, studentId }) => {
+      const result = await classApi.register(classId, studentId)
+      return result.ticket_id ? classApi.waitForTicket(classId, result.ticket_id) : result
+    },
     onSuccess: () => {
       message.success('Dang ky thanh cong!')
       setError(null)
-      queryClient.invalidateQueries({ queryKey: ['classes'] })
+      if (!seatsLive) queryClient.invalidateQueries({ queryKey: ['classes'] })
       queryClient.invalidateQueries({ queryKey: ['class-students'] })
       queryClient.invalidateQueries({ queryKey: ['dashboard-stats'] })
     },
@@ -50,7 +59,7 @@ export default function RegistrationPage() {
     mutationFn: ({ classId, studentId }) => classApi.unregister(classId, studentId),
     onSuccess: () => {
       message.success('Huy dang ky thanh cong!')
-      queryClient.invalidateQueries({ queryKey: ['classes'] })
+      if (!seatsLive) queryClient.invalidateQueries({ queryKey: ['classes'] })
       queryClient.invalidateQueries({ queryKey: ['class-students'] })
     },
     onError: (err) => message.error(err.message),
@@ -118,7 +127,7 @@ export default function RegistrationPage() {
                   showSearch
                   optionFilterProp="label"
                   value={selectedClass}
-                  onChange={(v) => { setSelectedClass(v); setError(null); }}
+                  onChange={(v) => { setSelectedClass(v); setRosterPage(1); setError(null); }}
                   options={classes.map(c => ({
                     value: c.id,
                     label: `${c.name} - ${dayLabels[c.day_of_week]} ${c.time_slot_start?.slice(0, 5)}-${c.time_slot_end?.slice(0, 5)} (${c.current_students}/${c.max_students})`,
@@ -175,10 +184,16 @@ export default function RegistrationPage() {
             {selectedClass ? (
               <Table
                 columns={classStudentColumns}
-                dataSource={classStudents}
+                dataSource={classStudents.items}
                 rowKey="id"
                 loading={loadingClassStudents}
-                pagination={false}
+                pagination={{
+                  current: rosterPage,
+                  pageSize: rosterPageSize,
+                  total: classStudents.total,
+                  onChange: setRosterPage,
+                  hideOnSinglePage: true,
+                }}
                 size="small"
               />
             ) : (
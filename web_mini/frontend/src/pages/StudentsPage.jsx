@@ -7,6 +7,7 @@ import { PlusOutlined, EditOutlined, DeleteOutlined, SearchOutlined } from '@ant
 import { useQuery, useMutation, useQueryClient } from '@tanstack/react-query'
 import dayjs from 'dayjs'
 import { studentApi, parentApi } from '../services/api'
+import useDebouncedValue from '../hooks/useDebouncedValue'
 
 const genderOptions = [
   { value: 'Male', label: 'Nam' },
@@ -23,10 +24,12 @@ export default function StudentsPage() {
   const [searchText, setSearchText] = useState('')
   const [form] = Form.useForm()
   const queryClient = useQueryClient()
+  const search = useDebouncedValue(searchText.trim())
 
+  // Filtering happens server-side (accent-insensitive, ranked)
   const { data: students = [], isLoading } = useQuery({
-    queryKey: ['students'],
-    queryFn: () => studentApi.getAll(),
+    queryKey: ['students', search],
+    queryFn: () => studentApi.getAll(0, 100, search),
   })
 
   const { data: parents = [] } = useQuery({
@@ -99,10 +102,6 @@ export default function StudentsPage() {
     }
   }
 
-  const filteredStudents = students.filter(s =>
-    s.name?.toLowerCase().includes(searchText.toLowerCase())
-  )
-
   const calcAge = (dob) => {
     if (!dob) return null
     const years = dayjs().diff(dayjs(dob), 'year')
@@ -194,7 +193,7 @@ export default function StudentsPage() {
       >
         <Table
           columns={columns}
-          dataSource={filteredStudents}
+          dataSource={students}
           rowKey="id"
           loading={isLoading}
           pagination={{ pageSize: 10, showSizeChanger: true, showTotal: (total) => `Tổng: ${total} học sinh` }}
@@ -18,6 +18,21 @@ api.interceptors.response.use(
   }
 )
 
+// Writes that must not run twice (registration, session usage): one Idempotency-Key per
+// call, reused when a network error or an in-flight duplicate (409) forces a retry
+const idempotent = async (send, retries = 2, delayMs = 1000) => {
+  const headers = { 'Idempotency-Key': crypto.randomUUID() }
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await send({ headers })
+    } catch (error) {
+      const retryable = error.status === undefined || error.status === 409
+      if (!retryable || attempt >= retries) throw error
+      await new Promise(resolve => setTimeout(resolve, delayMs))
+    }
+  }
+}
+
 // ========== Dashboard ==========
 export const dashboardApi = {
   getStats: () => api.get('/dashboard/stats').then(res => res.data),
@@ -25,8 +40,8 @@ export const dashboardApi = {
 
 // ========== Parents ==========
 export const parentApi = {
-  getAll: (skip = 0, limit = 100) =>
-    api.get('/parents/', { params: { skip, limit } }).then(res => res.data),
+  getAll: (skip = 0, limit = 100, q = '') =>
+    api.get('/parents/', { params: { skip, limit, q: q || undefined } }).then(res => res.data),
   getById: (id) => api.get(`/parents/${id}`).then(res => res.data),
   create: (data) => api.post('/parents/', data).then(res => res.data),
   update: (id, data) => api.put(`/parents/${id}`, data).then(res => res.data),
@@ -35,8 +50,8 @@ export const parentApi = {
 
 // ========== Students ==========
 export const studentApi = {
-  getAll: (skip = 0, limit = 100) =>
-    api.get('/students/', { params: { skip, limit } }).then(res => res.data),
+  getAll: (skip = 0, limit = 100, q = '') =>
+    api.get('/students/', { params: { skip, limit, q: q || undefined } }).then(res => res.data),
   getById: (id) => api.get(`/students/${id}`).then(res => res.data),
   create: (data) => api.post('/students/', data).then(res => res.data),
   update: (id, data) => api.put(`/students/${id}`, data).then(res => res.data),
@@ -45,18 +60,39 @@ export const studentApi = {
 
 // ========== Classes ==========
 export const classApi = {
-  getAll: (skip = 0, limit = 100) =>
-    api.get('/classes/', { params: { skip, limit } }).then(res => res.data),
+  getAll: (skip = 0, limit = 100, q = '') =>
+    api.get('/classes/', { params: { skip, limit, q: q || undefined } }).then(res => res.data),
   getById: (id) => api.get(`/classes/${id}`).then(res => res.data),
   create: (data) => api.post('/classes/', data).then(res => res.data),
   update: (id, data) => api.put(`/classes/${id}`, data).then(res => res.data),
   delete: (id) => api.delete(`/classes/${id}`).then(res => res.data),
   register: (classId, studentId) =>
-    api.post(`/classes/${classId}/register`, { student_id: studentId }).then(res => res.data),
+    idempotent(config => api.post(`/classes/${classId}/register`, { student_id: studentId }, config))
+      .then(res => res.data),
   unregister: (classId, studentId) =>
     api.delete(`/classes/${classId}/unregister/${studentId}`).then(res => res.data),
-  getStudents: (classId) =>
-    api.get(`/classes/${classId}/students`).then(res => res.data),
+  // Resolves to { items, total } (total from the X-Total-Count header)
+  getStudents: (classId, skip = 0, limit = 20, slim = false) =>
+    api.get(`/classes/${classId}/students`, { params: { skip, limit, slim: slim || undefined } })
+      .then(res => ({ items: res.data, total: Number(res.headers['x-total-count'] ?? res.data.length) })),
+  getTicket: (classId, ticketId) =>
+    api.get(`/classes/${classId}/tickets/${ticketId}`).then(res => res.data),
+  // Rush-mode classes answer 202 with a ticket: poll it until it is processed
+  waitForTicket: async (classId, ticketId, intervalMs = 500) => {
+    for (;;) {
+      const ticket = await classApi.getTicket(classId, ticketId)
+      if (ticket.status === 'registered') return ticket
+      if (ticket.status === 'rejected') throw { message: ticket.detail, status: 400 }
+      if (ticket.status === 'failed') throw { message: ticket.detail, status: 500 }
+      await new Promise(resolve => setTimeout(resolve, intervalMs))
+    }
+  },
+}
+
+// ========== Search ==========
+export const searchApi = {
+  search: (q, skip = 0, limit = 20) =>
+    api.get('/search/', { params: { q, skip, limit } }).then(res => res.data),
 }
 
 // ========== Subscriptions ==========
@@ -68,7 +104,8 @@ export const subscriptionApi = {
     api.get(`/subscriptions/student/${studentId}`).then(res => res.data),
   create: (data) => api.post('/subscriptions/', data).then(res => res.data),
   update: (id, data) => api.put(`/subscriptions/${id}`, data).then(res => res.data),
-  useSession: (id) => api.patch(`/subscriptions/${id}/use-session`).then(res => res.data),
+  useSession: (id) =>
+    idempotent(config => api.patch(`/subscriptions/${id}/use-session`, null, config)).then(res => res.data),
   delete: (id) => api.delete(`/subscriptions/${id}`).then(res => res.data),
 }
 
@@ -10,6 +10,7 @@ export default defineConfig({
       '/api': {
         target: 'http://backend:8000',
         changeOrigin: true,
+        xfwd: true, // X-Forwarded-For, read by the backend rate limiter
       },
     },
   },